@@ -0,0 +1,30 @@
+"""Add indexes for range reads of text lines
+
+Revision ID: 4b7e2c9d1a3f
+Revises: 1df4d68ca472
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '4b7e2c9d1a3f'
+down_revision = '1df4d68ca472'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    # Line ranges are read in (division_id, line_number) order
+    op.create_index(
+        'ix_text_lines_division_id_line_number',
+        'text_lines',
+        ['division_id', 'line_number']
+    )
+    op.create_index('ix_text_divisions_text_id', 'text_divisions', ['text_id'])
+
+def downgrade() -> None:
+    op.drop_index('ix_text_divisions_text_id', table_name='text_divisions')
+    op.drop_index('ix_text_lines_division_id_line_number', table_name='text_lines')
@@ -0,0 +1,28 @@
+"""Add composite citation index on text divisions
+
+Revision ID: 8d3f6a2b5c71
+Revises: 4b7e2c9d1a3f
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '8d3f6a2b5c71'
+down_revision = '4b7e2c9d1a3f'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    # Citation references are resolved by work and then by structural level
+    op.create_index(
+        'ix_text_divisions_citation',
+        'text_divisions',
+        ['author_id_field', 'work_number_field', 'volume', 'book', 'chapter', 'section', 'page']
+    )
+
+def downgrade() -> None:
+    op.drop_index('ix_text_divisions_citation', table_name='text_divisions')
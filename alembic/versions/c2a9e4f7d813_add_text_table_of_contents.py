@@ -0,0 +1,23 @@
+"""Add precomputed table of contents to texts
+
+Revision ID: c2a9e4f7d813
+Revises: 8d3f6a2b5c71
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'c2a9e4f7d813'
+down_revision = '8d3f6a2b5c71'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.add_column('texts', sa.Column('table_of_contents', sa.JSON, nullable=True))
+
+def downgrade() -> None:
+    op.drop_column('texts', 'table_of_contents')
@@ -0,0 +1,43 @@
+"""Add incrementally maintained corpus statistics
+
+Revision ID: e5b8c3d1f9a2
+Revises: c2a9e4f7d813
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'e5b8c3d1f9a2'
+down_revision = 'c2a9e4f7d813'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_table(
+        'corpus_stats',
+        sa.Column('scope', sa.String(16), nullable=False),
+        sa.Column('key', sa.String, nullable=False),
+        sa.Column('text_id', sa.Integer, nullable=False),
+        sa.Column('divisions', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('lines', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('sentences', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('tokens', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('occurrences', sa.Integer, nullable=False, server_default='0'),
+        sa.Column('breakdown', sa.JSON, nullable=True),
+        sa.Column('created_at', sa.DateTime, nullable=False),
+        sa.Column('updated_at', sa.DateTime, nullable=False),
+        sa.PrimaryKeyConstraint('scope', 'key', 'text_id')
+    )
+    op.create_index(
+        'ix_corpus_stats_scope_occurrences',
+        'corpus_stats',
+        ['scope', 'text_id', sa.text('occurrences DESC')]
+    )
+
+def downgrade() -> None:
+    op.drop_index('ix_corpus_stats_scope_occurrences', table_name='corpus_stats')
+    op.drop_table('corpus_stats')
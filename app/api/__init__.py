@@ -6,6 +6,7 @@ from fastapi import APIRouter
 from .corpus import router as corpus_router
 from .lexical import router as lexical_router
 from .llm import router as llm_router
+from .metrics import router as metrics_router
 
 # Create main API router
 api_router = APIRouter()
@@ -14,5 +15,6 @@ api_router = APIRouter()
 api_router.include_router(corpus_router, prefix="/corpus", tags=["corpus"])
 api_router.include_router(lexical_router, prefix="/lexical", tags=["lexical"])
 api_router.include_router(llm_router, prefix="/llm", tags=["llm"])
+api_router.include_router(metrics_router, prefix="/metrics", tags=["metrics"])
 
 __all__ = ['api_router']
@@ -3,17 +3,24 @@ API routes for corpus-related operations.
 """
 
 from typing import Dict, List, Optional
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
 import logging
 
 from app.dependencies import CorpusServiceDep
-from app.models.citations import Citation, SearchResponse
-from app.models.text_line import TextLine
-from app.models.text_division import TextDivision, TextResponse
+from app.core.http_cache import corpus_etag, etag_matches, cache_headers, not_modified, variant
+from app.core.responses import (
+    CitationFields, IncludeTokens, check_fields, is_projected, render_search, render_text
+)
+from app.core.static_export import export_response
+from app.models.citations import Citation, SearchResponse, ReferenceResolution
+from app.models.text_line import TextLine, TextLineRangeResponse
+from app.models.text_division import TextDivision, TextResponse, TableOfContentsResponse
+from app.models.corpus_stats import CorpusStatsResponse
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
 # Request Models
 class TextSearch(BaseModel):
@@ -24,17 +31,28 @@ class TextSearch(BaseModel):
 # Routes
 @router.get("/list", response_model=List[TextResponse])
 async def list_texts(
+    request: Request,
+    response: Response,
     corpus_service: CorpusServiceDep
 ) -> List[Dict]:
     """List all texts in the corpus."""
-    return await corpus_service.list_texts()
+    etag = await corpus_etag("list")
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    texts = await corpus_service.list_texts()
+    response.headers.update(cache_headers(etag))
+    return texts
 
 @router.post("/search", response_model=SearchResponse)
 async def search_texts(
     data: TextSearch,
-    corpus_service: CorpusServiceDep
+    corpus_service: CorpusServiceDep,
+    include_tokens: bool = IncludeTokens,
+    fields: Optional[str] = CitationFields
 ) -> SearchResponse:
     """Search texts in the corpus."""
+    check_fields(include_tokens, fields)
     try:
         logger.debug(f"Search request: {data}")
         result = await corpus_service.search_texts(
@@ -43,6 +61,8 @@ async def search_texts(
             categories=data.categories
         )
         logger.debug(f"Search result count: {len(result.results)}")
+        if is_projected(include_tokens, fields):
+            return render_search(result, include_tokens, fields)
         return result
         
     except Exception as e:
@@ -55,26 +75,142 @@ async def search_texts(
 @router.get("/text/{text_id}", response_model=TextResponse)
 async def get_text(
     text_id: str,  # Changed from int to str to match frontend
-    corpus_service: CorpusServiceDep
+    request: Request,
+    response: Response,
+    corpus_service: CorpusServiceDep,
+    include_tokens: bool = IncludeTokens
 ) -> Dict:
     """Get a specific text by ID."""
     try:
         # Convert string ID to int
-        text = await corpus_service.get_text_by_id(int(text_id))
+        text_id_int = int(text_id)
+        
+        etag = await corpus_etag(variant("text", include_tokens), text_id=text_id_int)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        
+        # Pre-rendered by the ingestion pipeline, if still current
+        if include_tokens:
+            exported = export_response(request, f"text-{text_id_int}", etag)
+            if exported:
+                return exported
+        
+        text = await corpus_service.get_text_by_id(text_id_int)
         if not text:
             raise HTTPException(status_code=404, detail="Text not found")
+        if not include_tokens:
+            return render_text(text, include_tokens=False, headers=cache_headers(etag))
+        response.headers.update(cache_headers(etag))
         return text
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid text ID format")
 
+@router.get("/text/{text_id}/lines", response_model=TextLineRangeResponse)
+async def get_text_lines(
+    text_id: int,
+    request: Request,
+    response: Response,
+    corpus_service: CorpusServiceDep,
+    division_id: int = Query(..., description="First division of the range"),
+    end_division_id: Optional[int] = Query(None, description="Last division of the range (defaults to division_id)"),
+    start_line: Optional[int] = Query(None, description="First line number in the first division"),
+    end_line: Optional[int] = Query(None, description="Last line number in the last division"),
+    include_tokens: bool = Query(False, description="Include spaCy token data"),
+    limit: int = Query(100, ge=1, le=500, description="Maximum number of lines to return")
+) -> TextLineRangeResponse:
+    """Get a range of lines within a text.
+    
+    Continue a truncated range by passing next_division_id and
+    next_line_number from the response as division_id and start_line.
+    """
+    try:
+        etag = await corpus_etag(variant("lines", include_tokens), text_id=text_id)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        
+        result = await corpus_service.get_line_range(
+            text_id,
+            division_id,
+            end_division_id=end_division_id,
+            start_line=start_line,
+            end_line=end_line,
+            include_tokens=include_tokens,
+            limit=limit
+        )
+        response.headers.update(cache_headers(etag))
+        return result
+    except Exception as e:
+        logger.error(f"Line range error: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error getting text lines: {str(e)}"
+        )
+
+@router.get("/text/{text_id}/toc", response_model=TableOfContentsResponse)
+async def get_table_of_contents(
+    text_id: int,
+    request: Request,
+    response: Response,
+    corpus_service: CorpusServiceDep
+) -> TableOfContentsResponse:
+    """Get a text's table of contents with line counts per node."""
+    etag = await corpus_etag("toc", text_id=text_id)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    exported = export_response(request, f"toc-{text_id}", etag)
+    if exported:
+        return exported
+    
+    toc = await corpus_service.get_table_of_contents(text_id)
+    if not toc:
+        raise HTTPException(status_code=404, detail="Text not found")
+    response.headers.update(cache_headers(etag))
+    return toc
+
+@router.get("/reference", response_model=ReferenceResolution)
+async def resolve_reference(
+    corpus_service: CorpusServiceDep,
+    ref: str = Query(..., description='Citation reference, e.g. "0057.001 1.5.3-1.6.10" or "Gal. San. 6.135"'),
+    include_lines: bool = Query(True, description="Include the first page of lines in the range"),
+    include_tokens: bool = Query(False, description="Include spaCy token data"),
+    limit: int = Query(100, ge=1, le=500, description="Maximum number of lines to return")
+) -> ReferenceResolution:
+    """Resolve a citation reference to a range of lines."""
+    try:
+        resolution = await corpus_service.resolve_reference(
+            ref,
+            include_lines=include_lines,
+            include_tokens=include_tokens,
+            limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not resolution:
+        raise HTTPException(status_code=404, detail="Reference not found")
+    return resolution
+
+@router.get("/stats", response_model=CorpusStatsResponse)
+async def get_stats(
+    corpus_service: CorpusServiceDep,
+    top_lemmas: int = Query(50, ge=1, le=1000, description="Number of most frequent lemmas to return")
+) -> CorpusStatsResponse:
+    """Get counts per work and category/lemma frequency totals."""
+    return await corpus_service.get_stats(top_lemmas=top_lemmas)
+
 @router.get("/category/{category}", response_model=SearchResponse)
 async def search_by_category(
     category: str,
-    corpus_service: CorpusServiceDep
+    corpus_service: CorpusServiceDep,
+    include_tokens: bool = IncludeTokens,
+    fields: Optional[str] = CitationFields
 ) -> SearchResponse:
     """Search for text lines by category."""
+    check_fields(include_tokens, fields)
     try:
         result = await corpus_service.search_by_category(category)
+        if is_projected(include_tokens, fields):
+            return render_search(result, include_tokens, fields)
         # Result is already a SearchResponse model, return it directly
         return result
     except Exception as e:
@@ -86,14 +222,32 @@ async def search_by_category(
 
 @router.get("/all", response_model=List[TextResponse])
 async def get_all_texts(
+    request: Request,
+    response: Response,
     corpus_service: CorpusServiceDep,
-    include_content: bool = Query(False, description="Include full text content")
+    include_content: bool = Query(False, description="Include full text content"),
+    include_tokens: bool = IncludeTokens
 ) -> List[Dict]:
     """Get all texts, optionally including their full content."""
     try:
         if include_content:
-            return await corpus_service.get_all_texts()
-        return await corpus_service.list_texts()
+            etag = await corpus_etag(variant("all-content", include_tokens), all_texts=True)
+        else:
+            etag = await corpus_etag("list")
+        if etag_matches(request, etag):
+            return not_modified(etag)
+        
+        if include_content:
+            # Stream one text at a time instead of building the whole corpus in memory
+            return StreamingResponse(
+                corpus_service.stream_all_texts(include_tokens=include_tokens),
+                media_type="application/json",
+                headers=cache_headers(etag)
+            )
+        
+        texts = await corpus_service.list_texts()
+        response.headers.update(cache_headers(etag))
+        return texts
     except Exception as e:
         logger.error(f"Get all texts error: {str(e)}", exc_info=True)
         raise HTTPException(
@@ -3,6 +3,7 @@ API endpoints for lexical value operations.
 """
 
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Dict, Any, Optional, List, Union
 from pydantic import BaseModel
@@ -19,7 +20,7 @@ from app.models.lexical_value import LexicalValue
 # Configure logging
 logger = logging.getLogger(__name__)
 
-router = APIRouter(tags=["lexical"])
+router = APIRouter(tags=["lexical"], default_response_class=ORJSONResponse)
 
 # In-memory storage for task status and delete triggers
 task_status = {}
@@ -29,6 +30,7 @@ class LexicalCreateSchema(BaseModel):
     """Schema for lexical value creation request."""
     lemma: str
     search_lemma: bool = True  # Default to True since all inputs are lemmas
+    use_cache: bool = True  # False to regenerate instead of reusing a cached LLM response
 
 def format_entry_for_response(entry: Dict[str, Any]) -> Dict[str, Any]:
     """Format entry data to match frontend expectations."""
@@ -110,7 +112,8 @@ async def create_lexical_value_task(
     lemma: str,
     search_lemma: bool,
     task_id: str,
-    db: AsyncSession
+    db: AsyncSession,
+    use_cache: bool = True
 ):
     """Background task for lexical value creation."""
     try:
@@ -129,7 +132,8 @@ async def create_lexical_value_task(
         result = await lexical_service.create_lexical_entry(
             lemma=lemma,
             search_lemma=search_lemma,
-            task_id=task_id
+            task_id=task_id,
+            use_cache=use_cache
         )
         logger.debug(f"Create lexical entry result for {lemma}: {json.dumps(result, indent=2)}")
         
@@ -199,7 +203,8 @@ async def create_lexical_value(
         data.lemma,
         data.search_lemma,
         task_id,
-        db
+        db,
+        data.use_cache
     )
     logger.info(f"Added lexical value creation task to background tasks: {task_id}")
     
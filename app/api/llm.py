@@ -2,10 +2,13 @@
 API routes for LLM operations.
 """
 
-from typing import Dict, List, Optional, Any
-from fastapi import APIRouter, HTTPException, Query
+from typing import AsyncGenerator, Dict, List, Optional, Any, Union
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from sse_starlette.sse import EventSourceResponse
+import json
+import logging
 
 from app.dependencies import LLMServiceDep
 from app.services.llm_service import LLMServiceError
@@ -13,8 +16,12 @@ from app.models.citations import Citation, SearchResponse
 from app.models.text_line import TextLine
 from app.models.text_division import TextDivision, TextResponse
 from app.core.config import settings
+from app.core.responses import (
+    CitationFields, IncludeTokens, check_fields, is_projected, project_citations
+)
 
-router = APIRouter()
+logger = logging.getLogger(__name__)
+router = APIRouter(default_response_class=ORJSONResponse)
 
 # Request/Response Models
 class AnalysisRequest(BaseModel):
@@ -22,6 +29,7 @@ class AnalysisRequest(BaseModel):
     contexts: List[Dict[str, Any]]
     max_tokens: Optional[int] = None
     stream: bool = False
+    use_cache: bool = True  # False to regenerate instead of reusing a cached response
 
 class QueryGenerationRequest(BaseModel):
     question: str
@@ -67,6 +75,16 @@ class TokenCountResponse(BaseModel):
     count: int
     within_limits: bool
 
+async def _sse_events(stream: AsyncGenerator[str, None]) -> AsyncGenerator[Union[str, Dict], None]:
+    """Forward text deltas as SSE messages, ending with an error event if generation fails."""
+    try:
+        async for text in stream:
+            yield text
+    except Exception as e:
+        detail = getattr(e, 'detail', None) or {"message": str(e)}
+        logger.error(f"LLM stream failed: {str(e)}")
+        yield {"event": "error", "data": json.dumps(detail, default=str)}
+
 # Routes
 @router.post("/analyze", response_model=AnalysisResponse)
 async def analyze_term(
@@ -76,20 +94,19 @@ async def analyze_term(
     """Generate an analysis for a term using provided contexts."""
     try:
         if data.stream:
-            return EventSourceResponse(
-                llm_service.analyze_term(
-                    term=data.term,
-                    contexts=data.contexts,
-                    max_tokens=data.max_tokens,
-                    stream=True
-                )
-            )
+            return EventSourceResponse(_sse_events(await llm_service.analyze_term(
+                term=data.term,
+                contexts=data.contexts,
+                max_tokens=data.max_tokens,
+                stream=True
+            )))
         
         response = await llm_service.analyze_term(
             term=data.term,
             contexts=data.contexts,
             max_tokens=data.max_tokens,
-            stream=False
+            stream=False,
+            use_cache=data.use_cache
         )
         return {
             "text": response.text,
@@ -165,9 +182,13 @@ async def generate_query(
 @router.post("/get-results-page", response_model=PaginatedResponse)
 async def get_results_page(
     params: PaginationParams,
-    llm_service: LLMServiceDep
+    llm_service: LLMServiceDep,
+    include_tokens: bool = IncludeTokens,
+    fields: Optional[str] = CitationFields
 ) -> Dict:
     """Get a specific page of results using the results_id."""
+    check_fields(include_tokens, fields)
+
     try:
         # Get the requested page of results
         results = await llm_service.citation_service.get_paginated_results(
@@ -182,6 +203,15 @@ async def get_results_page(
         )
         total_results = meta["total_results"] if meta else len(results)
         
+        if is_projected(include_tokens, fields):
+            # Bypass response_model validation, projected citations are partial
+            return ORJSONResponse({
+                "results": project_citations(results, include_tokens, fields),
+                "page": params.page,
+                "page_size": params.page_size,
+                "total_results": total_results
+            })
+        
         return {
             "results": results,
             "page": params.page,
@@ -295,7 +325,7 @@ async def count_tokens(
     """Count tokens in a text and check if it's within context limits."""
     try:
         count = await llm_service.get_token_count(data.text)
-        within_limits = await llm_service.check_context_length(data.text)
+        within_limits = await llm_service.check_context_length(data.text, token_count=count)
         return {
             "count": count,
             "within_limits": within_limits
@@ -327,14 +357,12 @@ async def analyze_term_stream(
         )
     
     try:
-        return EventSourceResponse(
-            llm_service.analyze_term(
-                term=data.term,
-                contexts=data.contexts,
-                max_tokens=data.max_tokens,
-                stream=True
-            )
-        )
+        return EventSourceResponse(_sse_events(await llm_service.analyze_term(
+            term=data.term,
+            contexts=data.contexts,
+            max_tokens=data.max_tokens,
+            stream=True
+        )))
     except LLMServiceError as e:
         error_msg = str(e.detail) if hasattr(e, 'detail') else str(e)
         return {
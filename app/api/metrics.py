@@ -0,0 +1,61 @@
+"""
+API routes for application metrics.
+"""
+
+from typing import Any, Dict
+from collections import defaultdict
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+import logging
+
+from app.core.metrics import metrics
+from app.core.redis import (
+    redis_client,
+    cache_requests,
+    cache_latency,
+    cache_payload_size,
+    cache_keys,
+    cache_memory
+)
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+@router.get("", response_class=PlainTextResponse)
+async def get_metrics() -> str:
+    """Get all metrics in the Prometheus text exposition format."""
+    return metrics.render()
+
+@router.get("/cache")
+async def get_cache_metrics(
+    sample: bool = Query(False, description="Sample Redis memory usage now instead of using the last sample")
+) -> Dict[str, Any]:
+    """Get cache hit ratio, latency, payload size and memory usage per key prefix."""
+    try:
+        if sample:
+            await redis_client.sample_memory_usage()
+
+        prefixes: Dict[str, Dict[str, Any]] = defaultdict(dict)
+
+        for (prefix, result), count in cache_requests.samples().items():
+            prefixes[prefix][result] = count
+        for prefix, stats in prefixes.items():
+            lookups = stats.get("hit", 0) + stats.get("miss", 0)
+            stats["hit_ratio"] = stats.get("hit", 0) / lookups if lookups else None
+
+        for (operation, prefix), summary in cache_latency.samples().items():
+            prefixes[prefix][f"{operation}_latency_ms"] = summary["mean"] * 1000
+        for (operation, prefix), summary in cache_payload_size.samples().items():
+            prefixes[prefix][f"{operation}_mean_bytes"] = summary["mean"]
+        for (prefix,), count in cache_keys.samples().items():
+            prefixes[prefix]["keys"] = count
+        for (prefix,), size in cache_memory.samples().items():
+            prefixes[prefix]["memory_bytes"] = size
+
+        return {"prefixes": dict(prefixes)}
+    except Exception as e:
+        logger.error(f"Cache metrics error: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error getting cache metrics: {str(e)}"
+        )
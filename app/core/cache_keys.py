@@ -0,0 +1,119 @@
+"""
+Versioned cache keys for corpus-derived data.
+
+Every key built here embeds the current corpus generation (and, for
+single-text entries, the text's own version counter). Both counters live in
+Redis, so invalidating the whole corpus cache is one INCR and invalidating a
+single text is one INCR on its counter. Entries written under an older
+generation are simply never read again and expire through their TTL.
+"""
+
+from typing import Dict, Optional, Tuple
+import logging
+import time
+
+from app.core.redis import redis_client
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Per-worker copies of the version counters: key -> (fetched_at, value)
+_version_memo: Dict[str, Tuple[float, int]] = {}
+
+def _text_version_key(text_id: int) -> str:
+    return f"{settings.redis.TEXT_VERSION_PREFIX}{text_id}"
+
+async def corpus_generation() -> int:
+    """Get the current corpus generation (0 if never bumped)."""
+    value = await redis_client.get(settings.redis.CORPUS_GENERATION_KEY)
+    return int(value) if value else 0
+
+async def text_version(text_id: int) -> int:
+    """Get the current version counter for a single text (0 if never bumped)."""
+    value = await redis_client.get(_text_version_key(text_id))
+    return int(value) if value else 0
+
+async def _read_versions(version_key: Optional[str]) -> Tuple[int, Optional[int]]:
+    """Read the corpus generation and, if given, another counter in one MGET."""
+    keys = [settings.redis.CORPUS_GENERATION_KEY]
+    if version_key is not None:
+        keys.append(version_key)
+    values = [int(value) if value else 0 for value in await redis_client.get_many_bytes(keys)]
+    return values[0], values[1] if version_key is not None else None
+
+async def corpus_versions(text_id: Optional[int] = None) -> Tuple[int, Optional[int]]:
+    """Get the corpus generation and, if text_id is given, that text's version.
+
+    Both counters are read in a single MGET.
+    """
+    return await _read_versions(_text_version_key(text_id) if text_id is not None else None)
+
+async def corpus_key(prefix: str, identifier: str = "", text_id: Optional[int] = None) -> str:
+    """Build a cache key stamped with the corpus generation.
+
+    Args:
+        prefix: Cache prefix from settings.redis (e.g. "text:")
+        identifier: Key identifier within the prefix
+        text_id: If given, also stamp the key with that text's version
+    """
+    generation, version = await corpus_versions(text_id)
+    key = f"{prefix}g{generation}:{identifier}"
+    if text_id is not None:
+        key += f":v{version}"
+    return key
+
+async def _memoized_versions(version_key: Optional[str]) -> Tuple[int, Optional[int]]:
+    """Read counters through the per-worker memo (see memoized_corpus_versions)."""
+    now = time.monotonic()
+    keys = [settings.redis.CORPUS_GENERATION_KEY]
+    if version_key is not None:
+        keys.append(version_key)
+    memos = [_version_memo.get(key) for key in keys]
+    if not all(memo and now - memo[0] < settings.ETAG_VERSION_TTL for memo in memos):
+        generation, version = await _read_versions(version_key)
+        memos = [(now, generation), (now, version)][:len(keys)]
+        _version_memo.update(zip(keys, memos))
+    return memos[0][1], memos[1][1] if version_key is not None else None
+
+async def memoized_corpus_versions(text_id: Optional[int] = None) -> Tuple[int, Optional[int]]:
+    """Get the corpus generation (and a text's version) from the per-worker memo.
+
+    Used for HTTP validators, where a few seconds of staleness after an
+    invalidation is acceptable in exchange for not reading Redis per request.
+    Counters are re-read at most once per ETAG_VERSION_TTL, together in one MGET.
+    """
+    return await _memoized_versions(_text_version_key(text_id) if text_id is not None else None)
+
+async def memoized_texts_revision() -> Tuple[int, int]:
+    """Get the corpus generation and the all-texts revision from the per-worker memo.
+
+    The revision changes whenever any single text is invalidated, so it
+    validates responses built from every text.
+    """
+    return await _memoized_versions(settings.redis.TEXTS_REVISION_KEY)
+
+async def memoized_corpus_generation() -> int:
+    """Get the corpus generation from the per-worker memo."""
+    generation, _ = await memoized_corpus_versions()
+    return generation
+
+async def memoized_text_version(text_id: int) -> int:
+    """Get a text's version counter from the per-worker memo."""
+    _, version = await memoized_corpus_versions(text_id)
+    return version
+
+async def bump_corpus_generation() -> Optional[int]:
+    """Invalidate all corpus-derived cache entries."""
+    generation = await redis_client.incr(settings.redis.CORPUS_GENERATION_KEY)
+    _version_memo.clear()
+    logger.info(f"Corpus cache generation bumped to {generation}")
+    return generation
+
+async def bump_text_version(text_id: int) -> Optional[int]:
+    """Invalidate cache entries derived from a single text."""
+    version = await redis_client.incr(_text_version_key(text_id))
+    await redis_client.incr(settings.redis.TEXTS_REVISION_KEY)
+    _version_memo.pop(_text_version_key(text_id), None)
+    _version_memo.pop(settings.redis.TEXTS_REVISION_KEY, None)
+    logger.info(f"Text {text_id} cache version bumped to {version}")
+    return version
@@ -0,0 +1,31 @@
+"""
+Response compression middleware.
+
+Gzip-compresses responses above a size threshold. Server-sent event
+streams are passed through untouched: the gzip encoder buffers small
+writes, which would hold back events until the buffer fills.
+"""
+
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+class CompressionMiddleware(GZipMiddleware):
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, compresslevel: int = 6) -> None:
+        """Initialize the middleware with a size threshold and gzip level."""
+        super().__init__(app, minimum_size=minimum_size, compresslevel=compresslevel)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and self._is_event_stream(scope):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+    @staticmethod
+    def _is_event_stream(scope: Scope) -> bool:
+        """Check whether a request expects a server-sent event stream."""
+        headers = Headers(scope=scope)
+        return (
+            scope["path"].rstrip("/").endswith("/stream")
+            or "text/event-stream" in headers.get("Accept", "")
+        )
@@ -32,9 +32,43 @@ class LLMConfig(BaseSettings):
     MAX_RETRIES: int = int(os.getenv("LLM_MAX_RETRIES", "3"))
     RETRY_DELAY: float = float(os.getenv("LLM_RETRY_DELAY", "1.0"))
     
+    # Provider calls run in their own thread pool (see app/services/llm/executor.py):
+    # concurrent calls, calls allowed to wait for a slot, and timeouts (seconds)
+    MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+    MAX_QUEUE: int = int(os.getenv("LLM_MAX_QUEUE", "32"))
+    TIMEOUT: float = float(os.getenv("LLM_TIMEOUT", "120"))
+    CONNECT_TIMEOUT: float = float(os.getenv("LLM_CONNECT_TIMEOUT", "10"))
+    # Streams: whole-stream timeout (seconds) and text deltas buffered for slow clients
+    STREAM_TIMEOUT: float = float(os.getenv("LLM_STREAM_TIMEOUT", "600"))
+    STREAM_BUFFER: int = int(os.getenv("LLM_STREAM_BUFFER", "256"))
+    
     # Context settings
     MAX_CONTEXT_LENGTH: int = int(os.getenv("LLM_MAX_CONTEXT_LENGTH", "100000"))
     CONTEXT_WINDOW: int = int(os.getenv("LLM_CONTEXT_WINDOW", "8192"))
+    # Initial ratio of reported to locally estimated prompt tokens (see
+    # app/services/llm/tokens.py); adjusted from the usage of each generation
+    TOKEN_CALIBRATION: float = float(os.getenv("LLM_TOKEN_CALIBRATION", "1.0"))
+    # Lexical prompts: tokens available for citations (capped by the context
+    # length left after the template and the response) and characters kept
+    # around the lemma in long sentences (see app/services/llm/citation_selection.py)
+    CITATION_BUDGET: int = int(os.getenv("LLM_CITATION_BUDGET", "30000"))
+    CITATION_MAX_CHARS: int = int(os.getenv("LLM_CITATION_MAX_CHARS", "600"))
+    # Lexical map-reduce, used when the citations do not fit one prompt: citations
+    # are split by work into chunks of up to MAP_CHUNK_TOKENS (at most MAP_MAX_CHUNKS),
+    # MAP_CONCURRENCY chunks are analyzed at a time, then the analyses are merged
+    MAP_CHUNK_TOKENS: int = int(os.getenv("LLM_MAP_CHUNK_TOKENS", "12000"))
+    MAP_MAX_CHUNKS: int = int(os.getenv("LLM_MAP_MAX_CHUNKS", "16"))
+    MAP_CONCURRENCY: int = int(os.getenv("LLM_MAP_CONCURRENCY", "4"))
+    MAP_MAX_TOKENS: int = int(os.getenv("LLM_MAP_MAX_TOKENS", "2048"))
+    
+    # Response cache - generations keyed by a hash of model, prompt and sampling
+    # parameters, stored in Redis or on disk ("none" disables caching)
+    CACHE_BACKEND: Literal["redis", "disk", "none"] = os.getenv("LLM_CACHE_BACKEND", "redis")
+    CACHE_TTL: int = int(os.getenv("LLM_CACHE_TTL", "604800"))  # 7 days
+    CACHE_MAX_ENTRIES: int = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "2000"))
+    CACHE_DIR: str = os.getenv("LLM_CACHE_DIR", "cache/llm")
+    CACHE_PREFIX: str = "llm:"
+    CACHE_LRU_KEY: str = "llm_index:lru"
 
 class RedisConfig(BaseSettings):
     # Redis connection settings
@@ -42,17 +76,74 @@ class RedisConfig(BaseSettings):
     REDIS_DB: int = int(os.getenv("REDIS_DB", "0"))
     REDIS_PASSWORD: Optional[str] = os.getenv("REDIS_PASSWORD")
     
+    # Connection pool and timeouts (seconds) - a stalled Redis must not stall requests
+    REDIS_MAX_CONNECTIONS: int = int(os.getenv("REDIS_MAX_CONNECTIONS", "50"))
+    REDIS_SOCKET_TIMEOUT: float = float(os.getenv("REDIS_SOCKET_TIMEOUT", "0.5"))
+    REDIS_CONNECT_TIMEOUT: float = float(os.getenv("REDIS_CONNECT_TIMEOUT", "0.5"))
+    REDIS_HEALTH_CHECK_INTERVAL: int = int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", "30"))
+    
+    # Circuit breaker - after REDIS_BREAKER_THRESHOLD consecutive failures, skip
+    # Redis for REDIS_BREAKER_RESET_TIMEOUT seconds and serve keys under
+    # REDIS_FALLBACK_PREFIXES from a bounded per-worker in-memory store
+    REDIS_BREAKER_THRESHOLD: int = int(os.getenv("REDIS_BREAKER_THRESHOLD", "5"))
+    REDIS_BREAKER_RESET_TIMEOUT: float = float(os.getenv("REDIS_BREAKER_RESET_TIMEOUT", "30"))
+    REDIS_FALLBACK_PREFIXES: str = os.getenv("REDIS_FALLBACK_PREFIXES", "search_results:")
+    REDIS_FALLBACK_MAX_ENTRIES: int = int(os.getenv("REDIS_FALLBACK_MAX_ENTRIES", "2000"))
+    
     # Cache settings - reduced TTLs
     CACHE_TTL: int = int(os.getenv("CACHE_TTL", "300"))  # 5 minutes
-    TEXT_CACHE_TTL: int = int(os.getenv("TEXT_CACHE_TTL", "600"))  # 10 minutes
+    TEXT_CACHE_TTL: int = int(os.getenv("TEXT_CACHE_TTL", "600"))  # 10 minutes (soft: refreshed in background)
+    TEXT_CACHE_HARD_TTL: int = int(os.getenv("TEXT_CACHE_HARD_TTL", "21600"))  # 6 hours (hard: rebuild blocks)
+    CACHE_REFRESH_LOCK_TTL: int = int(os.getenv("CACHE_REFRESH_LOCK_TTL", "120"))  # 2 minutes
     SEARCH_CACHE_TTL: int = int(os.getenv("SEARCH_CACHE_TTL", "300"))  # 5 minutes
-    SEARCH_RESULTS_TTL: int = int(os.getenv("SEARCH_RESULTS_TTL", "300"))  # 5 minutes
+    SEARCH_RESULTS_TTL: int = int(os.getenv("SEARCH_RESULTS_TTL", "300"))  # 5 minutes (sliding)
+    SEARCH_RESULTS_TOUCH_INTERVAL: int = int(os.getenv("SEARCH_RESULTS_TOUCH_INTERVAL", "30"))
+    SEARCH_RESULTS_MAX_BYTES: int = int(os.getenv("SEARCH_RESULTS_MAX_BYTES", str(16 * 1024 * 1024)))  # per result set
+    SEARCH_RESULTS_GLOBAL_MAX_BYTES: int = int(os.getenv("SEARCH_RESULTS_GLOBAL_MAX_BYTES", str(256 * 1024 * 1024)))
+    STATS_CACHE_TTL: int = int(os.getenv("STATS_CACHE_TTL", "300"))  # 5 minutes (ingestion runs out of process)
     
     # Cache prefixes for different types of data
     TEXT_CACHE_PREFIX: str = "text:"
     SEARCH_CACHE_PREFIX: str = "search:"
     CATEGORY_CACHE_PREFIX: str = "category:"
     SEARCH_RESULTS_PREFIX: str = "search_results:"
+    STATS_CACHE_PREFIX: str = "stats:"
+    
+    # LRU index of stored result sets (score: last access time) and their sizes
+    SEARCH_RESULTS_LRU_KEY: str = "search_results_index:lru"
+    SEARCH_RESULTS_SIZES_KEY: str = "search_results_index:sizes"
+    
+    # Cache versioning - corpus-derived keys embed these counters so that
+    # invalidation is a single INCR and stale generations expire via TTL
+    CORPUS_GENERATION_KEY: str = "corpus:generation"
+    TEXT_VERSION_PREFIX: str = "corpus:text_version:"
+    # Bumped together with any text's version, for responses built from all texts
+    TEXTS_REVISION_KEY: str = "corpus:texts_revision"
+    
+    # Cache warming - replays the most accessed texts/lemmas after a deploy or
+    # cache clear, or explicitly configured comma-separated lists
+    ACCESS_LOG_PREFIX: str = "access:"
+    # Access counts are buffered per worker and flushed every ACCESS_LOG_FLUSH_INTERVAL
+    # seconds; each log keeps its top ACCESS_LOG_MAX_ENTRIES members
+    ACCESS_LOG_FLUSH_INTERVAL: float = float(os.getenv("CACHE_ACCESS_LOG_FLUSH_INTERVAL", "10"))
+    ACCESS_LOG_MAX_ENTRIES: int = int(os.getenv("CACHE_ACCESS_LOG_MAX_ENTRIES", "1000"))
+    ACCESS_LOG_TTL: int = int(os.getenv("CACHE_ACCESS_LOG_TTL", "2592000"))  # 30 days
+    WARMUP_ON_STARTUP: bool = os.getenv("CACHE_WARMUP_ON_STARTUP", "false").lower() == "true"
+    WARMUP_TOP_K: int = int(os.getenv("CACHE_WARMUP_TOP_K", "50"))
+    WARMUP_CONCURRENCY: int = int(os.getenv("CACHE_WARMUP_CONCURRENCY", "4"))
+    WARMUP_ALL_TEXTS: bool = os.getenv("CACHE_WARMUP_ALL_TEXTS", "false").lower() == "true"
+    WARMUP_LEMMAS: str = os.getenv("CACHE_WARMUP_LEMMAS", "")
+    WARMUP_TEXT_IDS: str = os.getenv("CACHE_WARMUP_TEXT_IDS", "")
+    
+    # Cache metrics - interval (seconds, 0 disables), keys scanned to estimate
+    # the prefix mix and per-prefix MEMORY USAGE sample size for the Redis memory
+    # sampler. One worker per interval takes the lock and samples; the others
+    # publish the report it stores.
+    METRICS_SAMPLE_INTERVAL: int = int(os.getenv("CACHE_METRICS_SAMPLE_INTERVAL", "300"))
+    METRICS_SCAN_LIMIT: int = int(os.getenv("CACHE_METRICS_SCAN_LIMIT", "10000"))
+    METRICS_SAMPLE_SIZE: int = int(os.getenv("CACHE_METRICS_SAMPLE_SIZE", "200"))
+    METRICS_SAMPLER_LOCK_KEY: str = "metrics:sampler_lock"
+    METRICS_SAMPLE_KEY: str = "metrics:memory_sample"
 
 class Settings(BaseSettings):
     # Database settings
@@ -63,6 +154,8 @@ class Settings(BaseSettings):
     DB_POOL_SIZE: int = 20
     DB_MAX_OVERFLOW: int = 10
     DB_POOL_TIMEOUT: int = 30
+    # Run hot read queries on raw asyncpg connections (see app/core/raw_queries.py)
+    DB_RAW_QUERIES: bool = os.getenv("DB_RAW_QUERIES", "true").lower() == "true"
     
     # LLM settings
     llm: LLMConfig = LLMConfig()
@@ -75,6 +168,18 @@ class Settings(BaseSettings):
     API_V1_STR: str = "/api/v1"
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
     
+    # HTTP caching - Cache-Control max-age (seconds) for corpus responses and
+    # how long each worker trusts its copy of the corpus version for ETags
+    HTTP_CACHE_MAX_AGE: int = int(os.getenv("HTTP_CACHE_MAX_AGE", "60"))
+    ETAG_VERSION_TTL: float = float(os.getenv("ETAG_VERSION_TTL", "5"))
+    
+    # Response compression - minimum body size (bytes) and gzip level
+    GZIP_MINIMUM_SIZE: int = int(os.getenv("GZIP_MINIMUM_SIZE", "1024"))
+    GZIP_COMPRESS_LEVEL: int = int(os.getenv("GZIP_COMPRESS_LEVEL", "6"))
+    
+    # Pre-rendered text exports written by the ingestion pipeline
+    STATIC_EXPORT_DIR: str = os.getenv("STATIC_EXPORT_DIR", "static/texts")
+    
     class Config:
         case_sensitive = True
 
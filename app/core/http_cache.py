@@ -0,0 +1,63 @@
+"""
+HTTP caching helpers for corpus endpoints.
+
+Corpus responses only change when the corpus generation (or a text's version
+counter, or for responses containing every text the texts revision) is
+bumped, so ETags are built from those counters and the response variant
+alone. They are weak: the compression middleware serves the same
+resource as gzip or identity bytes under one validator.
+Conditional requests are answered from the per-worker version memo, without
+touching Postgres and without a Redis round trip per request.
+"""
+
+from typing import Dict, Optional
+from fastapi import Request, Response
+
+from app.core.config import settings
+from app.core.cache_keys import memoized_corpus_versions, memoized_texts_revision
+
+def variant(resource: str, include_tokens: bool = True) -> str:
+    """Name the token-less variant of a resource (e.g. "text:notokens")."""
+    return resource if include_tokens else f"{resource}:notokens"
+
+async def corpus_etag(resource: str, text_id: Optional[int] = None, all_texts: bool = False) -> str:
+    """Build a weak ETag for a corpus resource.
+
+    Args:
+        resource: Resource/variant name (e.g. "list", "text:notokens");
+            every representation with a different body needs its own name
+        text_id: If given, also include that text's version
+        all_texts: The resource contains every text, so include the revision
+            that changes whenever any text is invalidated
+    """
+    if all_texts:
+        generation, revision = await memoized_texts_revision()
+        return f'W/"g{generation}-{resource}-r{revision}"'
+    generation, version = await memoized_corpus_versions(text_id)
+    tag = f"g{generation}-{resource}"
+    if text_id is not None:
+        tag += f"-{text_id}v{version}"
+    return f'W/"{tag}"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check whether the request's If-None-Match header matches the ETag."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [candidate.strip() for candidate in header.split(",")]
+    # If-None-Match uses weak comparison
+    opaque = etag.removeprefix("W/")
+    return "*" in candidates or any(
+        candidate.removeprefix("W/") == opaque for candidate in candidates
+    )
+
+def cache_headers(etag: str) -> Dict[str, str]:
+    """Get ETag and Cache-Control headers for a corpus response."""
+    return {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={settings.HTTP_CACHE_MAX_AGE}, must-revalidate"
+    }
+
+def not_modified(etag: str) -> Response:
+    """Build a 304 response carrying the validator headers."""
+    return Response(status_code=304, headers=cache_headers(etag))
@@ -0,0 +1,144 @@
+"""
+Raw asyncpg access for hot read queries.
+
+Citation searches, text line ranges and lexical lookups run on the asyncpg
+connection underneath the session's pooled connection, skipping
+SQLAlchemy's statement compilation and Row/RowMapping wrapping. Records
+are returned as is: asyncpg.Record supports both `record["column"]` and
+`record.get("column")`, so the citation formatter consumes them directly.
+asyncpg prepares each statement once per connection and keeps it in its
+statement cache, and the dialect's JSON codecs are already registered on
+pooled connections.
+
+With DB_RAW_QUERIES disabled (or on a non-asyncpg engine) every query runs
+through session.execute instead.
+"""
+
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text
+import logging
+import re
+
+from app.core.config import settings
+from app.core.citation_queries import (
+    LEMMA_CITATION_QUERY,
+    TEXT_CITATION_QUERY,
+    CATEGORY_CITATION_QUERY
+)
+
+logger = logging.getLogger(__name__)
+
+# Citation queries by the query name used in result set fingerprints
+CITATION_QUERIES = {
+    "lemma": LEMMA_CITATION_QUERY,
+    "text": TEXT_CITATION_QUERY,
+    "category": CATEGORY_CITATION_QUERY
+}
+
+# A range of lines in (division_id, line_number) order, see TextService.get_line_range
+LINE_RANGE_QUERY = """
+SELECT tl.division_id, tl.line_number, tl.content, tl.categories, tl.is_title{token_column}
+FROM text_lines tl
+JOIN text_divisions td ON td.id = tl.division_id
+WHERE td.text_id = :text_id
+  AND (tl.division_id, tl.line_number) >= (:start_division_id, :start_line)
+  AND (tl.division_id, tl.line_number) <= (:end_division_id, :end_line)
+ORDER BY tl.division_id, tl.line_number
+LIMIT :limit
+"""
+
+LEXICAL_VALUE_QUERY = """
+SELECT id, lemma, translation, short_description, long_description, related_terms,
+       citations_used, "references", sentence_contexts, created_at, updated_at, sentence_id
+FROM lexical_values
+WHERE lemma = :lemma
+"""
+
+# ":name" parameters, but not "::type" casts (same rule as sqlalchemy.text)
+_NAMED_PARAMETER = re.compile(r"(?<![:\w\\]):(\w+)(?!:)")
+
+def to_positional(sql: str) -> Tuple[str, List[str]]:
+    """Rewrite ":name" parameters as asyncpg "$n" placeholders.
+
+    Returns:
+        The rewritten SQL and the parameter names in placeholder order
+    """
+    names: List[str] = []
+
+    def placeholder(match: re.Match) -> str:
+        name = match.group(1)
+        if name not in names:
+            names.append(name)
+        return f"${names.index(name) + 1}"
+
+    return _NAMED_PARAMETER.sub(placeholder, sql), names
+
+class RawQueryRepository:
+    """Hot read queries on the session's raw asyncpg connection."""
+
+    # Rewritten SQL per query, shared by all instances
+    _positional: Dict[str, Tuple[str, List[str]]] = {}
+
+    def __init__(self, session: AsyncSession):
+        """Initialize the repository with a database session."""
+        self.session = session
+        self.enabled = settings.DB_RAW_QUERIES
+
+    async def _driver_connection(self) -> Optional[Any]:
+        """Get the asyncpg connection underneath the session's connection."""
+        connection = await self.session.connection()
+        if connection.dialect.driver != "asyncpg":
+            return None
+        raw = await connection.get_raw_connection()
+        return raw.driver_connection
+
+    async def fetch(self, sql: str, params: Mapping[str, Any]) -> Sequence[Mapping[str, Any]]:
+        """Run a read query with named parameters and return its rows.
+
+        Rows are asyncpg Records on the fast path and RowMappings otherwise;
+        both support item access and .get().
+        """
+        driver = await self._driver_connection() if self.enabled else None
+        if driver is None:
+            result = await self.session.execute(text(sql), dict(params))
+            return result.mappings().all()
+
+        positional = self._positional.get(sql)
+        if positional is None:
+            positional = self._positional[sql] = to_positional(sql)
+        query, names = positional
+        return await driver.fetch(query, *(params[name] for name in names))
+
+    async def fetch_citations(self, query_name: str, params: Mapping[str, Any]) -> Sequence[Mapping[str, Any]]:
+        """Get citation rows for a lemma, text or category search.
+
+        Args:
+            query_name: "lemma", "text" or "category"
+            params: Query parameters ("pattern" or "category")
+        """
+        return await self.fetch(CITATION_QUERIES[query_name], params)
+
+    async def fetch_line_range(
+        self,
+        text_id: int,
+        start: Tuple[int, int],
+        end: Tuple[int, int],
+        limit: int,
+        include_tokens: bool = False
+    ) -> Sequence[Mapping[str, Any]]:
+        """Get up to limit lines of a text between two (division_id, line_number) positions."""
+        sql = LINE_RANGE_QUERY.format(token_column=", tl.spacy_tokens" if include_tokens else "")
+        return await self.fetch(sql, {
+            "text_id": text_id,
+            "start_division_id": start[0],
+            "start_line": start[1],
+            "end_division_id": end[0],
+            "end_line": end[1],
+            "limit": limit
+        })
+
+    async def fetch_lexical_value(self, lemma: str) -> Optional[Mapping[str, Any]]:
+        """Get the columns of a lexical value by lemma."""
+        rows = await self.fetch(LEXICAL_VALUE_QUERY, {"lemma": lemma})
+        return rows[0] if rows else None
@@ -2,54 +2,260 @@
 Redis client utility for caching.
 """
 
-from typing import Optional, Any, Union
+from typing import Optional, Any, Awaitable, Callable, Union, List, Dict, Tuple
+from collections import Counter, defaultdict, OrderedDict
+import asyncio
 import json
-from redis.asyncio import Redis
+import logging
+import time
+from redis.asyncio import Redis, ConnectionPool
 from app.core.config import settings
+from app.core.metrics import metrics, SIZE_BUCKETS
+
+logger = logging.getLogger(__name__)
+
+# Cache metrics, labelled by key prefix (e.g. "text:", "search_results:")
+cache_requests = metrics.counter(
+    "cache_requests_total", "Cache lookups by key prefix and result", ("prefix", "result")
+)
+cache_errors = metrics.counter(
+    "cache_errors_total", "Redis errors by operation and key prefix", ("operation", "prefix")
+)
+cache_latency = metrics.histogram(
+    "cache_operation_seconds", "Redis operation latency", ("operation", "prefix")
+)
+cache_payload_size = metrics.histogram(
+    "cache_payload_bytes", "Serialized cache payload size", ("operation", "prefix"), SIZE_BUCKETS
+)
+cache_keys = metrics.gauge(
+    "cache_keys", "Number of Redis keys per prefix (sampled)", ("prefix",)
+)
+cache_memory = metrics.gauge(
+    "cache_memory_bytes", "Estimated Redis memory usage per prefix (sampled)", ("prefix",)
+)
+cache_circuit_open = metrics.gauge(
+    "cache_circuit_open", "Whether the Redis circuit breaker is open (1) or closed (0)"
+)
+cache_fallback_requests = metrics.counter(
+    "cache_fallback_requests_total", "Local fallback cache lookups by key prefix and result", ("prefix", "result")
+)
+
+def key_prefix(key: Union[str, bytes]) -> str:
+    """Get the metrics prefix of a cache key (everything up to the first colon)."""
+    if isinstance(key, bytes):
+        key = key.decode('utf-8', errors='replace')
+    head, sep, _ = key.partition(":")
+    return f"{head}:" if sep else "other"
+
+class CacheUnavailableError(Exception):
+    """Raised internally when the circuit breaker short-circuits a Redis call."""
+    pass
+
+class CircuitBreaker:
+    """Trips after repeated Redis failures and lets one probe through after a cool-down.
+    
+    States: closed (calls allowed), open (calls rejected until reset_timeout
+    has passed), half-open (a single probe call decides whether to close).
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def allow(self) -> bool:
+        """Check whether a call may go to Redis."""
+        if self.opened_at is None:
+            return True
+        if not self._probing and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        if self.opened_at is not None:
+            logger.info("Redis recovered, closing circuit breaker")
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+        cache_circuit_open.set(0)
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self._probing or (self.opened_at is None and self.failures >= self.failure_threshold):
+            if self.opened_at is None:
+                logger.warning(
+                    f"Redis failed {self.failures} times, opening circuit breaker "
+                    f"for {self.reset_timeout}s"
+                )
+            self.opened_at = time.monotonic()
+            self._probing = False
+            cache_circuit_open.set(1)
+
+class LocalFallbackCache:
+    """Bounded in-process LRU store with per-entry expiry.
+    
+    Used for result pages while Redis is unavailable, so pagination keeps
+    working within a single worker. Values are kept serialized so callers
+    never share mutable objects.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: bytes, ttl: Optional[int]) -> None:
+        expires_at = time.monotonic() + (ttl or settings.redis.SEARCH_RESULTS_TTL)
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
 
 class RedisClient:
     _instance = None
     _redis = None
+    _sampler_task = None
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(RedisClient, cls).__new__(cls)
+            cls._instance.breaker = CircuitBreaker(
+                settings.redis.REDIS_BREAKER_THRESHOLD,
+                settings.redis.REDIS_BREAKER_RESET_TIMEOUT
+            )
+            cls._instance.fallback = LocalFallbackCache(settings.redis.REDIS_FALLBACK_MAX_ENTRIES)
+            cls._instance._access_counts = defaultdict(Counter)
+            cls._instance._access_flushed_at = time.monotonic()
         return cls._instance
 
     async def init(self):
-        """Initialize Redis connection."""
+        """Initialize Redis connection pool with explicit timeouts."""
         if self._redis is None:
-            self._redis = Redis.from_url(
+            pool = ConnectionPool.from_url(
                 settings.redis.REDIS_URL,
                 db=settings.redis.REDIS_DB,
                 password=settings.redis.REDIS_PASSWORD,
                 encoding="utf-8",
-                decode_responses=False  # Changed to False to handle raw bytes
+                decode_responses=False,  # Changed to False to handle raw bytes
+                max_connections=settings.redis.REDIS_MAX_CONNECTIONS,
+                socket_timeout=settings.redis.REDIS_SOCKET_TIMEOUT,
+                socket_connect_timeout=settings.redis.REDIS_CONNECT_TIMEOUT,
+                health_check_interval=settings.redis.REDIS_HEALTH_CHECK_INTERVAL
             )
+            self._redis = Redis(connection_pool=pool)
+
+    def _log_error(self, operation: str, key: str, error: Exception) -> None:
+        """Log and count a Redis error without raising."""
+        if isinstance(error, CacheUnavailableError):
+            # Breaker is open; the trip itself was already logged
+            return
+        cache_errors.inc(operation=operation, prefix=key_prefix(key))
+        logger.error(f"Redis {operation} error for {key}: {error}")
+
+    def _uses_fallback(self, key: str) -> bool:
+        """Check whether a key may be served from the local fallback store."""
+        return key.startswith(tuple(
+            p.strip() for p in settings.redis.REDIS_FALLBACK_PREFIXES.split(",") if p.strip()
+        ))
+
+    async def _execute(self, command: Callable[[Redis], Awaitable[Any]]) -> Any:
+        """Run a Redis command through the circuit breaker."""
+        if not self._redis:
+            await self.init()
+        if not self.breaker.allow():
+            raise CacheUnavailableError("Redis circuit breaker is open")
+        try:
+            result = await command(self._redis)
+        except Exception:
+            self.breaker.record_failure()
+            raise
+        self.breaker.record_success()
+        return result
 
     async def close(self):
         """Close Redis connection."""
         if self._redis:
+            await self.flush_access_log()
             await self._redis.close()
             self._redis = None
 
     async def get(self, key: str) -> Optional[Any]:
-        """Get value from Redis."""
-        if not self._redis:
-            await self.init()
-        
+        """Get value from Redis, or from the local fallback while Redis is down."""
+        value = await self.get_bytes(key)
+        if value:
+            try:
+                return json.loads(value.decode('utf-8'))
+            except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                logger.error(f"Redis decode error for {key}: {e}")
+        return None
+
+    async def get_bytes(self, key: str) -> Optional[bytes]:
+        """Get a raw (still JSON-serialized) value, e.g. to stream it unchanged."""
+        prefix = key_prefix(key)
+        start = time.perf_counter()
         try:
-            value = await self._redis.get(key)
+            value = await self._execute(lambda r: r.get(key))
+            cache_latency.observe(time.perf_counter() - start, operation="get", prefix=prefix)
             if value:
-                try:
-                    return json.loads(value.decode('utf-8'))
-                except (json.JSONDecodeError, UnicodeDecodeError) as e:
-                    print(f"Redis decode error: {e}")
-                    return None
-            return None
+                cache_requests.inc(prefix=prefix, result="hit")
+                cache_payload_size.observe(len(value), operation="get", prefix=prefix)
+            else:
+                cache_requests.inc(prefix=prefix, result="miss")
         except Exception as e:
-            print(f"Redis get error: {e}")
-            return None
+            cache_requests.inc(prefix=prefix, result="error")
+            self._log_error("get", key, e)
+            if not self._uses_fallback(key):
+                return None
+            value = self.fallback.get(key)
+            cache_fallback_requests.inc(prefix=prefix, result="hit" if value else "miss")
+        return value or None
+
+    async def get_many_bytes(self, keys: List[str]) -> List[Optional[bytes]]:
+        """Get several raw values in a single round trip (MGET)."""
+        if not keys:
+            return []
+        start = time.perf_counter()
+        try:
+            values = await self._execute(lambda r: r.mget(keys))
+            cache_latency.observe(time.perf_counter() - start, operation="mget", prefix=key_prefix(keys[0]))
+        except Exception as e:
+            self._log_error("mget", keys[0], e)
+            values = []
+            for key in keys:
+                prefix = key_prefix(key)
+                cache_requests.inc(prefix=prefix, result="error")
+                value = None
+                if self._uses_fallback(key):
+                    value = self.fallback.get(key)
+                    cache_fallback_requests.inc(prefix=prefix, result="hit" if value else "miss")
+                values.append(value)
+            return [value or None for value in values]
+        for key, value in zip(keys, values):
+            cache_requests.inc(prefix=key_prefix(key), result="hit" if value else "miss")
+        return [value or None for value in values]
 
     async def set(
         self,
@@ -57,61 +263,324 @@ class RedisClient:
         value: Any,
         ttl: Optional[int] = None
     ) -> bool:
-        """Set value in Redis with optional TTL."""
-        if not self._redis:
-            await self.init()
-        
+        """Set value in Redis with optional TTL (locally while Redis is down)."""
         try:
             serialized = json.dumps(value).encode('utf-8')
+        except (TypeError, ValueError) as e:
+            self._log_error("set", key, e)
+            return False
+        return await self.set_bytes(key, serialized, ttl)
+
+    async def set_bytes(
+        self,
+        key: str,
+        serialized: bytes,
+        ttl: Optional[int] = None
+    ) -> bool:
+        """Set an already JSON-serialized value in Redis with optional TTL."""
+        prefix = key_prefix(key)
+        cache_payload_size.observe(len(serialized), operation="set", prefix=prefix)
+        start = time.perf_counter()
+        try:
             if ttl:
-                await self._redis.setex(key, ttl, serialized)
+                await self._execute(lambda r: r.setex(key, ttl, serialized))
             else:
-                await self._redis.set(key, serialized)
+                await self._execute(lambda r: r.set(key, serialized))
+            cache_latency.observe(time.perf_counter() - start, operation="set", prefix=prefix)
             return True
         except Exception as e:
-            print(f"Redis set error: {e}")
+            self._log_error("set", key, e)
+            if self._uses_fallback(key):
+                self.fallback.set(key, serialized, ttl)
+                return True
             return False
 
-    async def delete(self, key: str) -> bool:
-        """Delete key from Redis."""
-        if not self._redis:
-            await self.init()
+    async def set_if_absent(self, key: str, value: Any, ttl: int) -> bool:
+        """Set value only if key does not exist (SET NX), e.g. for locks."""
+        try:
+            serialized = json.dumps(value).encode('utf-8')
+            return bool(await self._execute(lambda r: r.set(key, serialized, ex=ttl, nx=True)))
+        except Exception as e:
+            self._log_error("set_if_absent", key, e)
+            return False
+
+    async def delete(self, *keys: str) -> bool:
+        """Delete one or more keys from Redis (and from the local fallback)."""
+        if not keys:
+            return True
+        for key in keys:
+            self.fallback.delete(key)
+        try:
+            await self._execute(lambda r: r.delete(*keys))
+            return True
+        except Exception as e:
+            self._log_error("delete", keys[0], e)
+            return False
+
+    async def expire(self, keys: List[str], ttl: int) -> bool:
+        """Reset the TTL of several keys in a single round trip."""
+        if not keys:
+            return True
+        
+        async def command(r: Redis):
+            pipe = r.pipeline(transaction=False)
+            for key in keys:
+                pipe.expire(key, ttl)
+            return await pipe.execute()
         
         try:
-            await self._redis.delete(key)
+            await self._execute(command)
             return True
         except Exception as e:
-            print(f"Redis delete error: {e}")
+            self._log_error("expire", keys[0], e)
             return False
 
-    async def exists(self, key: str) -> bool:
-        """Check if key exists in Redis."""
-        if not self._redis:
-            await self.init()
+    async def incr(self, key: str) -> Optional[int]:
+        """Atomically increment an integer counter in Redis."""
+        try:
+            return await self._execute(lambda r: r.incr(key))
+        except Exception as e:
+            self._log_error("incr", key, e)
+            return None
+
+    async def record_access(self, kind: str, member: str) -> None:
+        """Count an access to a text or lemma for the cache warmer.
+        
+        Counts are buffered per worker and written in one pipeline at most
+        every ACCESS_LOG_FLUSH_INTERVAL seconds, so reads do not pay a Redis
+        round trip each.
+        """
+        self._access_counts[kind][member] += 1
+        if (
+            time.monotonic() - self._access_flushed_at >= settings.redis.ACCESS_LOG_FLUSH_INTERVAL
+            or sum(len(members) for members in self._access_counts.values()) >= settings.redis.ACCESS_LOG_MAX_ENTRIES
+        ):
+            await self.flush_access_log()
+
+    async def flush_access_log(self) -> bool:
+        """Write buffered access counts and trim each access log.
         
+        Each log keeps its ACCESS_LOG_MAX_ENTRIES highest-scored members and
+        expires ACCESS_LOG_TTL seconds after its last write.
+        """
+        counts, self._access_counts = self._access_counts, defaultdict(Counter)
+        self._access_flushed_at = time.monotonic()
+        if not counts:
+            return True
+        
+        async def command(r: Redis):
+            pipe = r.pipeline(transaction=False)
+            for kind, members in counts.items():
+                key = f"{settings.redis.ACCESS_LOG_PREFIX}{kind}"
+                for member, count in members.items():
+                    pipe.zincrby(key, count, member)
+                pipe.zremrangebyrank(key, 0, -(settings.redis.ACCESS_LOG_MAX_ENTRIES + 1))
+                pipe.expire(key, settings.redis.ACCESS_LOG_TTL)
+            return await pipe.execute()
+        
+        try:
+            await self._execute(command)
+            return True
+        except Exception as e:
+            self._log_error("flush_access_log", settings.redis.ACCESS_LOG_PREFIX, e)
+            return False
+
+    async def ztop(self, key: str, count: int) -> List[str]:
+        """Get the highest-scored members of a sorted set."""
         try:
-            return await self._redis.exists(key) > 0
+            members = await self._execute(lambda r: r.zrevrange(key, 0, count - 1))
+            return [m.decode('utf-8') if isinstance(m, bytes) else m for m in members]
+        except Exception as e:
+            self._log_error("ztop", key, e)
+            return []
+
+    async def zadd(self, key: str, member: str, score: float) -> bool:
+        """Add a member to a sorted set (or update its score)."""
+        try:
+            await self._execute(lambda r: r.zadd(key, {member: score}))
+            return True
+        except Exception as e:
+            self._log_error("zadd", key, e)
+            return False
+
+    async def zrange(self, key: str, start: int = 0, stop: int = -1) -> List[str]:
+        """Get members of a sorted set by rank, lowest score first."""
+        try:
+            members = await self._execute(lambda r: r.zrange(key, start, stop))
+            return [m.decode('utf-8') if isinstance(m, bytes) else m for m in members]
+        except Exception as e:
+            self._log_error("zrange", key, e)
+            return []
+
+    async def zrange_by_score(self, key: str, min_score: Union[float, str], max_score: Union[float, str]) -> List[str]:
+        """Get members of a sorted set with scores in [min_score, max_score]."""
+        try:
+            members = await self._execute(lambda r: r.zrangebyscore(key, min_score, max_score))
+            return [m.decode('utf-8') if isinstance(m, bytes) else m for m in members]
+        except Exception as e:
+            self._log_error("zrange_by_score", key, e)
+            return []
+
+    async def zrem(self, key: str, *members: str) -> bool:
+        """Remove members from a sorted set."""
+        if not members:
+            return True
+        try:
+            await self._execute(lambda r: r.zrem(key, *members))
+            return True
         except Exception as e:
-            print(f"Redis exists error: {e}")
+            self._log_error("zrem", key, e)
             return False
 
+    async def hset(self, key: str, field: str, value: Any) -> bool:
+        """Set a JSON-serialized field in a hash."""
+        try:
+            serialized = json.dumps(value).encode('utf-8')
+            await self._execute(lambda r: r.hset(key, field, serialized))
+            return True
+        except Exception as e:
+            self._log_error("hset", key, e)
+            return False
+
+    async def hdel(self, key: str, *fields: str) -> bool:
+        """Delete fields from a hash."""
+        if not fields:
+            return True
+        try:
+            await self._execute(lambda r: r.hdel(key, *fields))
+            return True
+        except Exception as e:
+            self._log_error("hdel", key, e)
+            return False
+
+    async def hgetall(self, key: str) -> Dict[str, Any]:
+        """Get all fields of a hash, JSON-decoding the values."""
+        try:
+            entries = await self._execute(lambda r: r.hgetall(key))
+            return {
+                (f.decode('utf-8') if isinstance(f, bytes) else f): json.loads(v)
+                for f, v in entries.items()
+            }
+        except Exception as e:
+            self._log_error("hgetall", key, e)
+            return {}
+
+    async def exists(self, key: str) -> bool:
+        """Check if key exists in Redis (or in the local fallback while Redis is down)."""
+        try:
+            return await self._execute(lambda r: r.exists(key)) > 0
+        except Exception as e:
+            self._log_error("exists", key, e)
+            return self._uses_fallback(key) and self.fallback.get(key) is not None
+
     async def clear_cache(self, pattern: str = "*") -> bool:
         """Clear cache entries matching pattern."""
-        if not self._redis:
-            await self.init()
-        
         try:
             cursor = 0
             while True:
-                cursor, keys = await self._redis.scan(cursor, match=pattern)
+                cursor, keys = await self._execute(lambda r: r.scan(cursor, match=pattern))
                 if keys:
-                    await self._redis.delete(*keys)
+                    await self._execute(lambda r: r.delete(*keys))
                 if cursor == 0:
                     break
             return True
         except Exception as e:
-            print(f"Redis clear cache error: {e}")
+            self._log_error("clear_cache", pattern, e)
             return False
 
+    async def sample_memory_usage(self, sample_size: Optional[int] = None) -> Dict[str, Dict[str, float]]:
+        """Estimate key counts and memory usage per key prefix.
+        
+        Scans at most METRICS_SCAN_LIMIT keys to estimate each prefix's share
+        of DBSIZE, then measures MEMORY USAGE on up to sample_size keys per
+        prefix and extrapolates. All calls go through the circuit breaker.
+        The report is published as cache_keys / cache_memory_bytes gauges and
+        stored for the other workers.
+        """
+        sample_size = sample_size or settings.redis.METRICS_SAMPLE_SIZE
+        total = await self._execute(lambda r: r.dbsize())
+        counts: Dict[str, int] = defaultdict(int)
+        sampled: Dict[str, List[bytes]] = defaultdict(list)
+        
+        cursor, scanned = 0, 0
+        while scanned < settings.redis.METRICS_SCAN_LIMIT:
+            cursor, keys = await self._execute(lambda r: r.scan(cursor, count=1000))
+            for key in keys:
+                prefix = key_prefix(key)
+                counts[prefix] += 1
+                if len(sampled[prefix]) < sample_size:
+                    sampled[prefix].append(key)
+            scanned += len(keys)
+            if cursor == 0:
+                break
+        
+        report = {}
+        for prefix, keys in sampled.items():
+            async def command(r: Redis, keys=keys):
+                pipe = r.pipeline(transaction=False)
+                for key in keys:
+                    pipe.memory_usage(key)
+                return await pipe.execute()
+            sizes = [size for size in await self._execute(command) if size]
+            mean = sum(sizes) / len(sizes) if sizes else 0
+            keys_estimate = counts[prefix] * total / scanned if scanned else 0
+            report[prefix] = {
+                "keys": round(keys_estimate),
+                "sampled": len(sizes),
+                "mean_bytes": mean,
+                "estimated_bytes": mean * keys_estimate
+            }
+        
+        self._publish_memory_report(report)
+        await self.set(settings.redis.METRICS_SAMPLE_KEY, report, ttl=2 * max(settings.redis.METRICS_SAMPLE_INTERVAL, 60))
+        return report
+
+    @staticmethod
+    def _publish_memory_report(report: Dict[str, Dict[str, float]]) -> None:
+        """Set the per-prefix key count and memory gauges from a report."""
+        cache_keys.clear()
+        cache_memory.clear()
+        for prefix, stats in report.items():
+            cache_keys.set(stats["keys"], prefix=prefix)
+            cache_memory.set(stats["estimated_bytes"], prefix=prefix)
+
+    async def _run_memory_sampler(self, interval: int) -> None:
+        """Periodically sample memory usage per prefix (one worker per interval)."""
+        while True:
+            start = time.perf_counter()
+            try:
+                if await self.set_if_absent(settings.redis.METRICS_SAMPLER_LOCK_KEY, 1, ttl=max(1, interval - 1)):
+                    report = await self.sample_memory_usage()
+                    total = sum(stats["estimated_bytes"] for stats in report.values())
+                    logger.info(
+                        f"Sampled Redis memory in {time.perf_counter() - start:.2f}s: "
+                        f"~{total / 1048576:.1f} MiB across {len(report)} prefixes"
+                    )
+                else:
+                    # Another worker sampled; publish its report
+                    report = await self.get(settings.redis.METRICS_SAMPLE_KEY)
+                    if report:
+                        self._publish_memory_report(report)
+            except Exception as e:
+                if not isinstance(e, CacheUnavailableError):
+                    logger.error(f"Redis memory sampling error: {e}")
+            await asyncio.sleep(interval)
+
+    def start_memory_sampler(self) -> None:
+        """Start the periodic memory sampler (no-op if disabled or running)."""
+        interval = settings.redis.METRICS_SAMPLE_INTERVAL
+        if interval > 0 and self._sampler_task is None:
+            self._sampler_task = asyncio.create_task(self._run_memory_sampler(interval))
+
+    async def stop_memory_sampler(self) -> None:
+        """Stop the periodic memory sampler."""
+        if self._sampler_task is not None:
+            self._sampler_task.cancel()
+            try:
+                await self._sampler_task
+            except asyncio.CancelledError:
+                pass
+            self._sampler_task = None
+
 # Create singleton instance
 redis_client = RedisClient()
@@ -0,0 +1,101 @@
+"""
+Response rendering helpers.
+
+Routers render with ORJSONResponse by default. The helpers here implement
+sparse fieldsets: `include_tokens=false` drops spaCy token data (usually
+most of a citation or text payload) and `fields=` keeps only the listed
+citation fields, given as comma-separated dotted paths such as
+`citation,sentence.text,source.author`.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+from fastapi import HTTPException, Query
+from fastapi.responses import ORJSONResponse
+
+from app.models.citations import Citation, SearchResponse
+from app.models.text_division import TextResponse
+
+# Query parameters for sparse fieldsets
+IncludeTokens = Query(True, description="Include spaCy token data")
+CitationFields = Query(
+    None,
+    description="Comma-separated citation fields to return, e.g. citation,sentence.text,source"
+)
+
+# Excludes spaCy tokens from every line of a TextResponse
+TEXT_TOKENS_EXCLUDE = {"divisions": {"__all__": {"lines": {"__all__": {"spacy_tokens"}}}}}
+
+def _field_tree(fields: str) -> Dict[str, Any]:
+    """Turn comma-separated dotted paths into a Pydantic include specification."""
+    tree: Dict[str, Any] = {}
+    for path in fields.split(","):
+        parts = [part for part in path.strip().split(".") if part]
+        if not parts:
+            continue
+        if parts[0] not in Citation.model_fields:
+            raise ValueError(f"Unknown citation field: {parts[0]}")
+        node = tree
+        for part in parts[:-1]:
+            if node.get(part) is True:
+                break
+            node = node.setdefault(part, {})
+        else:
+            node[parts[-1]] = True
+    return tree
+
+def citation_projection(
+    include_tokens: bool = True,
+    fields: Optional[str] = None
+) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """Get Pydantic include/exclude specifications for a single citation.
+
+    Raises:
+        ValueError: If fields names an unknown citation field
+    """
+    include = _field_tree(fields) if fields else None
+    exclude = None if include_tokens else {"sentence": {"tokens": True}}
+    return include, exclude
+
+def check_fields(include_tokens: bool, fields: Optional[str]) -> None:
+    """Reject unknown citation fields with a 400 before doing any work."""
+    try:
+        citation_projection(include_tokens, fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def is_projected(include_tokens: bool = True, fields: Optional[str] = None) -> bool:
+    """Check whether a request asks for anything but the full representation."""
+    return not include_tokens or bool(fields)
+
+def project_citations(
+    citations: List[Citation],
+    include_tokens: bool = True,
+    fields: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Dump citations keeping only the requested fields."""
+    include, exclude = citation_projection(include_tokens, fields)
+    return [
+        citation.model_dump(mode="json", include=include, exclude=exclude)
+        for citation in citations
+    ]
+
+def render_search(
+    result: SearchResponse,
+    include_tokens: bool = True,
+    fields: Optional[str] = None
+) -> ORJSONResponse:
+    """Render search results keeping only the requested citation fields."""
+    return ORJSONResponse({
+        "results": project_citations(result.results, include_tokens, fields),
+        "results_id": result.results_id,
+        "total_results": result.total_results
+    })
+
+def render_text(
+    text: TextResponse,
+    include_tokens: bool = True,
+    headers: Optional[Dict[str, str]] = None
+) -> ORJSONResponse:
+    """Render a text, optionally without spaCy token data."""
+    exclude = None if include_tokens else TEXT_TOKENS_EXCLUDE
+    return ORJSONResponse(text.model_dump(mode="json", exclude=exclude), headers=headers)
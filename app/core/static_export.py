@@ -0,0 +1,130 @@
+"""
+Pre-rendered static exports of corpus responses.
+
+The ingestion pipeline writes each text and table of contents as a
+serialized JSON file plus a gzip-compressed copy under STATIC_EXPORT_DIR,
+with a manifest recording each export's ETag and content hashes. The API
+serves an export with FileResponse when its recorded ETag matches the
+current one (same corpus generation and text version), so a text that was
+invalidated after the export is served from the database again.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Optional
+from fastapi import Request
+from fastapi.responses import FileResponse
+import gzip
+import hashlib
+import json
+import logging
+import os
+import time
+
+from app.core.config import settings
+from app.core.http_cache import cache_headers
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+
+# Manifest of the current export, reloaded when the file changes
+_manifest: Dict[str, Any] = {}
+_manifest_mtime: Optional[int] = None
+
+def _export_dir() -> Path:
+    """Get the static export directory."""
+    return Path(settings.STATIC_EXPORT_DIR)
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Write a file so readers never see it partially written."""
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+class StaticExportWriter:
+    """Writes exported responses and their manifest."""
+
+    def __init__(self, directory: Optional[Path] = None):
+        """Initialize the writer for an export directory."""
+        self.directory = directory or _export_dir()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.entries: Dict[str, Dict[str, Any]] = {}
+
+    def write(self, name: str, data: bytes, etag: str) -> None:
+        """Write a serialized response and its gzip-compressed copy.
+
+        Args:
+            name: Export name (e.g. "text-12")
+            data: Serialized JSON response body
+            etag: ETag the API would send for this response
+        """
+        compressed = gzip.compress(data, compresslevel=9, mtime=0)
+        _write_atomic(self.directory / f"{name}.json", data)
+        _write_atomic(self.directory / f"{name}.json.gz", compressed)
+        self.entries[name] = {
+            "etag": etag,
+            "sha256": hashlib.sha256(data).hexdigest(),
+            "bytes": len(data),
+            "gzip_bytes": len(compressed)
+        }
+
+    def finish(self) -> Dict[str, Any]:
+        """Write the manifest and remove exports that are no longer listed."""
+        manifest = {"created_at": time.time(), "files": self.entries}
+        _write_atomic(
+            self.directory / MANIFEST_NAME,
+            json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8")
+        )
+
+        for path in self.directory.glob("*.json*"):
+            name = path.name.removesuffix(".gz").removesuffix(".json")
+            if path.name != MANIFEST_NAME and name not in self.entries:
+                path.unlink()
+        return manifest
+
+def _load_manifest() -> Dict[str, Any]:
+    """Get the current manifest, reloading it when the file has changed."""
+    global _manifest, _manifest_mtime
+    path = _export_dir() / MANIFEST_NAME
+    try:
+        mtime = path.stat().st_mtime_ns
+    except OSError:
+        _manifest, _manifest_mtime = {}, None
+        return _manifest
+
+    if mtime != _manifest_mtime:
+        try:
+            _manifest = json.loads(path.read_bytes()).get("files", {})
+            _manifest_mtime = mtime
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read static export manifest: {e}")
+            _manifest = {}
+    return _manifest
+
+def export_response(request: Request, name: str, etag: str) -> Optional[FileResponse]:
+    """Serve an exported response if it is present and current.
+
+    Args:
+        request: Incoming request (for Accept-Encoding)
+        name: Export name (e.g. "text-12")
+        etag: Current ETag of the response
+
+    Returns:
+        A FileResponse, or None to fall back to the database
+    """
+    entry = _load_manifest().get(name)
+    if not entry or entry.get("etag") != etag:
+        return None
+
+    headers = {**cache_headers(etag), "Vary": "Accept-Encoding"}
+    path = _export_dir() / f"{name}.json"
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        path = path.with_name(f"{name}.json.gz")
+        headers["Content-Encoding"] = "gzip"
+
+    try:
+        stat_result = path.stat()
+    except OSError:
+        logger.warning(f"Static export {path} is listed in the manifest but missing")
+        return None
+    return FileResponse(path, media_type="application/json", headers=headers, stat_result=stat_result)
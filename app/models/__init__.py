@@ -25,6 +25,7 @@ from .lemma import Lemma
 from .lemma_analysis import LemmaAnalysis
 from .lexical_value import LexicalValue
 from .sentence import Sentence
+from .corpus_stats import CorpusStat
 
 # List of all models for easy access
 __all__ = [
@@ -36,5 +37,6 @@ __all__ = [
     "Lemma",
     "LemmaAnalysis",
     "LexicalValue",
-    "Sentence"
+    "Sentence",
+    "CorpusStat"
 ]
@@ -8,6 +8,7 @@ This module defines the data models used for citation handling:
 4. CitationLocation: Structural location in the work
 5. CitationSource: Work and author information
 6. SearchResponse: Search results with pagination metadata
+7. ReferenceResolution: A citation reference resolved to a line range
 
 These models are used for:
 - API request/response validation
@@ -19,6 +20,8 @@ These models are used for:
 from typing import Dict, List, Optional
 from pydantic import BaseModel
 
+from app.models.text_line import TextLineRangeResponse
+
 class SentenceContext(BaseModel):
     """
     Represents a sentence with its surrounding context and analysis.
@@ -105,6 +108,22 @@ class Citation(BaseModel):
     location: CitationLocation
     source: CitationSource
 
+    @classmethod
+    def from_trusted(cls, data: Dict) -> "Citation":
+        """
+        Build a citation from a trusted dict without validation.
+        
+        Only for data produced by our own queries or serialization (e.g.
+        stored result pages); external input goes through model_validate.
+        """
+        return cls.model_construct(
+            sentence=SentenceContext.model_construct(**data["sentence"]),
+            citation=data["citation"],
+            context=CitationContext.model_construct(**data["context"]),
+            location=CitationLocation.model_construct(**data["location"]),
+            source=CitationSource.model_construct(**data["source"])
+        )
+
 class SearchResponse(BaseModel):
     """
     Response model for search operations.
@@ -118,3 +137,35 @@ class SearchResponse(BaseModel):
     results: List[Citation]
     results_id: str
     total_results: int
+
+class ReferenceResolution(BaseModel):
+    """
+    A citation reference (e.g. "Gal. San. 6.135" or "0057.001 1.5.3-1.6.10")
+    resolved to a range of lines.
+    
+    Attributes:
+        reference: The reference as given
+        author_id: TLG author ID
+        work_number: TLG work number
+        structure: Citation levels of the work (e.g. ["Volume", "Chapter", "Line"])
+        start: Database field values of the start of the range
+        end: Database field values of the end of the range
+        text_id: ID of the text containing the range
+        start_division_id: Division of the first line
+        start_line: Line number of the first line
+        end_division_id: Division of the last line
+        end_line: Line number of the last line
+        lines: First page of lines in the range, if requested
+    """
+    reference: str
+    author_id: str
+    work_number: str
+    structure: List[str]
+    start: Dict[str, str]
+    end: Dict[str, str]
+    text_id: str
+    start_division_id: str
+    start_line: int
+    end_division_id: str
+    end_line: int
+    lines: Optional[TextLineRangeResponse] = None
@@ -0,0 +1,79 @@
+from typing import Optional, Dict, Any, List
+from pydantic import BaseModel
+from sqlalchemy import String, Integer, JSON, Index, desc
+from sqlalchemy.orm import Mapped, mapped_column
+from . import Base
+
+# Stat scopes: per-work structure counts, and category/lemma frequencies
+WORK_SCOPE = "work"
+CATEGORY_SCOPE = "category"
+LEMMA_SCOPE = "lemma"
+
+# text_id of corpus-wide totals
+CORPUS_TOTAL = 0
+
+class CorpusStat(Base):
+    """Model for incrementally maintained corpus statistics.
+
+    Rows are written by the ingestion pipeline as it processes each work:
+    one "work" row per text with its structure counts, and corpus-wide
+    "category" and "lemma" rows (text_id 0) with token frequencies. Each
+    work row keeps the category and lemma counts it contributed, so that
+    re-processing a work adjusts the totals by the difference instead of
+    counting it twice.
+    """
+    __tablename__ = "corpus_stats"
+
+    # Composite primary key: scope, key (category/lemma, empty for works) and text
+    scope: Mapped[str] = mapped_column(String(16), primary_key=True)
+    key: Mapped[str] = mapped_column(String, primary_key=True, default="")
+    text_id: Mapped[int] = mapped_column(Integer, primary_key=True, default=CORPUS_TOTAL)
+
+    # Structure counts (work rows)
+    divisions: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    lines: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    sentences: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    tokens: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+
+    # Token frequency (category and lemma rows)
+    occurrences: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+
+    # Category and lemma counts contributed by a work (work rows)
+    breakdown: Mapped[Optional[Dict[str, Any]]] = mapped_column(
+        JSON,
+        nullable=True,
+        deferred=True
+    )
+
+    __table_args__ = (
+        # Most frequent categories/lemmas first
+        Index("ix_corpus_stats_scope_occurrences", "scope", "text_id", desc("occurrences")),
+    )
+
+    def __repr__(self) -> str:
+        return f"CorpusStat(scope={self.scope}, key={self.key}, text_id={self.text_id})"
+
+class WorkStats(BaseModel):
+    """Structure counts of a single work."""
+    text_id: str
+    title: Optional[str] = None
+    divisions: int
+    lines: int
+    sentences: int
+    tokens: int
+
+class FrequencyItem(BaseModel):
+    """Token frequency of a category or lemma."""
+    name: str
+    occurrences: int
+
+class CorpusStatsResponse(BaseModel):
+    """Corpus totals with per-work counts and category/lemma frequencies."""
+    texts: int
+    divisions: int
+    lines: int
+    sentences: int
+    tokens: int
+    works: List[WorkStats]
+    categories: List[FrequencyItem]
+    lemmas: List[FrequencyItem]
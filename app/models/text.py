@@ -32,6 +32,14 @@ class Text(Base):
         default=dict
     )
     
+    # Table of contents computed at ingestion (see TextService.build_table_of_contents).
+    # Deferred so that listing texts does not load it.
+    table_of_contents: Mapped[Optional[Dict[str, Any]]] = mapped_column(
+        JSON,
+        nullable=True,
+        deferred=True
+    )
+    
     # Relationships
     author = relationship("Author", back_populates="texts")
     divisions = relationship("TextDivision", back_populates="text", cascade="all, delete-orphan")
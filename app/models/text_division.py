@@ -3,13 +3,16 @@ Models for text divisions and responses.
 """
 
 from typing import Optional, Dict, Any, List
-from sqlalchemy import String, Integer, ForeignKey, JSON, Boolean
+from sqlalchemy import String, Integer, ForeignKey, JSON, Boolean, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from pydantic import BaseModel
 from . import Base
 from toolkit.parsers.citation import CitationParser
 from .text_line import TextLine, TextLineAPI
 
+# text_divisions columns that can hold a citation level (the line level is TextLine.line_number)
+DIVISION_LEVEL_FIELDS = ("epistle", "fragment", "volume", "book", "chapter", "section", "page")
+
 # Pydantic models for API responses
 class TextDivisionResponse(BaseModel):
     """API response model for text divisions."""
@@ -38,11 +41,50 @@ class TextResponse(BaseModel):
     reference_code: Optional[str] = None
     metadata: Optional[Dict] = None
     divisions: Optional[List[TextDivisionResponse]] = None
+    preview: Optional[str] = None
+
+class TableOfContentsNode(BaseModel):
+    """
+    A node of a text's table of contents (e.g. a book, chapter or section).
+    
+    Attributes:
+        level: Citation level name from the work structure (e.g. "Chapter")
+        value: Value of the level (e.g. "5")
+        title: Title text of the node, if it has a title line
+        line_count: Number of lines in the node and its children
+        start_division_id: Division of the first line
+        start_line: Line number of the first line
+        end_division_id: Division of the last line
+        end_line: Line number of the last line
+        children: Nodes of the next level
+    """
+    level: str
+    value: str
+    title: Optional[str] = None
+    line_count: int = 0
+    start_division_id: Optional[str] = None
+    start_line: Optional[int] = None
+    end_division_id: Optional[str] = None
+    end_line: Optional[int] = None
+    children: List["TableOfContentsNode"] = []
+
+class TableOfContentsResponse(BaseModel):
+    """API response model for a text's table of contents."""
+    text_id: str
+    structure: List[str]
+    line_count: int
+    nodes: List[TableOfContentsNode]
 
 # SQLAlchemy model for database
 class TextDivision(Base):
     """Model for storing text divisions with both citation and structural components."""
     __tablename__ = "text_divisions"
+    __table_args__ = (
+        Index(
+            "ix_text_divisions_citation",
+            "author_id_field", "work_number_field", "volume", "book", "chapter", "section", "page"
+        ),
+    )
 
     # Primary key
     id: Mapped[int] = mapped_column(primary_key=True)
@@ -50,7 +92,8 @@ class TextDivision(Base):
     # Foreign key to Text
     text_id: Mapped[int] = mapped_column(
         ForeignKey("texts.id", ondelete="CASCADE"),
-        nullable=False
+        nullable=False,
+        index=True
     )
     
     # Citation components
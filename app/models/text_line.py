@@ -3,7 +3,7 @@ Models for text lines, including both SQLAlchemy and Pydantic models.
 """
 
 from typing import Optional, Dict, Any, List
-from sqlalchemy import String, Integer, ForeignKey, JSON, Boolean
+from sqlalchemy import String, Integer, ForeignKey, JSON, Boolean, Index
 from sqlalchemy.dialects.postgresql import ARRAY, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from pydantic import BaseModel
@@ -28,6 +28,25 @@ class TextLineAPI(BaseModel):
     is_title: Optional[bool] = False
     spacy_tokens: Optional[Dict[str, Any]] = None
 
+class TextLineRangeItem(TextLineAPI):
+    """API response model for a line read as part of a range."""
+    division_id: str
+
+class TextLineRangeResponse(BaseModel):
+    """
+    API response model for a range of lines within a text.
+    
+    Attributes:
+        text_id: ID of the text the lines belong to
+        lines: Lines in (division, line number) order
+        next_division_id: Division of the first line after this page, if any
+        next_line_number: Line number of the first line after this page, if any
+    """
+    text_id: str
+    lines: List[TextLineRangeItem]
+    next_division_id: Optional[str] = None
+    next_line_number: Optional[int] = None
+
 # SQLAlchemy model for database
 class TextLine(Base):
     """Model for storing individual lines of text with their NLP annotations.
@@ -45,6 +64,9 @@ class TextLine(Base):
     the is_title flag. The line_number is used for both types.
     """
     __tablename__ = "text_lines"
+    __table_args__ = (
+        Index("ix_text_lines_division_id_line_number", "division_id", "line_number"),
+    )
 
     # Primary key
     id: Mapped[int] = mapped_column(primary_key=True)
@@ -43,6 +43,10 @@ from starlette.exceptions import HTTPException
 
 from app.api import api_router
 from app.services.llm_service import LLMServiceError
+from app.services.cache_warmer import warm_cache
+from app.services.llm.executor import llm_executor
+from app.core.redis import redis_client
+from app.core.compression import CompressionMiddleware
 
 # Get logger after configuration is applied
 logger = logging.getLogger(__name__)
@@ -65,6 +69,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger responses (corpus texts, search results)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.GZIP_MINIMUM_SIZE,
+    compresslevel=settings.GZIP_COMPRESS_LEVEL
+)
+
 # Error handling middleware
 @app.exception_handler(LLMServiceError)
 async def llm_service_error_handler(request: Request, exc: LLMServiceError):
@@ -132,6 +143,21 @@ async def startup_event():
     logger.info(f"Log Level: {settings.LOG_LEVEL}")
     logger.info(f"LLM Provider: {settings.llm.PROVIDER}")
     logger.info(f"Database URL: {settings.DATABASE_URL.split('@')[1]}")  # Log only host part for security
+    
+    # Fill Redis before the instance starts accepting requests
+    if settings.redis.WARMUP_ON_STARTUP:
+        logger.info("Warming cache before accepting requests")
+        await warm_cache()
+    
+    # Periodically report Redis memory usage per key prefix
+    redis_client.start_memory_sampler()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Flush buffered access counts, then stop background cache tasks and the LLM executor."""
+    await redis_client.flush_access_log()
+    await redis_client.stop_memory_sampler()
+    llm_executor.shutdown()
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,180 @@
+"""
+Cache warming for hot texts, lemmas and lexical values.
+
+After a deploy or a corpus cache invalidation, the first users would otherwise
+pay for rebuilding the text list, the most read texts and the most popular
+lemma searches. The warmer replays the top-K entries recorded in the Redis
+access log (or explicitly configured lemmas and text IDs) through the regular
+services, with bounded concurrency, so Redis is filled before traffic arrives.
+
+Usage:
+    python -m app.services.cache_warmer --top-k 50 --concurrency 4
+"""
+
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import argparse
+import asyncio
+import logging
+import time
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import async_session_maker
+from app.core.redis import redis_client
+from app.services.corpus_service import CorpusService
+
+logger = logging.getLogger(__name__)
+
+def _split_setting(value: str) -> List[str]:
+    """Split a comma-separated setting into a list of non-empty items."""
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+class CacheWarmer:
+    """Replays hot cache entries through the services with bounded concurrency."""
+
+    def __init__(
+        self,
+        top_k: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        include_all_texts: Optional[bool] = None,
+        lemmas: Optional[List[str]] = None,
+        text_ids: Optional[List[int]] = None
+    ):
+        """Initialize the warmer, defaulting to the Redis warm-up settings."""
+        self.top_k = top_k if top_k is not None else settings.redis.WARMUP_TOP_K
+        self.concurrency = concurrency or settings.redis.WARMUP_CONCURRENCY
+        self.include_all_texts = (
+            include_all_texts if include_all_texts is not None
+            else settings.redis.WARMUP_ALL_TEXTS
+        )
+        self.lemmas = lemmas if lemmas is not None else _split_setting(settings.redis.WARMUP_LEMMAS)
+        self.text_ids = (
+            text_ids if text_ids is not None
+            else [int(t) for t in _split_setting(settings.redis.WARMUP_TEXT_IDS)]
+        )
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+
+    async def _hot_members(self, kind: str) -> List[str]:
+        """Get the top-K most accessed members of an access log."""
+        if self.top_k <= 0:
+            return []
+        return await redis_client.ztop(f"{settings.redis.ACCESS_LOG_PREFIX}{kind}", self.top_k)
+
+    async def _run(
+        self,
+        label: str,
+        job: Callable[[AsyncSession], Awaitable[Any]]
+    ) -> bool:
+        """Run a warm-up job in its own session, bounded by the semaphore."""
+        async with self._semaphore:
+            start = time.time()
+            try:
+                async with async_session_maker() as session:
+                    await job(session)
+                logger.debug(f"Warmed {label} in {time.time() - start:.2f}s")
+                return True
+            except Exception as e:
+                logger.warning(f"Failed to warm {label}: {str(e)}")
+                return False
+
+    async def _warm_lexical_value(self, session: AsyncSession, lemma: str) -> None:
+        """Warm the lexical value cache for a lemma, if it has one."""
+        # Imported lazily: LexicalService pulls in the LLM client stack
+        from app.services.lexical_service import LexicalService
+        await LexicalService(session).get_lexical_value(lemma)
+
+    async def _warm_all_texts(self, session: AsyncSession) -> None:
+        """Warm the per-text chunks behind the /corpus/all stream."""
+        async for _ in CorpusService(session).stream_all_texts():
+            pass
+
+    async def warm(self) -> Dict[str, int]:
+        """Warm the cache and return counts of warmed and failed entries."""
+        start = time.time()
+
+        text_ids = list(dict.fromkeys(
+            self.text_ids + [int(t) for t in await self._hot_members("text") if t.isdigit()]
+        ))
+        lemmas = list(dict.fromkeys(self.lemmas + await self._hot_members("lemma")))
+
+        jobs = [self._run("text list", lambda s: CorpusService(s).list_texts())]
+        if self.include_all_texts:
+            jobs.append(self._run("all texts", self._warm_all_texts))
+        for text_id in text_ids:
+            jobs.append(self._run(
+                f"text {text_id}",
+                lambda s, text_id=text_id: CorpusService(s).get_text_by_id(text_id, record_access=False)
+            ))
+        for lemma in lemmas:
+            jobs.append(self._run(
+                f"lemma search {lemma}",
+                lambda s, lemma=lemma: CorpusService(s).search_texts(
+                    lemma, search_lemma=True, record_access=False
+                )
+            ))
+            jobs.append(self._run(
+                f"lexical value {lemma}",
+                lambda s, lemma=lemma: self._warm_lexical_value(s, lemma)
+            ))
+
+        results = await asyncio.gather(*jobs)
+        summary = {
+            "warmed": sum(1 for ok in results if ok),
+            "failed": sum(1 for ok in results if not ok),
+            "texts": len(text_ids),
+            "lemmas": len(lemmas)
+        }
+        logger.info(
+            f"Cache warm-up finished in {time.time() - start:.2f}s: "
+            f"{summary['warmed']} warmed, {summary['failed']} failed "
+            f"({summary['texts']} texts, {summary['lemmas']} lemmas)"
+        )
+        return summary
+
+async def warm_cache(**kwargs) -> Dict[str, int]:
+    """Warm the cache with the given CacheWarmer options."""
+    await redis_client.init()
+    return await CacheWarmer(**kwargs).warm()
+
+def main():
+    parser = argparse.ArgumentParser(description="Warm the Redis cache with hot texts and lemmas")
+    parser.add_argument(
+        "--top-k",
+        type=int,
+        help="Number of most accessed texts and lemmas to replay"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        help="Maximum number of concurrent warm-up queries"
+    )
+    parser.add_argument(
+        "--all-texts",
+        action="store_true",
+        help="Also warm the full-content /corpus/all cache"
+    )
+    parser.add_argument(
+        "--lemmas",
+        type=str,
+        help="Comma-separated lemmas to warm in addition to the access log"
+    )
+    parser.add_argument(
+        "--text-ids",
+        type=str,
+        help="Comma-separated text IDs to warm in addition to the access log"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=settings.LOG_LEVEL.upper())
+
+    asyncio.run(warm_cache(
+        top_k=args.top_k,
+        concurrency=args.concurrency,
+        include_all_texts=True if args.all_texts else None,
+        lemmas=_split_setting(args.lemmas) if args.lemmas else None,
+        text_ids=[int(t) for t in _split_setting(args.text_ids)] if args.text_ids else None
+    ))
+
+if __name__ == "__main__":
+    main()
@@ -4,13 +4,13 @@ Service layer for category-related operations.
 
 from typing import List, Dict
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, text
 import logging
 
 from app.models.text_division import TextDivision
 from app.core.redis import redis_client
+from app.core.cache_keys import corpus_key
 from app.core.config import settings
-from app.core.citation_queries import CATEGORY_CITATION_QUERY
+from app.core.raw_queries import RawQueryRepository
 from app.services.citation_service import CitationService
 
 logger = logging.getLogger(__name__)
@@ -21,11 +21,12 @@ class CategoryService:
         self.session = session
         self.redis = redis_client
         self.citation_service = CitationService(session)
+        self.raw_queries = RawQueryRepository(session)
 
     async def _cache_key(self, key_type: str, identifier: str = "") -> str:
-        """Generate cache key based on type and identifier."""
+        """Generate a corpus-versioned cache key based on type and identifier."""
         prefix = getattr(settings.redis, f"{key_type.upper()}_CACHE_PREFIX")
-        return f"{prefix}{identifier}"
+        return await corpus_key(prefix, identifier)
 
     async def search_by_category(self, category: str) -> List[Dict]:
         """Search for text lines by category (cached)."""
@@ -37,14 +38,13 @@ class CategoryService:
             return cached_data
             
         # Use the category citation query
-        result = await self.session.execute(
-            text(CATEGORY_CITATION_QUERY),
-            {"category": category}
-        )
-        rows = result.mappings().all()
+        rows = await self.raw_queries.fetch_citations("category", {"category": category})
         
         # Use citation service to format results consistently
-        data = await self.citation_service.format_citations(rows)
+        data = await self.citation_service.format_citations(
+            rows,
+            fingerprint=self.citation_service.query_fingerprint("category", {"category": category})
+        )
         
         # Cache category search results
         await self.redis.set(
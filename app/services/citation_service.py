@@ -3,24 +3,44 @@ Service for handling citation formatting and retrieval.
 Provides consistent citation handling across the application.
 """
 
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from collections import OrderedDict
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
+import hashlib
 import logging
+import time
 import uuid
 import json
 
 from app.core.redis import redis_client
 from app.core.config import settings
-from app.models.citations import (
-    Citation, SentenceContext, CitationContext, 
-    CitationLocation, CitationSource
-)
+from app.core.cache_keys import corpus_generation
+from app.models.citations import Citation
 from app.models.text_line import TextLine, TextLineAPI
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Last time each result set's TTL was extended by this worker, so paging
+# through a large set does not re-EXPIRE every page on every read
+_last_touched: "OrderedDict[str, float]" = OrderedDict()
+_MAX_TRACKED_RESULT_SETS = 10000
+
+# Serializes a page of citations straight to JSON bytes
+_CITATION_PAGE = TypeAdapter(List[Citation])
+
+# Location fields in citation order, with their labels in full citations
+_LOCATION_LABELS = {
+    "fragment": "Fragment",
+    "volume": "Volume",
+    "book": "Book",
+    "chapter": "Chapter",
+    "page": "Page",
+    "section": "Section"
+}
+
 class CitationService:
     """Service for managing citations."""
     
@@ -30,35 +50,106 @@ class CitationService:
         self.redis = redis_client
         logger.info("Initialized CitationService")
 
-    async def format_citations(self, rows: List[Dict], bulk_fetch: bool = True) -> Tuple[str, List[Citation]]:
-        """Format citations and store in Redis for pagination."""
+    @staticmethod
+    def query_fingerprint(query_name: str, params: Dict[str, Any]) -> str:
+        """Build a normalized fingerprint of a citation query and its parameters.
+        
+        Queries with the same fingerprint return the same rows for a given
+        corpus version, so their stored result sets can be shared.
+        """
+        normalized = {
+            key: value.strip() if isinstance(value, str) else value
+            for key, value in params.items()
+        }
+        # ILIKE patterns are case-insensitive, so their case does not matter.
+        # Lowercase one character at a time like Postgres: casefold() would
+        # merge ς with σ (and ß with ss), and str.lower() turns a word-final
+        # Σ into ς, while ILIKE keeps those apart.
+        if isinstance(normalized.get("pattern"), str) and "%" in normalized["pattern"]:
+            normalized["pattern"] = "".join(char.lower() for char in normalized["pattern"])
+        return json.dumps({"query": query_name, "params": normalized}, sort_keys=True, ensure_ascii=False)
+
+    async def _results_id(self, fingerprint: str) -> str:
+        """Derive a deterministic results ID from a fingerprint and the corpus version."""
+        generation = await corpus_generation()
+        return hashlib.sha256(f"g{generation}:{fingerprint}".encode('utf-8')).hexdigest()[:32]
+
+    async def get_stored_results(self, fingerprint: str) -> Optional[Tuple[str, List[Citation], Dict]]:
+        """Get the results ID, first page and metadata of an already stored result set."""
+        results_id = await self._results_id(fingerprint)
+        meta = await self.redis.get(f"{settings.redis.SEARCH_RESULTS_PREFIX}{results_id}:meta")
+        if not meta:
+            return None
+        
+        first_page = await self.get_paginated_results(results_id, 1)
+        if not first_page:
+            return None
+        
+        logger.debug(f"Reusing stored result set {results_id}")
+        return results_id, first_page, meta
+
+    async def format_citations(
+        self,
+        rows: List[Dict],
+        bulk_fetch: bool = True,
+        fingerprint: Optional[str] = None
+    ) -> Tuple[str, List[Citation]]:
+        """Format citations and store in Redis for pagination.
+        
+        Args:
+            rows: Citation query result rows
+            bulk_fetch: Unused, kept for backward compatibility
+            fingerprint: Query fingerprint (see query_fingerprint). When given,
+                         the results ID is deterministic and identical queries
+                         share a single stored result set.
+        """
         try:
-            citations = []
-            for row in rows:
-                try:
-                    citation = self._format_citation(row)
-                    citations.append(citation)
-                except Exception as e:
-                    logger.error(f"Error formatting individual citation: {str(e)}", exc_info=True)
-                    # Continue with other citations
-                    continue
+            if fingerprint:
+                stored = await self.get_stored_results(fingerprint)
+                if stored:
+                    results_id, first_page, _ = stored
+                    return results_id, first_page
+            
+            citations = self._format_citations(rows)
             
             if not citations:
                 logger.warning("No citations were formatted successfully")
                 return "", []
             
-            # Generate unique results ID
-            results_id = str(uuid.uuid4())
+            # Derive a shared results ID from the query, or a unique one
+            if fingerprint:
+                results_id = await self._results_id(fingerprint)
+            else:
+                results_id = str(uuid.uuid4())
             
-            # Store citations in chunks of 10 (page size)
+            # Serialize citations in pages of 10, stopping at the per-set byte budget
             page_size = 10
-            total_pages = (len(citations) + page_size - 1) // page_size
+            pages: List[bytes] = []
+            stored_bytes = 0
+            for start in range(0, len(citations), page_size):
+                page_citations = citations[start:start + page_size]
+                
+                serialized = _CITATION_PAGE.dump_json(page_citations)
+                if pages and stored_bytes + len(serialized) > settings.redis.SEARCH_RESULTS_MAX_BYTES:
+                    logger.warning(
+                        f"Result set {results_id} truncated at {len(pages)} pages "
+                        f"({stored_bytes} bytes) of {len(citations)} citations"
+                    )
+                    break
+                pages.append(serialized)
+                stored_bytes += len(serialized)
+            
+            total_pages = len(pages)
+            stored_results = min(len(citations), total_pages * page_size)
             
             # Store metadata
             meta = {
-                "total_results": len(citations),
+                "total_results": stored_results,
                 "total_pages": total_pages,
-                "page_size": page_size
+                "page_size": page_size,
+                "bytes": stored_bytes,
+                "truncated": stored_results < len(citations),
+                "total_matches": len(citations)
             }
             
             meta_key = f"{settings.redis.SEARCH_RESULTS_PREFIX}{results_id}:meta"
@@ -74,41 +165,28 @@ class CitationService:
             
             # Store each page
             all_pages_stored = True
-            for page in range(total_pages):
-                start = page * page_size
-                end = min(start + page_size, len(citations))
-                page_citations = citations[start:end]
-                
-                # Convert Pydantic models to dicts for Redis storage
-                page_data = [c.model_dump() for c in page_citations]
-                
-                page_key = f"{settings.redis.SEARCH_RESULTS_PREFIX}{results_id}:page:{page + 1}"
-                page_success = await self.redis.set(
+            for page, serialized in enumerate(pages, start=1):
+                page_key = f"{settings.redis.SEARCH_RESULTS_PREFIX}{results_id}:page:{page}"
+                page_success = await self.redis.set_bytes(
                     page_key,
-                    page_data,
+                    serialized,
                     ttl=settings.redis.SEARCH_RESULTS_TTL
                 )
                 
                 if not page_success:
-                    logger.error(f"Failed to store page {page + 1} in Redis")
+                    logger.error(f"Failed to store page {page} in Redis")
                     all_pages_stored = False
                     break
-                
-                # Log first citation of each page
-                if page_citations:
-                    logger.debug(
-                        f"Stored page {page + 1} ({len(page_citations)} citations): "
-                        f"first citation ID={page_citations[0].sentence.id}"
-                    )
             
             if not all_pages_stored:
                 # Clean up any stored data
-                await self.redis.delete(meta_key)
-                pattern = f"{settings.redis.SEARCH_RESULTS_PREFIX}{results_id}:page:*"
-                await self.redis.clear_cache(pattern)
+                await self._delete_result_set(results_id, total_pages)
                 return "", []
             
-            logger.info(f"Formatted and stored {len(citations)} citations with ID {results_id} in {total_pages} pages")
+            # Track the set in the global LRU index and evict old sets if over budget
+            await self._register_result_set(results_id, stored_bytes, total_pages)
+            
+            logger.info(f"Formatted and stored {stored_results} citations with ID {results_id} in {total_pages} pages")
             
             # Return results ID and first page of results
             return results_id, citations[:page_size]  # Return first page
@@ -117,6 +195,66 @@ class CitationService:
             logger.error(f"Error formatting citations: {str(e)}", exc_info=True)
             raise
 
+    def _result_set_keys(self, results_id: str, total_pages: int) -> List[str]:
+        """Get the meta and page keys of a stored result set."""
+        prefix = f"{settings.redis.SEARCH_RESULTS_PREFIX}{results_id}"
+        return [f"{prefix}:meta"] + [f"{prefix}:page:{page}" for page in range(1, total_pages + 1)]
+
+    async def _delete_result_set(self, results_id: str, total_pages: int) -> None:
+        """Delete a result set and drop it from the LRU index."""
+        await self.redis.delete(*self._result_set_keys(results_id, total_pages))
+        await self.redis.zrem(settings.redis.SEARCH_RESULTS_LRU_KEY, results_id)
+        await self.redis.hdel(settings.redis.SEARCH_RESULTS_SIZES_KEY, results_id)
+
+    async def _register_result_set(self, results_id: str, size: int, total_pages: int) -> None:
+        """Add a result set to the LRU index and evict the oldest sets over budget."""
+        lru_key = settings.redis.SEARCH_RESULTS_LRU_KEY
+        sizes_key = settings.redis.SEARCH_RESULTS_SIZES_KEY
+        now = time.time()
+        
+        await self.redis.zadd(lru_key, results_id, now)
+        await self.redis.hset(sizes_key, results_id, {"bytes": size, "pages": total_pages})
+        
+        # Forget sets whose sliding TTL ran out on its own
+        expired = await self.redis.zrange_by_score(lru_key, "-inf", now - settings.redis.SEARCH_RESULTS_TTL)
+        if expired:
+            await self.redis.zrem(lru_key, *expired)
+            await self.redis.hdel(sizes_key, *expired)
+        
+        entries = await self.redis.hgetall(sizes_key)
+        total = sum(entry["bytes"] for entry in entries.values())
+        if total <= settings.redis.SEARCH_RESULTS_GLOBAL_MAX_BYTES:
+            return
+        
+        # Least recently used first
+        for old_id in await self.redis.zrange(lru_key):
+            if total <= settings.redis.SEARCH_RESULTS_GLOBAL_MAX_BYTES:
+                break
+            entry = entries.get(old_id)
+            if old_id == results_id or entry is None:
+                continue
+            await self._delete_result_set(old_id, entry["pages"])
+            total -= entry["bytes"]
+            logger.info(f"Evicted result set {old_id} ({entry['bytes']} bytes) from cache")
+
+    async def _touch_result_set(self, results_id: str, total_pages: int) -> None:
+        """Extend a result set's TTL and mark it as recently used."""
+        now = time.monotonic()
+        last = _last_touched.get(results_id)
+        if last is not None and now - last < settings.redis.SEARCH_RESULTS_TOUCH_INTERVAL:
+            return
+        
+        _last_touched[results_id] = now
+        _last_touched.move_to_end(results_id)
+        while len(_last_touched) > _MAX_TRACKED_RESULT_SETS:
+            _last_touched.popitem(last=False)
+        
+        await self.redis.expire(
+            self._result_set_keys(results_id, total_pages),
+            settings.redis.SEARCH_RESULTS_TTL
+        )
+        await self.redis.zadd(settings.redis.SEARCH_RESULTS_LRU_KEY, results_id, time.time())
+
     async def get_paginated_results(self, results_id: str, page: int = 1, page_size: int = 10) -> List[Citation]:
         """Get a page of results from Redis."""
         try:
@@ -149,9 +287,12 @@ class CitationService:
                 logger.warning(f"Missing page {page} for results ID {results_id}")
                 return []
             
+            # Slide the expiry of the whole set while it is being paged through
+            await self._touch_result_set(results_id, total_pages)
+            
             try:
-                # Convert stored dicts back to Pydantic models
-                citations = [Citation.model_validate(c) for c in page_data]
+                # Pages were serialized from our own citations, so skip re-validation
+                citations = [Citation.from_trusted(c) for c in page_data]
                 
                 # Log page details
                 if citations:
@@ -170,84 +311,97 @@ class CitationService:
             logger.error(f"Error getting paginated results: {str(e)}", exc_info=True)
             return []
 
-    def _format_citation(self, row: Dict) -> Citation:
-        """Format a single citation directly from query result."""
+    def _format_citations(self, rows: Iterable[Dict]) -> List[Citation]:
+        """Format query rows into citations, one row at a time, without validation.
+        
+        Rows come from our own SQL, so each citation is built with
+        Citation.from_trusted instead of being validated; this is the only
+        saving. Rows that cannot be formatted are logged and skipped.
+        """
+        citation_dict = self._citation_dict
+        from_trusted = Citation.from_trusted
+        citations = []
+        for row in rows:
+            try:
+                citations.append(from_trusted(citation_dict(row)))
+            except Exception as e:
+                logger.error(f"Error formatting individual citation: {str(e)}", exc_info=True)
+        return citations
+
+    def _format_citation(self, row: Dict, validate: bool = False) -> Citation:
+        """Format a single citation directly from query result.
+        
+        Args:
+            row: Query result row
+            validate: Validate the citation, for rows not produced by our own queries
+        """
         try:
-            # Get line numbers and ensure it's a list
-            line_numbers = row.get('line_numbers', [])
-            if not isinstance(line_numbers, list):
-                line_numbers = [line_numbers] if line_numbers else []
-            
-            # Format line number as range if needed
-            line_value = None
-            if line_numbers:
-                if len(line_numbers) > 1:
-                    line_value = f"{line_numbers[0]}-{line_numbers[-1]}"
-                else:
-                    line_value = str(line_numbers[0])
-            
-            # Create line ID if we have text ID
-            line_id = ""
-            if row.get('text_id') and line_numbers:
-                line_id = f"{row['text_id']}-{line_numbers[0]}"
-            
-            # Handle tokens
-            tokens = row.get("sentence_tokens", [])
-            if isinstance(tokens, dict) and 'tokens' in tokens:
-                tokens = tokens['tokens']
-            elif not isinstance(tokens, list):
-                tokens = []
-            
-            # Create sentence context
-            sentence = SentenceContext(
-                id=str(row.get("sentence_id", "")),
-                text=row.get("sentence_text", ""),
-                prev_sentence=row.get("prev_sentence"),
-                next_sentence=row.get("next_sentence"),
-                tokens=tokens
-            )
-            
-            # Create citation context
-            context = CitationContext(
-                line_id=line_id,
-                line_text=row.get("line_text", row.get("sentence_text", "")),
-                line_numbers=line_numbers
-            )
-            
-            # Create location
-            location = CitationLocation(
-                volume=row.get("volume"),
-                book=row.get("book"),
-                chapter=row.get("chapter"),
-                section=row.get("section"),
-                page=row.get("page"),
-                fragment=row.get("fragment"),
-                line=line_value
-            )
-            
-            # Create source
-            source = CitationSource(
-                author=row.get("author_name", "Unknown"),
-                work=row.get("work_name", "Unknown"),
-                author_id=row.get("author_id_field"),
-                work_id=row.get("work_number_field")
-            )
-            
-            # Create full citation
-            citation = Citation(
-                sentence=sentence,
-                citation=self._format_citation_text(row),
-                context=context,
-                location=location,
-                source=source
-            )
-            
-            return citation
-            
+            data = self._citation_dict(row)
+            return Citation.model_validate(data) if validate else Citation.from_trusted(data)
         except Exception as e:
             logger.error(f"Error formatting citation: {str(e)}", exc_info=True)
             raise
 
+    def _citation_dict(self, row: Dict) -> Dict[str, Any]:
+        """Map a query result row onto the citation structure."""
+        # Get line numbers and ensure it's a list
+        line_numbers = row.get('line_numbers') or []
+        if not isinstance(line_numbers, list):
+            line_numbers = [line_numbers]
+        
+        # Format line number as range if needed
+        line_value = None
+        if line_numbers:
+            if len(line_numbers) > 1:
+                line_value = f"{line_numbers[0]}-{line_numbers[-1]}"
+            else:
+                line_value = str(line_numbers[0])
+        
+        # Create line ID if we have text ID
+        line_id = ""
+        if row.get('text_id') and line_numbers:
+            line_id = f"{row['text_id']}-{line_numbers[0]}"
+        
+        # Handle tokens
+        tokens = row.get("sentence_tokens", [])
+        if isinstance(tokens, dict) and 'tokens' in tokens:
+            tokens = tokens['tokens']
+        elif not isinstance(tokens, list):
+            tokens = []
+        
+        sentence_text = row.get("sentence_text") or ""
+        return {
+            "sentence": {
+                "id": str(row.get("sentence_id", "")),
+                "text": sentence_text,
+                "prev_sentence": row.get("prev_sentence"),
+                "next_sentence": row.get("next_sentence"),
+                "tokens": tokens
+            },
+            "citation": self._format_citation_text(row),
+            "context": {
+                "line_id": line_id,
+                "line_text": row.get("line_text") or sentence_text,
+                "line_numbers": line_numbers
+            },
+            "location": {
+                "epistle": None,
+                "volume": row.get("volume"),
+                "book": row.get("book"),
+                "chapter": row.get("chapter"),
+                "section": row.get("section"),
+                "page": row.get("page"),
+                "fragment": row.get("fragment"),
+                "line": line_value
+            },
+            "source": {
+                "author": row.get("author_name") or "Unknown",
+                "work": row.get("work_name") or "Unknown",
+                "author_id": row.get("author_id_field"),
+                "work_id": row.get("work_number_field")
+            }
+        }
+
     def _format_citation_text(self, row: Dict, abbreviated: bool = False) -> str:
         """Format citation as text string directly from query result."""
         try:
@@ -309,16 +463,7 @@ class CitationService:
 
                 # Add location components
                 components = []
-                field_labels = {
-                    "fragment": "Fragment",
-                    "volume": "Volume",
-                    "book": "Book",
-                    "chapter": "Chapter",
-                    "page": "Page",
-                    "section": "Section"
-                }
-
-                for field, label in field_labels.items():
+                for field, label in _LOCATION_LABELS.items():
                     if row.get(field):
                         components.append(f"{label} {row[field]}")
 
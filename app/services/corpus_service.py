@@ -3,18 +3,21 @@ Service layer for managing corpus-related operations.
 Acts as a facade for specialized text, search, and category services.
 """
 
-from typing import List, Dict, Optional
+from typing import AsyncIterator, List, Dict, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 import logging
 
 from app.core.redis import redis_client
-from app.core.config import settings
+from app.core.cache_keys import bump_corpus_generation, bump_text_version
 from app.services.text_service import TextService
 from app.services.search_service import SearchService
 from app.services.category_service import CategoryService
-from app.models.citations import SearchResponse
-from app.models.text_division import TextResponse
-from app.models.text_line import TextLine
+from app.services.reference_service import ReferenceService
+from app.services.stats_service import CorpusStatsService
+from app.models.citations import SearchResponse, ReferenceResolution
+from app.models.text_division import TextResponse, TableOfContentsResponse
+from app.models.text_line import TextLine, TextLineRangeResponse
+from app.models.corpus_stats import CorpusStatsResponse
 
 logger = logging.getLogger(__name__)
 
@@ -26,32 +29,88 @@ class CorpusService:
         self.text_service = TextService(session)
         self.search_service = SearchService(session)
         self.category_service = CategoryService(session)
+        self.reference_service = ReferenceService(session)
+        self.stats_service = CorpusStatsService(session)
 
     async def list_texts(self) -> List[TextResponse]:
         """List all texts in the corpus with their metadata."""
         return await self.text_service.list_texts()
 
-    async def get_text_by_id(self, text_id: int) -> Optional[TextResponse]:
+    async def get_text_by_id(self, text_id: int, record_access: bool = True) -> Optional[TextResponse]:
         """Get a specific text by its ID."""
-        return await self.text_service.get_text_by_id(text_id)
+        return await self.text_service.get_text_by_id(text_id, record_access=record_access)
+
+    async def get_line_range(
+        self,
+        text_id: int,
+        start_division_id: int,
+        end_division_id: Optional[int] = None,
+        start_line: Optional[int] = None,
+        end_line: Optional[int] = None,
+        include_tokens: bool = False,
+        limit: int = 100
+    ) -> TextLineRangeResponse:
+        """Get a range of lines within a text."""
+        return await self.text_service.get_line_range(
+            text_id,
+            start_division_id,
+            end_division_id=end_division_id,
+            start_line=start_line,
+            end_line=end_line,
+            include_tokens=include_tokens,
+            limit=limit
+        )
+
+    async def get_table_of_contents(self, text_id: int) -> Optional[TableOfContentsResponse]:
+        """Get a text's table of contents."""
+        return await self.text_service.get_table_of_contents(text_id)
+
+    async def resolve_reference(
+        self,
+        reference: str,
+        include_lines: bool = True,
+        include_tokens: bool = False,
+        limit: int = 100
+    ) -> Optional[ReferenceResolution]:
+        """Resolve a citation reference (e.g. "Gal. San. 6.135") to a line range."""
+        return await self.reference_service.resolve(
+            reference,
+            include_lines=include_lines,
+            include_tokens=include_tokens,
+            limit=limit
+        )
+
+    async def get_stats(self, top_lemmas: int = 50) -> CorpusStatsResponse:
+        """Get corpus statistics with the most frequent lemmas."""
+        return await self.stats_service.get_stats(top_lemmas=top_lemmas)
 
     async def get_all_texts(self) -> List[TextResponse]:
         """Get all texts with full content."""
         return await self.text_service.get_all_texts()
 
+    def iter_all_texts(self) -> AsyncIterator[TextResponse]:
+        """Yield all texts with full content one at a time."""
+        return self.text_service.iter_all_texts()
+
+    def stream_all_texts(self, include_tokens: bool = True) -> AsyncIterator[bytes]:
+        """Stream all texts with full content as a JSON array."""
+        return self.text_service.stream_all_texts(include_tokens=include_tokens)
+
     async def search_texts(
         self, 
         query: str, 
         search_lemma: bool = False,
         categories: Optional[List[str]] = None,
-        use_corpus_search: bool = True  # Add the new parameter with default True
+        use_corpus_search: bool = True,  # Add the new parameter with default True
+        record_access: bool = True
     ) -> SearchResponse:
         """Search texts in the corpus."""
         return await self.search_service.search_texts(
             query,
             search_lemma=search_lemma,
             categories=categories,
-            use_corpus_search=use_corpus_search  # Pass through the parameter
+            use_corpus_search=use_corpus_search,  # Pass through the parameter
+            record_access=record_access
         )
 
     async def search_by_category(self, category: str) -> SearchResponse:
@@ -64,39 +123,24 @@ class CorpusService:
 
     async def invalidate_text_cache(self, text_id: Optional[int] = None) -> None:
         """
-        Invalidate text cache with more aggressive clearing.
+        Invalidate corpus-derived caches by bumping their version counters.
+        
+        Cache keys embed the corpus generation (and a per-text version for
+        single-text entries), so invalidation is a single INCR. Stale entries
+        are never read again and expire through their TTL; unrelated data
+        such as lexical values and task state is left untouched.
         
         Args:
             text_id (Optional[int]): Specific text ID to invalidate. 
-                                     If None, clears ALL text-related caches.
+                                     If None, invalidates ALL corpus-derived caches.
         """
         try:
             if text_id:
-                # Invalidate specific text cache
-                cache_keys = [
-                    f"{settings.redis.TEXT_CACHE_PREFIX}{text_id}",
-                    f"{settings.redis.SEARCH_RESULTS_PREFIX}text_{text_id}",
-                ]
-                for key in cache_keys:
-                    await self.redis.delete(key)
-                    logger.info(f"Invalidated specific text cache: {key}")
+                version = await bump_text_version(text_id)
+                logger.info(f"Invalidated text cache for text {text_id} (version: {version})")
             else:
-                # More aggressive cache clearing
-                cache_patterns = [
-                    f"{settings.redis.TEXT_CACHE_PREFIX}*",
-                    f"{settings.redis.SEARCH_CACHE_PREFIX}*",
-                    f"{settings.redis.CATEGORY_CACHE_PREFIX}*",
-                    f"{settings.redis.SEARCH_RESULTS_PREFIX}*"
-                ]
-                
-                for pattern in cache_patterns:
-                    result = await self.redis.clear_cache(pattern)
-                    logger.info(f"Cleared cache pattern: {pattern}, Result: {result}")
-                
-                # Additional step: Flush entire Redis database (use with caution)
-                if self.redis._redis:
-                    await self.redis._redis.flushdb()
-                    logger.warning("Entire Redis database flushed")
+                generation = await bump_corpus_generation()
+                logger.info(f"Invalidated corpus cache (generation: {generation})")
         
         except Exception as e:
             logger.error(f"Error invalidating text cache: {e}", exc_info=True)
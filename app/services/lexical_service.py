@@ -5,7 +5,7 @@ Handles creation, retrieval, and management of lexical entries.
 
 from typing import Dict, Any, Optional, List, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, text
+from sqlalchemy import select
 import logging
 import json
 import time
@@ -19,10 +19,7 @@ from app.services.llm.lexical_service import LexicalLLMService
 from app.services.citation_service import CitationService
 from app.services.json_storage_service import JSONStorageService
 from app.core.redis import redis_client
-from app.core.citation_queries import (
-    LEMMA_CITATION_QUERY,
-    TEXT_CITATION_QUERY
-)
+from app.core.raw_queries import RawQueryRepository
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -35,6 +32,7 @@ class LexicalService:
         self.session = session
         self.lexical_llm = LexicalLLMService(session)
         self.citation_service = CitationService(session)
+        self.raw_queries = RawQueryRepository(session)
         self.json_storage = JSONStorageService()
         self.cache_ttl = 3600  # 1 hour cache TTL
         self.redis = redis_client
@@ -92,36 +90,44 @@ class LexicalService:
             
             if search_lemma:
                 # For lemma search, use the lemma citation query
-                query = LEMMA_CITATION_QUERY
+                query_name = "lemma"
                 params = {"pattern": word}
             else:
                 # For text search, use the standard citation query with ILIKE pattern
-                pattern = f'%{word}%'
-                query = TEXT_CITATION_QUERY
-                params = {"pattern": pattern}
+                query_name = "text"
+                params = {"pattern": f'%{word}%'}
             
-            logger.debug(f"Executing citation query with params: {params}")
+            # Reuse the result set of an identical search if one is stored
+            fingerprint = self.citation_service.query_fingerprint(query_name, params)
+            stored = await self.citation_service.get_stored_results(fingerprint)
             
             try:
-                # Execute query
-                result = await self.session.execute(text(query), params)
-                raw_results = result.mappings().all()
-                
-                # Log raw results for debugging
-                logger.debug(f"Raw query results count: {len(raw_results)}")
-                if raw_results:
-                    logger.debug(f"First result sample: {dict(raw_results[0])}")
-                
-                if not raw_results:
-                    logger.warning(f"No citations found in database for word: {word}")
-                    return "", []
-                
-                # Format and store citations
-                results_id, first_page = await self.citation_service.format_citations(raw_results)
-                
-                if not first_page:
-                    logger.warning(f"No citations were formatted successfully for word: {word}")
-                    return "", []
+                if stored:
+                    results_id = stored[0]
+                    logger.debug(f"Reusing stored citations {results_id} for word: {word}")
+                else:
+                    logger.debug(f"Executing citation query with params: {params}")
+                    
+                    # Execute query
+                    raw_results = await self.raw_queries.fetch_citations(query_name, params)
+                    
+                    # Log raw results for debugging
+                    logger.debug(f"Raw query results count: {len(raw_results)}")
+                    if raw_results:
+                        logger.debug(f"First result sample: {dict(raw_results[0])}")
+                    
+                    if not raw_results:
+                        logger.warning(f"No citations found in database for word: {word}")
+                        return "", []
+                    
+                    # Format and store citations
+                    results_id, first_page = await self.citation_service.format_citations(
+                        raw_results, fingerprint=fingerprint
+                    )
+                    
+                    if not first_page:
+                        logger.warning(f"No citations were formatted successfully for word: {word}")
+                        return "", []
                 
                 # Get metadata to determine total pages
                 meta_key = f"search_results:{results_id}:meta"
@@ -155,9 +161,14 @@ class LexicalService:
         self,
         lemma: str,
         search_lemma: bool = False,
-        task_id: Optional[str] = None
+        task_id: Optional[str] = None,
+        use_cache: bool = True
     ) -> Dict[str, Any]:
-        """Create a new lexical value entry with JSON storage."""
+        """Create a new lexical value entry with JSON storage.
+        
+        The LLM response is reused if the same prompt was answered before
+        (e.g. when saving failed); set use_cache to False to regenerate it.
+        """
         start_time = time.time()
         logger.info(f"Starting creation of lexical entry for lemma: {lemma}")
         
@@ -186,13 +197,25 @@ class LexicalService:
             logger.info(f"Generating lexical value using LLM for {lemma}")
             analysis = await self.lexical_llm.create_lexical_value(
                 word=lemma,
-                citations=citations
+                citations=citations,
+                use_cache=use_cache
             )
             
             # Validate the analysis data
             logger.info(f"Validating analysis data for {lemma}")
             self._validate_lexical_value(analysis)
             
+            # Keep only the citations the prompt was built from; the dropped ones
+            # are recorded in the references with their reasons
+            selection = analysis.pop('citation_selection', None)
+            if selection is not None:
+                selected = {(entry['sentence_id'], entry['citation']) for entry in selection.pop('selected')}
+                citations = [c for c in citations if (c.sentence.id, c.citation) in selected]
+                logger.info(
+                    f"LLM used {len(citations)} citations for {lemma}, "
+                    f"{len(selection['dropped'])} dropped"
+                )
+            
             # Initialize sentence contexts
             sentence_contexts = {}
             for citation in citations:
@@ -210,7 +233,10 @@ class LexicalService:
             
             # Ensure all required fields are present with proper initialization
             analysis.update({
-                'references': {'citations': [c.model_dump() for c in citations]},  # Store formatted citations properly
+                'references': {
+                    'citations': [c.model_dump() for c in citations],  # Store formatted citations properly
+                    'selection': selection or {}  # Budget, tokens used and dropped citations
+                },
                 'sentence_contexts': sentence_contexts,  # Store sentence contexts
                 'citations_used': analysis.get('citations_used', [])  # Keep LLM's citation analysis
             })
@@ -254,8 +280,20 @@ class LexicalService:
             logger.error(f"Missing required fields in lexical value data: {missing_fields}")
             raise ValueError(f"Missing required fields: {', '.join(missing_fields)}")
 
-    async def get_lexical_value(self, lemma: str, version: Optional[str] = None) -> Optional[LexicalValue]:
-        """Get a lexical value by its lemma with linked citations."""
+    async def get_lexical_value(
+        self,
+        lemma: str,
+        version: Optional[str] = None,
+        persistent: bool = False
+    ) -> Optional[LexicalValue]:
+        """Get a lexical value by its lemma with linked citations.
+        
+        Args:
+            lemma: The lemma to look up
+            version: Optional JSON storage version
+            persistent: Load a database entry into the session (for updates)
+                        instead of reading its columns on the raw query path
+        """
         try:
             # Try cache first
             cached = await self._get_cached_value(lemma, version)
@@ -273,6 +311,17 @@ class LexicalService:
                 return None
 
             # Query database for current version
+            if not persistent:
+                row = await self.raw_queries.fetch_lexical_value(lemma)
+                if not row:
+                    return None
+                # Detached entry built from the columns, like the cache path above
+                entry = LexicalValue(**dict(row))
+                entry_dict = entry.to_dict()
+                await self._cache_value(lemma, entry_dict)
+                self.json_storage.save(lemma, entry_dict)
+                return entry
+            
             query = (
                 select(LexicalValue)
                 .where(LexicalValue.lemma == lemma)
@@ -302,7 +351,7 @@ class LexicalService:
     ) -> Dict[str, Any]:
         """Update an existing lexical value."""
         try:
-            entry = await self.get_lexical_value(lemma)
+            entry = await self.get_lexical_value(lemma, persistent=True)
             if not entry:
                 return {
                     "success": False,
@@ -2,11 +2,12 @@
 LLM service for text analysis.
 """
 
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, AsyncGenerator, Union
 import logging
 
 from app.services.llm.base_service import BaseLLMService, LLMServiceError
 from app.services.llm.analysis_prompts import ANALYSIS_TEMPLATE
+from app.services.llm.base import LLMResponse
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -18,9 +19,14 @@ class AnalysisLLMService(BaseLLMService):
         self,
         term: str,
         contexts: List[Dict[str, Any]],
-        max_tokens: Optional[int] = None
-    ) -> str:
-        """Generate an analysis for a term using provided contexts."""
+        max_tokens: Optional[int] = None,
+        stream: bool = False,
+        use_cache: bool = True
+    ) -> Union[LLMResponse, AsyncGenerator[str, None]]:
+        """Generate an analysis for a term using provided contexts.
+        
+        With stream=True, returns an async generator of text deltas.
+        """
         try:
             # Format contexts into a string
             context_str = "\n\n".join(
@@ -35,9 +41,16 @@ class AnalysisLLMService(BaseLLMService):
             )
             
             # Get response from LLM
+            if stream:
+                return self.client.stream_generate(
+                    prompt=prompt,
+                    max_tokens=max_tokens
+                )
+            
             response = await self.client.generate(
                 prompt=prompt,
-                max_tokens=max_tokens
+                max_tokens=max_tokens,
+                use_cache=use_cache
             )
             
             return response
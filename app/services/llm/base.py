@@ -13,6 +13,7 @@ class LLMResponse:
     usage: Dict[str, int]  # tokens used
     model: str
     raw_response: Optional[Dict[str, Any]] = None
+    cached: bool = False  # served from the response cache
 
 class BaseLLMClient(ABC):
     """Abstract base class for LLM clients."""
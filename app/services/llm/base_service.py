@@ -9,6 +9,7 @@ import logging
 from app.core.config import settings
 from app.services.llm.base import BaseLLMClient, LLMResponse
 from app.services.llm.bedrock import BedrockClient, BedrockClientError
+from app.services.llm.cache import CachedLLMClient, response_cache
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -50,7 +51,7 @@ class BaseLLMService:
                 )
             
             logger.info(f"Initializing LLM service with provider: {provider}")
-            self.client = self.PROVIDERS[provider]()
+            self.client = CachedLLMClient(self.PROVIDERS[provider](), response_cache())
             
         except BedrockClientError as e:
             logger.error(f"Bedrock client initialization error: {str(e)}", exc_info=True)
@@ -100,10 +101,14 @@ class BaseLLMService:
                 }
             )
     
-    async def check_context_length(self, prompt: str) -> bool:
-        """Check if a prompt is within the context length limit."""
+    async def check_context_length(self, prompt: str, token_count: Optional[int] = None) -> bool:
+        """Check if a prompt is within the context length limit.
+        
+        Pass token_count if the prompt has already been counted.
+        """
         try:
-            token_count = await self.get_token_count(prompt)
+            if token_count is None:
+                token_count = await self.get_token_count(prompt)
             return token_count <= settings.llm.MAX_CONTEXT_LENGTH
         except Exception as e:
             logger.error(f"Error checking context length: {str(e)}", exc_info=True)
@@ -3,7 +3,6 @@ AWS Bedrock implementation of the LLM client interface.
 """
 
 import json
-import asyncio
 import logging
 from typing import Dict, Any, Optional, AsyncGenerator
 import boto3
@@ -13,6 +12,9 @@ from fastapi import HTTPException
 import os
 from app.core.config import settings
 from .base import BaseLLMClient, LLMResponse
+from .tokens import token_estimator
+from .executor import llm_executor, LLMExecutorBusyError, LLMExecutorTimeoutError
+from .streaming import stream_from_thread
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -53,6 +55,9 @@ class BedrockClient(BaseLLMClient):
 
             self.config = Config(
                 region_name=settings.llm.AWS_REGION,
+                connect_timeout=settings.llm.CONNECT_TIMEOUT,
+                read_timeout=settings.llm.TIMEOUT,
+                max_pool_connections=settings.llm.MAX_CONCURRENCY,
                 retries={
                     'max_attempts': settings.llm.MAX_RETRIES,
                     'mode': 'adaptive'
@@ -105,6 +110,20 @@ class BedrockClient(BaseLLMClient):
                 }
             )
 
+    def _executor_error(self, error: Exception) -> BedrockClientError:
+        """Translate an executor rejection or timeout into a client error."""
+        timed_out = isinstance(error, LLMExecutorTimeoutError)
+        logger.error(f"AWS Bedrock call {'timed out' if timed_out else 'rejected'}: {str(error)}")
+        return BedrockClientError(
+            "AWS Bedrock call timed out" if timed_out else "Too many concurrent AWS Bedrock calls",
+            {
+                "message": str(error),
+                "error_type": "timeout_error" if timed_out else "overloaded_error",
+                "service": "AWS Bedrock",
+                "model_id": self.model_id
+            }
+        )
+
     def _prepare_request(
         self,
         prompt: str,
@@ -180,16 +199,17 @@ class BedrockClient(BaseLLMClient):
                 **kwargs
             )
             
-            # Run in executor to avoid blocking
-            loop = asyncio.get_event_loop()
+            # Run in the LLM executor to avoid blocking
             try:
-                response = await loop.run_in_executor(
-                    None,
+                response = await llm_executor.run(
                     lambda: self.client.invoke_model(
                         modelId=self.model_id,
                         body=json.dumps(request_body)
-                    )
+                    ),
+                    operation="generate"
                 )
+            except (LLMExecutorBusyError, LLMExecutorTimeoutError) as e:
+                raise self._executor_error(e)
             except ClientError as e:
                 error_code = e.response.get('Error', {}).get('Code', 'Unknown')
                 error_message = e.response.get('Error', {}).get('Message', str(e))
@@ -225,6 +245,7 @@ class BedrockClient(BaseLLMClient):
                 )
             
             logger.info(f"Successfully generated response (length: {len(completion)})")
+            token_estimator.calibrate(prompt, response_body.get('usage', {}).get('input_tokens', 0))
             return LLMResponse(
                 text=completion,
                 usage={
@@ -258,50 +279,67 @@ class BedrockClient(BaseLLMClient):
         temperature: Optional[float] = None,
         **kwargs
     ) -> AsyncGenerator[str, None]:
-        """Stream a response from AWS Bedrock."""
+        """Stream a response from AWS Bedrock, yielding text as it is generated.
+        
+        The blocking event stream is read in the LLM executor and bridged
+        to this generator (see app/services/llm/streaming.py). Closing the
+        generator, e.g. when an SSE client disconnects, stops the reader.
+        """
         try:
             logger.info("Starting streaming response from AWS Bedrock")
             
+            # The streaming API takes the same body as invoke_model
             request_body = self._prepare_request(
                 prompt,
                 max_tokens,
                 temperature,
-                stream=True,
+                stream=False,
                 **kwargs
             )
             
-            # Run in executor to avoid blocking
-            loop = asyncio.get_event_loop()
-            try:
-                response = await loop.run_in_executor(
-                    None,
-                    lambda: self.client.invoke_model_with_response_stream(
-                        modelId=self.model_id,
-                        body=json.dumps(request_body)
-                    )
-                )
-            except ClientError as e:
-                error_code = e.response.get('Error', {}).get('Code', 'Unknown')
-                error_message = e.response.get('Error', {}).get('Message', str(e))
-                logger.error(f"AWS stream error: {error_code} - {error_message}", exc_info=True)
-                raise BedrockClientError(
-                    f"AWS Bedrock stream error: {error_code}",
-                    {
-                        "message": error_message,
-                        "error_type": "aws_stream_error",
-                        "error_code": error_code,
-                        "service": "AWS Bedrock",
-                        "model_id": self.model_id
-                    }
+            def read_stream(emit) -> None:
+                response = self.client.invoke_model_with_response_stream(
+                    modelId=self.model_id,
+                    body=json.dumps(request_body)
                 )
+                body = response['body']
+                try:
+                    for event in body:
+                        chunk = event.get('chunk')
+                        if not chunk:
+                            continue
+                        chunk_data = json.loads(chunk['bytes'])
+                        if chunk_data.get('type') == 'message_start':
+                            usage = chunk_data.get('message', {}).get('usage', {})
+                            token_estimator.calibrate(prompt, usage.get('input_tokens', 0))
+                        elif chunk_data.get('type') == 'content_block_delta':
+                            text = chunk_data.get('delta', {}).get('text')
+                            if text and not emit(text):
+                                break
+                finally:
+                    body.close()
             
-            async for chunk in response['body']:
-                chunk_data = json.loads(chunk['chunk']['bytes'])
-                if 'content' in chunk_data:
-                    yield chunk_data['content'][0]['text']
+            async for text in stream_from_thread(read_stream, operation="stream"):
+                yield text
                     
             logger.info("Completed streaming response")
             
+        except (LLMExecutorBusyError, LLMExecutorTimeoutError) as e:
+            raise self._executor_error(e)
+        except ClientError as e:
+            error_code = e.response.get('Error', {}).get('Code', 'Unknown')
+            error_message = e.response.get('Error', {}).get('Message', str(e))
+            logger.error(f"AWS stream error: {error_code} - {error_message}", exc_info=True)
+            raise BedrockClientError(
+                f"AWS Bedrock stream error: {error_code}",
+                {
+                    "message": error_message,
+                    "error_type": "aws_stream_error",
+                    "error_code": error_code,
+                    "service": "AWS Bedrock",
+                    "model_id": self.model_id
+                }
+            )
         except BedrockClientError:
             raise
         except Exception as e:
@@ -318,50 +356,17 @@ class BedrockClient(BaseLLMClient):
             )
 
     async def count_tokens(self, text: str) -> int:
-        """Count the number of tokens in a text using AWS Bedrock."""
+        """Estimate the number of tokens in a text locally.
+        
+        Bedrock has no free token counting call, so the count is estimated
+        (see app/services/llm/tokens.py) and calibrated against the input
+        token counts reported for generations.
+        """
         try:
-            logger.info("Counting tokens")
-            logger.debug(f"Text length: {len(text)}")
-            
-            # For Claude models, we can use a special prompt to get token count
-            request_body = self._prepare_request(
-                prompt=text,
-                max_tokens=0,  # We don't need any completion
-                temperature=0
-            )
-            
-            loop = asyncio.get_event_loop()
-            try:
-                response = await loop.run_in_executor(
-                    None,
-                    lambda: self.client.invoke_model(
-                        modelId=self.model_id,
-                        body=json.dumps(request_body)
-                    )
-                )
-            except ClientError as e:
-                error_code = e.response.get('Error', {}).get('Code', 'Unknown')
-                error_message = e.response.get('Error', {}).get('Message', str(e))
-                logger.error(f"AWS token count error: {error_code} - {error_message}", exc_info=True)
-                raise BedrockClientError(
-                    f"AWS Bedrock token count error: {error_code}",
-                    {
-                        "message": error_message,
-                        "error_type": "aws_token_count_error",
-                        "error_code": error_code,
-                        "service": "AWS Bedrock",
-                        "model_id": self.model_id
-                    }
-                )
-            
-            response_body = json.loads(response['body'].read())
-            token_count = response_body.get('usage', {}).get('input_tokens', 0)
-            
-            logger.info(f"Token count: {token_count}")
+            token_count = token_estimator.estimate(text)
+            logger.debug(f"Estimated token count: {token_count} (text length: {len(text)})")
             return token_count
             
-        except BedrockClientError:
-            raise
         except Exception as e:
             logger.error(f"Error counting tokens: {str(e)}", exc_info=True)
             raise BedrockClientError(
@@ -0,0 +1,256 @@
+"""
+Content-addressed cache for LLM responses.
+
+Generations are keyed by a hash of the model ID, the prompt and the
+sampling parameters, so an identical request (a retry after a failed
+save, a repeated analysis) is answered from the cache instead of calling
+the provider again. Responses are stored in Redis or on disk with a TTL,
+and the least recently used entries are evicted above CACHE_MAX_ENTRIES.
+"""
+
+from abc import ABC, abstractmethod
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, AsyncGenerator, Callable, Dict, Optional
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.redis import redis_client
+from .base import BaseLLMClient, LLMResponse
+
+logger = logging.getLogger(__name__)
+
+llm_cache_requests = metrics.counter(
+    "llm_cache_requests_total", "LLM response cache lookups by result", ("result",)
+)
+
+def response_cache_key(
+    model_id: str,
+    prompt: str,
+    max_tokens: Optional[int] = None,
+    temperature: Optional[float] = None,
+    top_p: Optional[float] = None,
+    **kwargs
+) -> str:
+    """Hash a generation request into a cache key.
+
+    Unset parameters are resolved to their configured defaults first, so
+    requests that differ only in passing a default explicitly share an
+    entry. Other provider parameters (e.g. stop_sequences) are included too.
+    """
+    request = {
+        "model": model_id,
+        "prompt": prompt,
+        "max_tokens": max_tokens or settings.llm.MAX_TOKENS,
+        "temperature": temperature or settings.llm.TEMPERATURE,
+        "top_p": top_p if top_p is not None else settings.llm.TOP_P,
+        **kwargs
+    }
+    payload = json.dumps(request, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class ResponseCache(ABC):
+    """Storage backend for cached LLM responses."""
+
+    def __init__(self, ttl: Optional[int] = None, max_entries: Optional[int] = None):
+        self.ttl = ttl or settings.llm.CACHE_TTL
+        self.max_entries = max_entries or settings.llm.CACHE_MAX_ENTRIES
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[LLMResponse]:
+        """Get a cached response, or None if absent or expired."""
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, response: LLMResponse) -> None:
+        """Store a response and evict entries over the size limit."""
+        pass
+
+    @staticmethod
+    def _dump(response: LLMResponse) -> Dict[str, Any]:
+        data = asdict(response)
+        data.pop("cached", None)
+        return data
+
+    @staticmethod
+    def _load(data: Dict[str, Any]) -> LLMResponse:
+        return LLMResponse(**data, cached=True)
+
+class RedisResponseCache(ResponseCache):
+    """Responses in Redis, with a sorted set of access times for LRU eviction."""
+
+    def __init__(self, ttl: Optional[int] = None, max_entries: Optional[int] = None):
+        super().__init__(ttl, max_entries)
+        self.redis = redis_client
+
+    def _key(self, key: str) -> str:
+        return f"{settings.llm.CACHE_PREFIX}{key}"
+
+    async def get(self, key: str) -> Optional[LLMResponse]:
+        data = await self.redis.get(self._key(key))
+        if data is None:
+            return None
+        await self.redis.zadd(settings.llm.CACHE_LRU_KEY, key, time.time())
+        return self._load(data)
+
+    async def set(self, key: str, response: LLMResponse) -> None:
+        lru_key = settings.llm.CACHE_LRU_KEY
+        now = time.time()
+        await self.redis.set(self._key(key), self._dump(response), ttl=self.ttl)
+        await self.redis.zadd(lru_key, key, now)
+
+        # Forget entries that expired on their own, then evict the least recently used
+        expired = await self.redis.zrange_by_score(lru_key, "-inf", now - self.ttl)
+        evicted = await self.redis.zrange(lru_key, 0, -(self.max_entries + 1))
+        stale = set(expired) | set(evicted)
+        if stale:
+            await self.redis.delete(*(self._key(old) for old in stale))
+            await self.redis.zrem(lru_key, *stale)
+            logger.debug(f"Evicted {len(stale)} LLM responses from cache")
+
+class DiskResponseCache(ResponseCache):
+    """Responses as JSON files, with file modification times for LRU eviction.
+
+    File I/O runs in a worker thread. The number of entries is counted once
+    and then tracked per instance, so the directory is only listed when the
+    count exceeds max_entries and entries have to be evicted.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[Path] = None,
+        ttl: Optional[int] = None,
+        max_entries: Optional[int] = None
+    ):
+        super().__init__(ttl, max_entries)
+        self.directory = directory or Path(settings.llm.CACHE_DIR)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._entries: Optional[int] = None
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def _read(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_bytes())
+        except (OSError, ValueError):
+            return None
+        if entry["expires_at"] < time.time():
+            path.unlink(missing_ok=True)
+            return None
+        os.utime(path)  # mark as recently used
+        return entry
+
+    def _write(self, key: str, entry: Dict[str, Any]) -> None:
+        path = self._path(key)
+        if self._entries is None:
+            self._entries = sum(1 for _ in self.directory.glob("*.json"))
+        if not path.exists():
+            self._entries += 1
+        tmp = path.with_name(f".{path.name}.tmp")
+        tmp.write_text(json.dumps(entry, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, path)
+
+        if self._entries > self.max_entries:
+            entries = sorted(self.directory.glob("*.json"), key=lambda p: p.stat().st_mtime)
+            for old in entries[:max(0, len(entries) - self.max_entries)]:
+                old.unlink(missing_ok=True)
+            self._entries = min(len(entries), self.max_entries)
+
+    async def get(self, key: str) -> Optional[LLMResponse]:
+        entry = await asyncio.to_thread(self._read, key)
+        return self._load(entry["response"]) if entry else None
+
+    async def set(self, key: str, response: LLMResponse) -> None:
+        entry = {"expires_at": time.time() + self.ttl, "response": self._dump(response)}
+        await asyncio.to_thread(self._write, key, entry)
+
+BACKENDS = {
+    "redis": RedisResponseCache,
+    "disk": DiskResponseCache,
+}
+
+def response_cache() -> Optional[ResponseCache]:
+    """Get the configured response cache backend, or None if caching is disabled."""
+    backend = BACKENDS.get(settings.llm.CACHE_BACKEND)
+    return backend() if backend else None
+
+class CachedLLMClient(BaseLLMClient):
+    """Wraps an LLM client and answers repeated generate calls from a cache.
+
+    Streaming and token counting go straight to the wrapped client.
+    """
+
+    def __init__(self, client: BaseLLMClient, cache: Optional[ResponseCache]):
+        self.client = client
+        self.cache = cache
+
+    @property
+    def model_id(self) -> str:
+        return getattr(self.client, "model_id", type(self.client).__name__)
+
+    async def generate(
+        self,
+        prompt: str,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        stream: bool = False,
+        use_cache: bool = True,
+        cache_if: Optional[Callable[[LLMResponse], bool]] = None,
+        **kwargs
+    ) -> LLMResponse:
+        """Generate a response, or return the cached response to an identical request.
+
+        Args:
+            use_cache: Set to False to always call the model; the new
+                response still replaces the cached one
+            cache_if: Predicate a response must pass to be cached or served
+                from the cache (e.g. "parses as the expected JSON"), so that
+                a malformed response is not replayed on every retry
+        """
+        if self.cache is None:
+            return await self.client.generate(prompt, max_tokens, temperature, stream=stream, **kwargs)
+
+        key = response_cache_key(self.model_id, prompt, max_tokens, temperature, **kwargs)
+        if use_cache:
+            cached = await self.cache.get(key)
+            if cached and cache_if and not cache_if(cached):
+                logger.warning(f"Ignoring cached LLM response that fails validation ({key[:12]})")
+                cached = None
+            llm_cache_requests.inc(result="hit" if cached else "miss")
+            if cached:
+                logger.info(f"Serving LLM response from cache ({key[:12]})")
+                return cached
+        else:
+            llm_cache_requests.inc(result="bypass")
+
+        response = await self.client.generate(prompt, max_tokens, temperature, stream=stream, **kwargs)
+        if cache_if and not cache_if(response):
+            llm_cache_requests.inc(result="rejected")
+            return response
+        try:
+            await self.cache.set(key, response)
+        except Exception as e:
+            logger.warning(f"Could not cache LLM response: {e}")
+        return response
+
+    def stream_generate(
+        self,
+        prompt: str,
+        max_tokens: Optional[int] = None,
+        temperature: Optional[float] = None,
+        **kwargs
+    ) -> AsyncGenerator[str, None]:
+        """Stream a response from the wrapped client (not cached)."""
+        return self.client.stream_generate(prompt, max_tokens, temperature, **kwargs)
+
+    async def count_tokens(self, text: str) -> int:
+        """Count tokens with the wrapped client."""
+        return await self.client.count_tokens(text)
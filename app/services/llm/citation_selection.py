@@ -0,0 +1,258 @@
+"""
+Fit lexical citations to a prompt token budget.
+
+Frequent lemmas have thousands of citations, far more than fit in one
+prompt. Citations are ranked by informativeness (distinct categories
+among the words around the lemma, then content words), and near-identical
+sentences are dropped in favour of their best-ranked copy. Long sentences
+are cut to a window around the lemma. The remaining citations are grouped
+by author and work and taken round-robin, best first, so every source is
+represented before any source gets a second citation, until the budget is
+spent. Every dropped citation is reported with its reason, so it stays
+visible which evidence the analysis was based on.
+"""
+
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+import logging
+import re
+import unicodedata
+
+from app.core.config import settings
+from app.models.citations import Citation
+from .tokens import TokenEstimator, token_estimator
+
+logger = logging.getLogger(__name__)
+
+# Sentences sharing at least this fraction of their words are near-identical
+NEAR_DUPLICATE_SIMILARITY = 0.8
+
+# Words at the start and end of a sentence used to find near-duplicate candidates
+_ANCHOR_WORDS = 3
+
+# Parts of speech counted as content words when ranking
+_CONTENT_POS = {"NOUN", "PROPN", "VERB", "ADJ", "ADV"}
+
+_NON_WORD = re.compile(r"[^\w\s]+")
+_SPACES = re.compile(r"\s+")
+
+def normalize_sentence(text: str) -> str:
+    """Normalize a sentence for duplicate detection (no accents, punctuation or case)."""
+    decomposed = unicodedata.normalize("NFD", text)
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return _SPACES.sub(" ", _NON_WORD.sub(" ", stripped.casefold())).strip()
+
+@dataclass
+class CitationSelection:
+    """Citations chosen for a prompt and the ones left out."""
+
+    budget: int
+    selected: List[Citation] = field(default_factory=list)
+    lines: List[str] = field(default_factory=list)
+    costs: List[int] = field(default_factory=list)
+    dropped: List[Dict[str, Any]] = field(default_factory=list)
+    truncated: int = 0
+    tokens: int = 0
+
+    @property
+    def text(self) -> str:
+        """Citation lines for the prompt."""
+        return "\n".join(self.lines)
+
+    def report(self) -> Dict[str, Any]:
+        """Summarize the selection for logs and stored references."""
+        return {
+            "budget_tokens": self.budget,
+            "tokens": self.tokens,
+            "truncated": self.truncated,
+            "selected": [
+                {"sentence_id": c.sentence.id, "citation": c.citation} for c in self.selected
+            ],
+            "dropped": self.dropped
+        }
+
+    def chunks(self, max_tokens: int) -> List["CitationSelection"]:
+        """Split the selected citations into chunks of at most max_tokens.
+
+        Citations of one author and work stay together where they fit;
+        small works share a chunk and large works are split.
+        """
+        by_source: Dict[Tuple[str, str], List[int]] = {}
+        for index, citation in enumerate(self.selected):
+            by_source.setdefault((citation.source.author, citation.source.work), []).append(index)
+
+        chunks: List[CitationSelection] = []
+        current = CitationSelection(budget=max_tokens)
+        for indexes in by_source.values():
+            work_tokens = sum(self.costs[i] for i in indexes)
+            # Start a new chunk rather than split a work that would fit in one
+            if current.selected and current.tokens + work_tokens > max_tokens and work_tokens <= max_tokens:
+                chunks.append(current)
+                current = CitationSelection(budget=max_tokens)
+            for i in indexes:
+                if current.selected and current.tokens + self.costs[i] > max_tokens:
+                    chunks.append(current)
+                    current = CitationSelection(budget=max_tokens)
+                current.selected.append(self.selected[i])
+                current.lines.append(self.lines[i])
+                current.costs.append(self.costs[i])
+                current.tokens += self.costs[i]
+        if current.selected:
+            chunks.append(current)
+        return chunks
+
+class CitationSelector:
+    """Selects citations for a lemma within a token budget."""
+
+    def __init__(
+        self,
+        max_chars: Optional[int] = None,
+        estimator: Optional[TokenEstimator] = None
+    ):
+        self.max_chars = max_chars or settings.llm.CITATION_MAX_CHARS
+        self.estimator = estimator or token_estimator
+
+    @staticmethod
+    def _lemma_tokens(word: str, citation: Citation) -> List[Dict]:
+        return [
+            token for token in citation.sentence.tokens or []
+            if token.get("lemma") == word or token.get("text") == word
+        ]
+
+    def _score(self, word: str, citation: Citation) -> Tuple[int, int]:
+        """Rank key: distinct co-occurring categories, then content words."""
+        categories: Set[str] = set()
+        content = 0
+        for token in citation.sentence.tokens or []:
+            if token.get("lemma") == word:
+                continue
+            categories.update(
+                label.strip() for label in (token.get("category") or "").split(",") if label.strip()
+            )
+            if token.get("pos") in _CONTENT_POS:
+                content += 1
+        return len(categories), content
+
+    def _truncate(self, word: str, citation: Citation) -> Tuple[str, bool]:
+        """Cut a long sentence to a window of max_chars around the lemma."""
+        text = citation.sentence.text
+        if len(text) <= self.max_chars:
+            return text, False
+
+        center = -1
+        for token in self._lemma_tokens(word, citation):
+            center = text.find(token.get("text") or word)
+            if center >= 0:
+                break
+        if center < 0:
+            center = max(text.find(word), 0)
+
+        start = max(0, min(center - self.max_chars // 2, len(text) - self.max_chars))
+        end = start + self.max_chars
+        # Move the cuts back to word boundaries
+        if start > 0:
+            space = text.find(" ", start)
+            start = space + 1 if 0 <= space < center else start
+        if end < len(text):
+            space = text.rfind(" ", start, end)
+            end = space if space > center else end
+        window = text[start:end].strip()
+        return f"{'… ' if start > 0 else ''}{window}{' …' if end < len(text) else ''}", True
+
+    def _find_duplicate(
+        self,
+        normalized: str,
+        exact: Dict[str, Citation],
+        anchors: Dict[str, List[Tuple[Set[str], Citation]]]
+    ) -> Tuple[Optional[Citation], List[str], Set[str]]:
+        """Find a kept citation with the same or nearly the same sentence."""
+        words = normalized.split()
+        keys = [" ".join(words[:_ANCHOR_WORDS]), " ".join(words[-_ANCHOR_WORDS:])]
+        word_set = set(words)
+        if normalized in exact:
+            return exact[normalized], keys, word_set
+        for key in keys:
+            for other_words, other in anchors.get(key, ()):
+                union = len(word_set | other_words)
+                if union and len(word_set & other_words) / union >= NEAR_DUPLICATE_SIMILARITY:
+                    return other, keys, word_set
+        return None, keys, word_set
+
+    def select(self, word: str, citations: List[Citation], budget: int) -> CitationSelection:
+        """Select citations for a lemma within a token budget.
+
+        Args:
+            word: Lemma being analyzed
+            citations: All citations found for it
+            budget: Tokens available for the citation lines
+
+        Returns:
+            The selection, with selected citations in their original order
+        """
+        selection = CitationSelection(budget=budget)
+        order = {id(citation): index for index, citation in enumerate(citations)}
+        ranked = sorted(citations, key=lambda c: self._score(word, c), reverse=True)
+
+        # Keep the best-ranked copy of each (near-)identical sentence
+        seen_ids: Dict[str, Citation] = {}
+        exact: Dict[str, Citation] = {}
+        anchors: Dict[str, List[Tuple[Set[str], Citation]]] = defaultdict(list)
+        groups: Dict[Tuple[str, str], Deque[Citation]] = {}
+        for citation in ranked:
+            original = seen_ids.get(citation.sentence.id)
+            normalized = normalize_sentence(citation.sentence.text)
+            if original is None:
+                original, keys, word_set = self._find_duplicate(normalized, exact, anchors)
+            if original is not None:
+                selection.dropped.append({
+                    "sentence_id": citation.sentence.id,
+                    "citation": citation.citation,
+                    "reason": "duplicate",
+                    "duplicate_of": original.citation
+                })
+                continue
+
+            seen_ids[citation.sentence.id] = citation
+            exact[normalized] = citation
+            for key in keys:
+                anchors[key].append((word_set, citation))
+            source = (citation.source.author, citation.source.work)
+            groups.setdefault(source, deque()).append(citation)
+
+        # One citation per author and work per round; groups keep their best-first order
+        chosen: List[Tuple[Citation, str, int]] = []
+        remaining = budget
+        queues = list(groups.values())
+        while queues:
+            for queue in queues:
+                citation = queue.popleft()
+                text, truncated = self._truncate(word, citation)
+                line = f"{citation.citation}: {text}"
+                cost = self.estimator.estimate(line) + 1  # newline
+                if cost > remaining:
+                    selection.dropped.append({
+                        "sentence_id": citation.sentence.id,
+                        "citation": citation.citation,
+                        "reason": "budget"
+                    })
+                    continue
+                remaining -= cost
+                selection.truncated += truncated
+                chosen.append((citation, line, cost))
+            queues = [queue for queue in queues if queue]
+
+        chosen.sort(key=lambda item: order[id(item[0])])
+        selection.selected = [citation for citation, _, _ in chosen]
+        selection.lines = [line for _, line, _ in chosen]
+        selection.costs = [cost for _, _, cost in chosen]
+        selection.tokens = budget - remaining
+        logger.info(
+            f"Selected {len(selection.selected)} of {len(citations)} citations for {word} "
+            f"({selection.tokens}/{budget} tokens, {selection.truncated} truncated, "
+            f"{len(selection.dropped)} dropped)"
+        )
+        return selection
+
+# Shared selector using the configured limits
+citation_selector = CitationSelector()
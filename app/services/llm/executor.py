@@ -0,0 +1,146 @@
+"""
+Dedicated executor for blocking LLM provider calls.
+
+Provider SDK calls (boto3) block, so they run in threads. They get their
+own bounded thread pool instead of the event loop's default executor, so
+long generations cannot starve other work that offloads to threads. At
+most LLM_MAX_CONCURRENCY calls run at once, at most LLM_MAX_QUEUE wait for
+a slot (further calls are rejected immediately), and each call has a
+timeout. A call that times out keeps its slot until its thread finishes,
+so the cap always reflects the threads actually in use.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+import asyncio
+import logging
+import time
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+llm_calls_running = metrics.gauge(
+    "llm_calls_running", "LLM provider calls currently running"
+)
+llm_calls_queued = metrics.gauge(
+    "llm_calls_queued", "LLM provider calls waiting for a free slot"
+)
+llm_calls = metrics.counter(
+    "llm_calls_total", "LLM provider calls by operation and outcome", ("operation", "outcome")
+)
+llm_call_seconds = metrics.histogram(
+    "llm_call_seconds", "LLM provider call duration", ("operation",),
+    (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+)
+llm_queue_seconds = metrics.histogram(
+    "llm_queue_wait_seconds", "Time LLM provider calls waited for a free slot", ("operation",)
+)
+
+class LLMExecutorBusyError(Exception):
+    """Raised when too many LLM calls are already waiting."""
+    pass
+
+class LLMExecutorTimeoutError(TimeoutError):
+    """Raised when an LLM call does not finish within its timeout."""
+    pass
+
+class LLMExecutor:
+    """Runs blocking LLM calls in a bounded pool with a wait queue and timeouts."""
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        timeout: Optional[float] = None
+    ):
+        self.max_concurrency = max_concurrency or settings.llm.MAX_CONCURRENCY
+        self.max_queue = max_queue if max_queue is not None else settings.llm.MAX_QUEUE
+        self.timeout = timeout or settings.llm.TIMEOUT
+        self._pool = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="llm")
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.running = 0
+        self.queued = 0
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        # Created on first use so that it belongs to the running event loop
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        return self._slots
+
+    def _release(self, operation: str, started: float) -> None:
+        self.running -= 1
+        llm_calls_running.set(self.running)
+        llm_call_seconds.observe(time.perf_counter() - started, operation=operation)
+        self._semaphore().release()
+
+    async def run(
+        self,
+        func: Callable[..., Any],
+        *args: Any,
+        operation: str = "call",
+        timeout: Optional[float] = None
+    ) -> Any:
+        """Run a blocking function in the LLM pool.
+
+        Args:
+            func: Blocking function to call
+            *args: Arguments for func
+            operation: Label for metrics (e.g. "generate")
+            timeout: Seconds to wait for the result (defaults to LLM_TIMEOUT)
+
+        Raises:
+            LLMExecutorBusyError: If the wait queue is full
+            LLMExecutorTimeoutError: If the call does not finish in time
+        """
+        slots = self._semaphore()
+        if slots.locked() and self.queued >= self.max_queue:
+            llm_calls.inc(operation=operation, outcome="rejected")
+            raise LLMExecutorBusyError(
+                f"{self.running} LLM calls running and {self.queued} waiting"
+            )
+
+        self.queued += 1
+        llm_calls_queued.set(self.queued)
+        queued_at = time.perf_counter()
+        try:
+            await slots.acquire()
+        finally:
+            self.queued -= 1
+            llm_calls_queued.set(self.queued)
+
+        started = time.perf_counter()
+        llm_queue_seconds.observe(started - queued_at, operation=operation)
+        self.running += 1
+        llm_calls_running.set(self.running)
+        try:
+            future = asyncio.get_running_loop().run_in_executor(self._pool, func, *args)
+        except BaseException:
+            self._release(operation, started)
+            raise
+        # Free the slot when the thread finishes, even if the caller stopped waiting
+        def finished(done: asyncio.Future) -> None:
+            if not done.cancelled():
+                done.exception()  # retrieved here in case nobody awaits it any more
+            self._release(operation, started)
+        future.add_done_callback(finished)
+
+        try:
+            result = await asyncio.wait_for(asyncio.shield(future), timeout or self.timeout)
+        except asyncio.TimeoutError:
+            llm_calls.inc(operation=operation, outcome="timeout")
+            logger.warning(f"LLM {operation} call timed out after {timeout or self.timeout}s")
+            raise LLMExecutorTimeoutError(f"LLM {operation} call timed out")
+        except Exception:
+            llm_calls.inc(operation=operation, outcome="error")
+            raise
+        llm_calls.inc(operation=operation, outcome="ok")
+        return result
+
+    def shutdown(self) -> None:
+        """Stop accepting calls; running calls finish in their threads."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+# Shared by all LLM clients of this worker
+llm_executor = LLMExecutor()
@@ -68,3 +68,70 @@ Content Guidelines:
     
 Remember: All text must be properly escaped JSON. No raw line breaks or quotes.
 """
+
+# Map-reduce for lemmas with more citations than fit one prompt: each chunk of
+# citations is analyzed on its own (map), then the partial analyses are merged
+LEXICAL_MAP_TEMPLATE = """
+You are an AI assistant specializing in ancient Greek lexicography and philology. You are analyzing one part of the citations of a word; analyses of the other parts will be merged with yours later.
+
+Word to analyze (lemma):
+{word}
+
+Citations (part {part} of {parts}):
+{citations}
+
+Task: Based only on these citations, write notes for a lexical entry:
+1. The meanings and senses the word has in these citations, particularly in a medical or anatomical context.
+2. Typical usage: constructions, collocations, topography, qualities, instructions.
+3. Any variations or contradictions between authors or works.
+
+Support every observation with the citations it is based on.
+
+Your response must be a valid JSON object, using proper JSON string escaping:
+{{
+    "notes": "Your notes here with \\n for line breaks",
+    "related_terms": ["term1", "term2"],
+    "citations_used": ["Full citation 1", "Full citation 2"]
+}}
+For citations_used, use the full citation format as provided in the input.
+"""
+
+LEXICAL_REDUCE_TEMPLATE = """
+You are an AI assistant specializing in ancient Greek lexicography and philology. You will build a lexical value based on validated texts analysis on a PhD level. The citations of the word below were analyzed in {parts} parts; merge the partial analyses into one lexical value.
+
+Word to analyze (lemma):
+{word}
+
+Partial analyses:
+{analyses}
+
+Task: Based on these analyses, provide:
+1. A concise translation of the word.
+2. A short description of its meaning and usage, particularly in a medical context. This is a summary of the long description.
+3. A longer, detailed description and full analysis, up to 2000 words. Reconcile the partial analyses and note variations in usage across authors and works.
+4. A list of related terms or concepts.
+5. A list of citations you used in the short or long descriptions, taken from the partial analyses
+
+Formatting Instructions:
+1. Your response must be a valid JSON object.
+2. For all text fields (translation, short_description, long_description):
+   - Replace any newlines with \\n
+   - Replace any quotes with \\"
+   - Remove any control characters
+   - Use proper JSON string escaping
+3. For arrays (related_terms, citations_used):
+   - Each element should be a simple string
+   - No special characters or line breaks in array elements
+   - For citations_used, use the full citation format as given in the partial analyses
+4. Ensure the entire response is one continuous JSON object
+
+Required JSON Format:
+{{
+    "lemma": "{word}",
+    "translation": "Your single-line translation here",
+    "short_description": "Your single-paragraph description here",
+    "long_description": "Your longer description here with \\n for line breaks",
+    "related_terms": ["term1", "term2", "term3"],
+    "citations_used": ["Full citation 1", "Full citation 2"]
+}}
+"""
@@ -2,13 +2,22 @@
 LLM service for lexical value generation.
 """
 
-from typing import Dict, Any, Optional, AsyncGenerator, Union, List
+from typing import Dict, Any, Optional, AsyncGenerator, Union, List, Literal, Tuple
+import asyncio
 import json
 import logging
 import re
+import time
 
+from app.core.config import settings
+from app.models.citations import Citation
+from app.services.llm.base import LLMResponse
 from app.services.llm.base_service import BaseLLMService, LLMServiceError
-from app.services.llm.lexical_prompts import LEXICAL_VALUE_TEMPLATE
+from app.services.llm.citation_selection import CitationSelection, citation_selector
+from app.services.llm.lexical_prompts import (
+    LEXICAL_MAP_TEMPLATE, LEXICAL_REDUCE_TEMPLATE, LEXICAL_VALUE_TEMPLATE
+)
+from app.services.llm.tokens import token_estimator
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -33,32 +42,232 @@ class LexicalLLMService(BaseLLMService):
         
         return text
 
+    def select_citations(
+        self,
+        word: str,
+        citations: List[Citation],
+        max_tokens: Optional[int] = None
+    ) -> CitationSelection:
+        """Fit the citations for a word to the prompt token budget.
+
+        The budget is LLM_CITATION_BUDGET, capped by the context length left
+        after the prompt template and the response.
+        """
+        overhead = token_estimator.estimate(LEXICAL_VALUE_TEMPLATE.format(word=word, citations=""))
+        available = settings.llm.MAX_CONTEXT_LENGTH - overhead - (max_tokens or settings.llm.MAX_TOKENS)
+        budget = max(0, min(settings.llm.CITATION_BUDGET, available))
+        return citation_selector.select(word, citations, budget)
+
+    def _parse_lexical_value(self, text: str, word: str) -> Dict[str, Any]:
+        """Parse and validate a lexical value JSON response."""
+        try:
+            # First try parsing the raw response
+            try:
+                result = json.loads(text)
+            except json.JSONDecodeError:
+                # If raw parsing fails, try sanitization
+                sanitized_text = self._sanitize_json_string(text)
+                logger.debug(f"Sanitized JSON:\n{sanitized_text}")
+
+                try:
+                    result = json.loads(sanitized_text)
+                except json.JSONDecodeError as e:
+                    # If still failing, try more aggressive cleanup
+                    logger.warning(f"Sanitized JSON parse failed: {str(e)}, attempting more aggressive cleanup")
+                    # Convert the entire response to a valid JSON structure
+                    cleaned = re.sub(r'[^\x20-\x7E]', '', sanitized_text)  # Remove non-printable chars
+                    cleaned = re.sub(r'([{,]\s*)([a-zA-Z_][a-zA-Z0-9_]*)\s*:', r'\1"\2":', cleaned)  # Quote all keys
+                    cleaned = re.sub(r':\s*([^"{[\s][^,}\]]*[^"\s,}\]])', r': "\1"', cleaned)  # Quote unquoted values
+                    cleaned = re.sub(r',(\s*[}\]])', r'\1', cleaned)  # Remove trailing commas
+                    result = json.loads(cleaned)
+
+            logger.debug(f"Parsed JSON result:\n{json.dumps(result, indent=2)}")
+
+            # Validate required fields
+            required_fields = ['lemma', 'translation', 'short_description', 
+                            'long_description', 'related_terms', 'citations_used']
+            missing_fields = [field for field in required_fields if field not in result]
+
+            if missing_fields:
+                logger.error(f"Missing required fields in LLM response: {missing_fields}")
+                raise LLMServiceError(
+                    "Invalid LLM response format",
+                    {
+                        "message": "Missing required fields in LLM response",
+                        "error_type": "validation_error",
+                        "missing_fields": missing_fields,
+                        "received_fields": list(result.keys()),
+                        "word": word
+                    }
+                )
+
+            # Ensure all text fields are properly escaped strings
+            for field in ['translation', 'short_description', 'long_description']:
+                if not isinstance(result[field], str):
+                    result[field] = str(result[field])
+                # Preserve Unicode characters while escaping necessary characters
+                result[field] = result[field].replace('\\', '\\\\').replace('"', '\\"')
+
+            # Ensure arrays contain only strings
+            for field in ['related_terms', 'citations_used']:
+                if not isinstance(result[field], list):
+                    result[field] = [str(result[field])]
+                result[field] = [str(item) for item in result[field]]
+
+            return result
+
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse JSON from LLM response: {str(e)}")
+            logger.error(f"Invalid JSON response:\n{text}")
+            raise LLMServiceError(
+                "Invalid JSON response from LLM",
+                {
+                    "message": "Failed to parse JSON response",
+                    "error_type": "json_parse_error",
+                    "parse_error": str(e),
+                    "response_text": text[:1000],  # First 1000 chars
+                    "response_length": len(text),
+                    "word": word
+                }
+            )
+
+    def _is_lexical_value(self, response: LLMResponse, word: str) -> bool:
+        """Check that a response parses as a complete lexical value."""
+        try:
+            self._parse_lexical_value(response.text, word)
+            return True
+        except Exception:
+            return False
+
+    async def _map_citations(
+        self,
+        word: str,
+        citations: List[Citation],
+        use_cache: bool = True
+    ) -> Tuple[CitationSelection, str, int]:
+        """Analyze chunks of citations concurrently and build the reduce prompt.
+
+        Citations are selected within LLM_MAP_MAX_CHUNKS chunks of
+        LLM_MAP_CHUNK_TOKENS and split by work; at most LLM_MAP_CONCURRENCY
+        chunks are analyzed at a time. Citations of chunks whose analysis
+        failed are reported as dropped.
+
+        Returns:
+            Tuple of (selection, reduce prompt, number of chunks)
+        """
+        chunk_tokens = settings.llm.MAP_CHUNK_TOKENS
+        selection = citation_selector.select(word, citations, chunk_tokens * settings.llm.MAP_MAX_CHUNKS)
+        chunks = selection.chunks(chunk_tokens)
+        limit = asyncio.Semaphore(settings.llm.MAP_CONCURRENCY)
+
+        async def analyze(part: int, chunk: CitationSelection) -> str:
+            prompt = LEXICAL_MAP_TEMPLATE.format(
+                word=word,
+                part=part,
+                parts=len(chunks),
+                citations=chunk.text
+            )
+            async with limit:
+                response = await self.client.generate(
+                    prompt=prompt,
+                    max_tokens=settings.llm.MAP_MAX_TOKENS,
+                    use_cache=use_cache
+                )
+            return response.text.strip()
+
+        started = time.perf_counter()
+        partials = await asyncio.gather(
+            *(analyze(part, chunk) for part, chunk in enumerate(chunks, 1)),
+            return_exceptions=True
+        )
+        logger.info(
+            f"Analyzed {len(chunks)} citation chunks for {word} in {time.perf_counter() - started:.1f}s"
+        )
+
+        analyses, failed = [], set()
+        for part, (chunk, partial) in enumerate(zip(chunks, partials), 1):
+            if isinstance(partial, BaseException):
+                logger.warning(f"Analysis of chunk {part}/{len(chunks)} for {word} failed: {partial}")
+                failed.update(id(citation) for citation in chunk.selected)
+                selection.dropped.extend(
+                    {
+                        "sentence_id": citation.sentence.id,
+                        "citation": citation.citation,
+                        "reason": "map_failed"
+                    }
+                    for citation in chunk.selected
+                )
+                selection.tokens -= chunk.tokens
+                continue
+            sources = "; ".join(dict.fromkeys(
+                f"{citation.source.author}, {citation.source.work}" for citation in chunk.selected
+            ))
+            analyses.append(f"Part {part} ({sources}):\n{partial}")
+
+        if not analyses:
+            raise LLMServiceError(
+                "All citation chunk analyses failed",
+                {
+                    "message": str(partials[0]) if partials else "No citations to analyze",
+                    "error_type": "map_reduce_error",
+                    "chunks": len(chunks),
+                    "word": word
+                }
+            )
+        if failed:
+            kept = [i for i, citation in enumerate(selection.selected) if id(citation) not in failed]
+            selection.selected = [selection.selected[i] for i in kept]
+            selection.lines = [selection.lines[i] for i in kept]
+            selection.costs = [selection.costs[i] for i in kept]
+
+        prompt = LEXICAL_REDUCE_TEMPLATE.format(
+            word=word,
+            parts=len(analyses),
+            analyses="\n\n".join(analyses)
+        )
+        return selection, prompt, len(chunks)
+
     async def create_lexical_value(
         self,
         word: str,
-        citations: List[Dict[str, Any]],
+        citations: List[Citation],
         max_tokens: Optional[int] = None,
-        stream: bool = False
+        stream: bool = False,
+        use_cache: bool = True,
+        mode: Literal["auto", "single", "map_reduce"] = "auto"
     ) -> Union[Dict[str, Any], AsyncGenerator[str, None]]:
-        """Generate a lexical value analysis for a word/lemma."""
+        """Generate a lexical value analysis for a word/lemma.
+        
+        In "single" mode the citations are fitted to the prompt token budget
+        and analyzed in one prompt. In "map_reduce" mode chunks of citations
+        are analyzed concurrently and a final prompt merges the analyses, so
+        many more citations can be used. "auto" uses map-reduce when the
+        citations do not fit one prompt. The result carries a
+        "citation_selection" report listing the citations used and the ones
+        dropped. Set use_cache to False to regenerate instead of reusing the
+        response to an identical earlier prompt.
+        """
         try:
             logger.info(f"Creating lexical value for word: {word}")
             logger.debug(f"Number of citations: {len(citations)}")
-            logger.debug(f"Raw citations: {citations}")
-            
-            # Format citations with both reference and text
-            citations_text = "\n".join(
-                f"{citation.citation}: {citation.sentence.text}"  # Include both citation and its text
-                for citation in citations
-            )
             
-            logger.debug(f"Formatted citations text:\n{citations_text}")
+            # Format the citations that fit the budget with both reference and text
+            selection = self.select_citations(word, citations, max_tokens)
+            overflow = any(dropped["reason"] == "budget" for dropped in selection.dropped)
             
-            # Format the prompt using template from prompts.py
-            prompt = LEXICAL_VALUE_TEMPLATE.format(
-                word=word,
-                citations=citations_text
-            )
+            if mode == "map_reduce" or (mode == "auto" and overflow):
+                logger.info(f"Using map-reduce for {word} ({len(citations)} citations)")
+                selection, prompt, chunks = await self._map_citations(word, citations, use_cache)
+                report = {**selection.report(), "mode": "map_reduce", "chunks": chunks}
+            else:
+                logger.debug(f"Formatted citations text:\n{selection.text}")
+                
+                # Format the prompt using template from prompts.py
+                prompt = LEXICAL_VALUE_TEMPLATE.format(
+                    word=word,
+                    citations=selection.text
+                )
+                report = {**selection.report(), "mode": "single"}
             
             logger.debug(f"Complete prompt:\n{prompt}")
             
@@ -69,84 +278,19 @@ class LexicalLLMService(BaseLLMService):
                     max_tokens=max_tokens
                 )
             
+            # Only cache responses that parse, so retries do not replay a broken one
             response = await self.client.generate(
                 prompt=prompt,
-                max_tokens=max_tokens
+                max_tokens=max_tokens,
+                use_cache=use_cache,
+                cache_if=lambda candidate: self._is_lexical_value(candidate, word)
             )
             
             logger.debug(f"Raw LLM response:\n{response.text}")
             
-            # Parse and validate the JSON response
-            try:
-                # First try parsing the raw response
-                try:
-                    result = json.loads(response.text)
-                except json.JSONDecodeError:
-                    # If raw parsing fails, try sanitization
-                    sanitized_text = self._sanitize_json_string(response.text)
-                    logger.debug(f"Sanitized JSON:\n{sanitized_text}")
-                    
-                    try:
-                        result = json.loads(sanitized_text)
-                    except json.JSONDecodeError as e:
-                        # If still failing, try more aggressive cleanup
-                        logger.warning(f"Sanitized JSON parse failed: {str(e)}, attempting more aggressive cleanup")
-                        # Convert the entire response to a valid JSON structure
-                        cleaned = re.sub(r'[^\x20-\x7E]', '', sanitized_text)  # Remove non-printable chars
-                        cleaned = re.sub(r'([{,]\s*)([a-zA-Z_][a-zA-Z0-9_]*)\s*:', r'\1"\2":', cleaned)  # Quote all keys
-                        cleaned = re.sub(r':\s*([^"{[\s][^,}\]]*[^"\s,}\]])', r': "\1"', cleaned)  # Quote unquoted values
-                        cleaned = re.sub(r',(\s*[}\]])', r'\1', cleaned)  # Remove trailing commas
-                        result = json.loads(cleaned)
-                
-                logger.debug(f"Parsed JSON result:\n{json.dumps(result, indent=2)}")
-                
-                # Validate required fields
-                required_fields = ['lemma', 'translation', 'short_description', 
-                                'long_description', 'related_terms', 'citations_used']
-                missing_fields = [field for field in required_fields if field not in result]
-                
-                if missing_fields:
-                    logger.error(f"Missing required fields in LLM response: {missing_fields}")
-                    raise LLMServiceError(
-                        "Invalid LLM response format",
-                        {
-                            "message": "Missing required fields in LLM response",
-                            "error_type": "validation_error",
-                            "missing_fields": missing_fields,
-                            "received_fields": list(result.keys()),
-                            "word": word
-                        }
-                    )
-                
-                # Ensure all text fields are properly escaped strings
-                for field in ['translation', 'short_description', 'long_description']:
-                    if not isinstance(result[field], str):
-                        result[field] = str(result[field])
-                    # Preserve Unicode characters while escaping necessary characters
-                    result[field] = result[field].replace('\\', '\\\\').replace('"', '\\"')
-                
-                # Ensure arrays contain only strings
-                for field in ['related_terms', 'citations_used']:
-                    if not isinstance(result[field], list):
-                        result[field] = [str(result[field])]
-                    result[field] = [str(item) for item in result[field]]
-                
-                return result
-                
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse JSON from LLM response: {str(e)}")
-                logger.error(f"Invalid JSON response:\n{response.text}")
-                raise LLMServiceError(
-                    "Invalid JSON response from LLM",
-                    {
-                        "message": "Failed to parse JSON response",
-                        "error_type": "json_parse_error",
-                        "parse_error": str(e),
-                        "response_text": response.text[:1000],  # First 1000 chars
-                        "response_length": len(response.text),
-                        "word": word
-                    }
-                )
+            result = self._parse_lexical_value(response.text, word)
+            result['citation_selection'] = report
+            return result
         except Exception as e:
             logger.error(f"Error creating lexical value: {str(e)}", exc_info=True)
             raise LLMServiceError(
@@ -47,7 +47,10 @@ class QueryLLMService(BaseLLMService):
                 
                 # Format citations and get results_id
                 try:
-                    results_id, first_page = await self.citation_service.format_citations(rows)
+                    results_id, first_page = await self.citation_service.format_citations(
+                        rows,
+                        fingerprint=self.citation_service.query_fingerprint("sql", {"sql": sql_query})
+                    )
                     logger.debug(f"Query returned {len(rows)} results, stored with ID {results_id}")
                     return sql_query, results_id, first_page
                 except Exception as format_error:
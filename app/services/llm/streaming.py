@@ -0,0 +1,129 @@
+"""
+Bridge from blocking provider streams to async generators.
+
+Provider SDK streams (e.g. botocore's EventStream) are read with blocking
+calls. A reader thread in the LLM executor iterates the stream and pushes
+decoded text deltas into a bounded asyncio.Queue, and an async generator
+yields them to the caller as they arrive. A full queue blocks the reader
+(backpressure for slow clients), and when the consumer goes away (e.g. the
+SSE client disconnects) the reader is told to stop at its next delta.
+"""
+
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, AsyncGenerator, Callable, Optional
+import asyncio
+import logging
+import threading
+import time
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from .executor import llm_executor
+
+logger = logging.getLogger(__name__)
+
+llm_time_to_first_token = metrics.histogram(
+    "llm_time_to_first_token_seconds", "Time from stream request to first text delta", ("operation",),
+    (0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 10.0, 20.0, 30.0)
+)
+llm_stream_chunks = metrics.counter(
+    "llm_stream_chunks_total", "Text deltas delivered to stream consumers", ("operation",)
+)
+llm_streams = metrics.counter(
+    "llm_streams_total", "Finished LLM streams by outcome", ("operation", "outcome")
+)
+
+# Reader thread re-checks for a departed consumer this often while the queue is full
+_PUT_POLL_SECONDS = 0.5
+
+class _Failure:
+    """Carries an exception from the reader thread to the consumer."""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+_END = object()
+
+# Reads a stream, passing each delta to emit; stops when emit returns False
+Producer = Callable[[Callable[[str], bool]], None]
+
+async def stream_from_thread(
+    produce: Producer,
+    operation: str = "stream",
+    max_buffer: Optional[int] = None,
+    timeout: Optional[float] = None
+) -> AsyncGenerator[str, None]:
+    """Run a blocking stream reader in the LLM executor and yield its deltas.
+
+    Args:
+        produce: Blocking function that reads the stream and calls emit
+            for each text delta, stopping when emit returns False
+        operation: Label for metrics
+        max_buffer: Deltas buffered before the reader blocks
+        timeout: Seconds the whole stream may take (defaults to LLM_STREAM_TIMEOUT)
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max_buffer or settings.llm.STREAM_BUFFER)
+    stop = threading.Event()
+
+    def emit(item: Any) -> bool:
+        # Called from the reader thread; blocks while the queue is full
+        while not stop.is_set():
+            future = asyncio.run_coroutine_threadsafe(queue.put(item), loop)
+            try:
+                future.result(timeout=_PUT_POLL_SECONDS)
+                return True
+            except FutureTimeoutError:
+                if not future.cancel():
+                    return True  # the put completed just now
+        return False
+
+    def read() -> None:
+        try:
+            produce(emit)
+        except Exception as e:
+            emit(_Failure(e))
+        finally:
+            emit(_END)
+
+    started = time.perf_counter()
+    reader = asyncio.ensure_future(
+        llm_executor.run(read, operation=operation, timeout=timeout or settings.llm.STREAM_TIMEOUT)
+    )
+    reader.add_done_callback(lambda done: done.cancelled() or done.exception())
+    outcome, first = "disconnected", True
+    try:
+        while True:
+            if reader.done():
+                if queue.empty():
+                    if reader.exception():  # rejected or timed out in the executor
+                        raise reader.exception()
+                    break
+                item = queue.get_nowait()
+            else:
+                getter = asyncio.ensure_future(queue.get())
+                await asyncio.wait({getter, reader}, return_when=asyncio.FIRST_COMPLETED)
+                if not getter.done():
+                    getter.cancel()
+                    continue
+                item = getter.result()
+
+            if item is _END:
+                break
+            if isinstance(item, _Failure):
+                raise item.error
+            if first:
+                llm_time_to_first_token.observe(time.perf_counter() - started, operation=operation)
+                first = False
+            llm_stream_chunks.inc(operation=operation)
+            yield item
+        outcome = "completed"
+    except Exception:
+        outcome = "error"
+        raise
+    finally:
+        # Tell the reader to stop at its next delta (no-op if it already finished)
+        stop.set()
+        llm_streams.inc(operation=operation, outcome=outcome)
+        if outcome == "disconnected":
+            logger.info(f"LLM {operation} consumer went away, stopping reader")
@@ -0,0 +1,115 @@
+"""
+Local token count estimation for LLM prompts.
+
+Counting tokens through the provider costs a billed model call and a
+network round trip, so counts are estimated locally instead: text is split
+into script runs (Greek, Latin, digits, other symbols) and each run is
+converted to tokens with a per-script characters-per-token rate. The
+estimate is scaled by a calibration factor that follows the input token
+counts the provider reports for real generations, and raw estimates are
+memoized per text hash.
+"""
+
+from collections import OrderedDict
+from typing import Optional
+import hashlib
+import logging
+import math
+import threading
+
+import regex
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+llm_token_calibration = metrics.gauge(
+    "llm_token_calibration", "Ratio of reported to estimated prompt tokens"
+)
+
+# Script runs (combining accents belong to the run); whitespace is absorbed
+# into the following token and any other character counts as one token
+_RUNS = regex.compile(
+    r"(?P<greek>[\p{Greek}\p{M}]+)|(?P<latin>[\p{Latin}\p{M}]+)|(?P<digit>\d+)|\s+|(?P<other>.)",
+    regex.DOTALL
+)
+
+# Approximate characters per token by script (polytonic Greek splits into
+# much shorter pieces than English text)
+CHARS_PER_TOKEN = {
+    "greek": 1.6,
+    "latin": 4.0,
+    "digit": 3.0,
+}
+
+# Only prompts at least this long (estimated tokens) update the calibration,
+# so the fixed per-request overhead does not skew it
+_MIN_CALIBRATION_TOKENS = 100
+
+# Weight of each new observation in the calibration factor
+_CALIBRATION_WEIGHT = 0.1
+
+# Calibration factor bounds
+_MIN_FACTOR, _MAX_FACTOR = 0.5, 2.0
+
+class TokenEstimator:
+    """Estimates token counts locally and calibrates against reported usage."""
+
+    def __init__(self, factor: Optional[float] = None, max_entries: int = 1024):
+        self.factor = factor or settings.llm.TOKEN_CALIBRATION
+        self.max_entries = max_entries
+        self._memo: "OrderedDict[bytes, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        llm_token_calibration.set(self.factor)
+
+    @staticmethod
+    def _raw_estimate(text: str) -> int:
+        """Estimate tokens from script runs, before calibration."""
+        tokens = 0
+        for match in _RUNS.finditer(text):
+            script = match.lastgroup
+            if script == "other":
+                tokens += 1
+            elif script:
+                tokens += math.ceil(len(match.group()) / CHARS_PER_TOKEN[script])
+        return tokens
+
+    def raw_estimate(self, text: str) -> int:
+        """Get the uncalibrated estimate of a text, memoized by its hash."""
+        digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+        with self._lock:
+            if digest in self._memo:
+                self._memo.move_to_end(digest)
+                return self._memo[digest]
+
+        tokens = self._raw_estimate(text)
+        with self._lock:
+            self._memo[digest] = tokens
+            while len(self._memo) > self.max_entries:
+                self._memo.popitem(last=False)
+        return tokens
+
+    def estimate(self, text: str) -> int:
+        """Estimate the number of tokens in a text."""
+        return math.ceil(self.raw_estimate(text) * self.factor)
+
+    def calibrate(self, text: str, reported_tokens: int) -> None:
+        """Move the calibration factor towards a reported input token count.
+
+        Args:
+            text: Prompt that was sent
+            reported_tokens: Input tokens the provider reported for it
+        """
+        raw = self.raw_estimate(text)
+        if raw < _MIN_CALIBRATION_TOKENS or reported_tokens <= 0:
+            return
+        observed = min(max(reported_tokens / raw, _MIN_FACTOR), _MAX_FACTOR)
+        self.factor += _CALIBRATION_WEIGHT * (observed - self.factor)
+        llm_token_calibration.set(self.factor)
+        logger.debug(
+            f"Token calibration: estimated {raw}, reported {reported_tokens}, factor {self.factor:.3f}"
+        )
+
+# Shared by all LLM clients of this worker
+token_estimator = TokenEstimator()
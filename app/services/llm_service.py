@@ -2,10 +2,11 @@
 Main LLM service that coordinates between specialized services.
 """
 
-from typing import Dict, Any, Optional, AsyncGenerator, Type, Union, List, Tuple
+from typing import Dict, Any, Optional, AsyncGenerator, Type, Union, List, Tuple, Literal
 from sqlalchemy.ext.asyncio import AsyncSession
 import logging
 
+from app.models.citations import Citation
 from app.services.llm.base_service import LLMServiceError
 from app.services.llm.lexical_service import LexicalLLMService
 from app.services.llm.query_service import QueryLLMService
@@ -28,16 +29,20 @@ class LLMService:
     async def create_lexical_value(
         self,
         word: str,
-        citations: List[Dict[str, Any]],
+        citations: List[Citation],
         max_tokens: Optional[int] = None,
-        stream: bool = False
+        stream: bool = False,
+        use_cache: bool = True,
+        mode: Literal["auto", "single", "map_reduce"] = "auto"
     ) -> Union[Dict[str, Any], AsyncGenerator[str, None]]:
         """Generate a lexical value analysis using LexicalLLMService."""
         return await self.lexical_service.create_lexical_value(
             word=word,
             citations=citations,
             max_tokens=max_tokens,
-            stream=stream
+            stream=stream,
+            use_cache=use_cache,
+            mode=mode
         )
 
     async def generate_and_execute_query(
@@ -56,20 +61,22 @@ class LLMService:
         term: str,
         contexts: List[Dict[str, Any]],
         max_tokens: Optional[int] = None,
-        stream: bool = False
+        stream: bool = False,
+        use_cache: bool = True
     ) -> Union[str, AsyncGenerator[str, None]]:
         """Analyze a term using AnalysisLLMService."""
         return await self.analysis_service.analyze_term(
             term=term,
             contexts=contexts,
             max_tokens=max_tokens,
-            stream=stream
+            stream=stream,
+            use_cache=use_cache
         )
 
     async def get_token_count(self, text: str) -> int:
         """Get token count using any of the services (they all inherit from BaseLLMService)."""
         return await self.lexical_service.get_token_count(text)
 
-    async def check_context_length(self, prompt: str) -> bool:
+    async def check_context_length(self, prompt: str, token_count: Optional[int] = None) -> bool:
         """Check context length using any of the services (they all inherit from BaseLLMService)."""
-        return await self.lexical_service.check_context_length(prompt)
+        return await self.lexical_service.check_context_length(prompt, token_count=token_count)
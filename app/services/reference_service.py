@@ -0,0 +1,228 @@
+"""
+Service layer for resolving citation references to line ranges.
+
+A reference names a work and a locator range, e.g. "0057.001 1.5.3-1.6.10"
+(TLG author and work numbers) or "Gal. San. 6.135" (abbreviations as
+produced by TextDivision.format_citation). The work's citation structure
+from CitationParser.get_work_structure gives the meaning of each locator
+level: all levels but the last select text_divisions fields, the last one
+is the line number. Both ends are resolved with indexed lookups and the
+range itself is read through TextService.get_line_range.
+"""
+
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+import logging
+import re
+
+from app.models.text_division import TextDivision, DIVISION_LEVEL_FIELDS
+from app.models.text_line import TextLine
+from app.models.citations import ReferenceResolution
+from app.core.redis import redis_client
+from app.core.cache_keys import corpus_key
+from app.core.config import settings
+from app.services.text_service import TextService
+from toolkit.parsers.citation import CitationParser, map_level_to_field
+
+logger = logging.getLogger(__name__)
+
+# "[TLG]0057.001 1.5.3-1.6.10" or "<abbreviations> 1.5.3-1.6.10"
+TLG_REFERENCE = re.compile(
+    r"^\s*(?:TLG)?(?P<author>\d{4})[.:](?P<work>\d{3})\s+(?P<start>[\w.]+?)(?:\s*[-–—]\s*(?P<end>[\w.]+))?\s*$",
+    re.IGNORECASE
+)
+ABBREVIATED_REFERENCE = re.compile(
+    r"^\s*(?P<work>.+?)\s+(?P<start>\d[\w.]*?)(?:\s*[-–—]\s*(?P<end>\d[\w.]*))?\s*$"
+)
+
+def _normalize_abbreviation(value: str) -> str:
+    """Normalize an abbreviation for lookup (case and spacing)."""
+    return " ".join(value.casefold().split())
+
+class ReferenceService:
+    def __init__(self, session: AsyncSession):
+        """Initialize the reference service with a database session."""
+        self.session = session
+        self.redis = redis_client
+        self.text_service = TextService(session)
+
+    async def _work_abbreviations(self) -> Dict[str, List[List[str]]]:
+        """Map normalized "Author Work" and "Author" abbreviations to (author_id, work_number) pairs (cached)."""
+        cache_key = await corpus_key(settings.redis.TEXT_CACHE_PREFIX, "work_abbreviations")
+        cached = await self.redis.get(cache_key)
+        if cached:
+            return cached
+
+        result = await self.session.execute(
+            select(
+                TextDivision.author_id_field,
+                TextDivision.work_number_field,
+                TextDivision.author_name,
+                TextDivision.work_name
+            ).distinct()
+        )
+
+        abbreviations: Dict[str, List[List[str]]] = {}
+        for author_id, work_number, author_name, work_name in result.all():
+            # Build abbreviations exactly as citations are displayed
+            division = TextDivision(
+                author_id_field=author_id,
+                work_number_field=work_number,
+                author_name=author_name,
+                work_name=work_name
+            )
+            author = division._get_abbreviated_author_name()
+            work = division._get_abbreviated_work_name()
+            for key in (f"{author} {work}", author):
+                pairs = abbreviations.setdefault(_normalize_abbreviation(key), [])
+                if [author_id, work_number] not in pairs:
+                    pairs.append([author_id, work_number])
+
+        await self.redis.set(cache_key, abbreviations, ttl=settings.redis.TEXT_CACHE_HARD_TTL)
+        return abbreviations
+
+    async def _parse(self, reference: str) -> Tuple[str, str, str, Optional[str]]:
+        """Split a reference into author ID, work number and start/end locators."""
+        match = TLG_REFERENCE.match(reference)
+        if match:
+            return match["author"], match["work"], match["start"], match["end"]
+
+        match = ABBREVIATED_REFERENCE.match(reference)
+        if not match:
+            raise ValueError(f"Could not parse reference: {reference}")
+
+        pairs = (await self._work_abbreviations()).get(_normalize_abbreviation(match["work"]), [])
+        if not pairs:
+            raise ValueError(f"Unknown work in reference: {match['work']}")
+        if len(pairs) > 1:
+            raise ValueError(
+                f"Ambiguous work in reference: {match['work']} "
+                f"({', '.join(f'{a}.{w}' for a, w in pairs)})"
+            )
+        author_id, work_number = pairs[0]
+        return author_id, work_number, match["start"], match["end"]
+
+    def _locator_fields(
+        self,
+        locator: str,
+        structure: List[str]
+    ) -> Tuple[Dict[str, str], Optional[int]]:
+        """Map a locator (e.g. "1.5.3") onto division field values and a line number."""
+        values = [value for value in locator.strip(".").split(".") if value]
+        if len(values) > len(structure):
+            raise ValueError(
+                f"Locator {locator} has more levels than the work's structure ({', '.join(structure)})"
+            )
+
+        fields: Dict[str, str] = {}
+        line: Optional[int] = None
+        for level, value in zip(structure, values):
+            field = map_level_to_field(level, structure)
+            if field == "line":
+                if not value.isdigit():
+                    raise ValueError(f"Invalid line number in locator {locator}: {value}")
+                line = int(value)
+            else:
+                # Levels without their own column (e.g. play) are stored as chapters
+                fields[field if field in DIVISION_LEVEL_FIELDS else "chapter"] = value
+        return fields, line
+
+    async def _find_position(
+        self,
+        author_id: str,
+        work_number: str,
+        fields: Dict[str, str],
+        line: Optional[int],
+        last: bool
+    ) -> Optional[Tuple[int, int, int]]:
+        """Find the (text_id, division_id, line_number) of the first or last matching line."""
+        query = (
+            select(TextDivision.text_id, TextDivision.id, TextLine.line_number)
+            .join(TextLine, TextLine.division_id == TextDivision.id)
+            .filter(
+                TextDivision.author_id_field == author_id,
+                TextDivision.work_number_field == work_number,
+                *(getattr(TextDivision, field) == value for field, value in fields.items())
+            )
+        )
+        if last:
+            if line is not None:
+                query = query.filter(TextLine.line_number <= line)
+            query = query.order_by(TextDivision.id.desc(), TextLine.line_number.desc())
+        else:
+            if line is not None:
+                query = query.filter(TextLine.line_number >= line)
+            query = query.order_by(TextDivision.id, TextLine.line_number)
+
+        row = (await self.session.execute(query.limit(1))).first()
+        return tuple(row) if row else None
+
+    async def resolve(
+        self,
+        reference: str,
+        include_lines: bool = True,
+        include_tokens: bool = False,
+        limit: int = 100
+    ) -> Optional[ReferenceResolution]:
+        """Resolve a citation reference to a line range.
+
+        An end locator may omit leading levels shared with the start
+        ("1.5.3-10" means "1.5.3-1.5.10"); a locator with fewer levels than
+        the structure covers the whole unit (e.g. "1.5" is all of chapter 5).
+
+        Args:
+            reference: Reference string
+            include_lines: Whether to include the first page of lines
+            include_tokens: Whether to include spaCy token data in the lines
+            limit: Maximum number of lines to include
+
+        Returns:
+            The resolution, or None if no lines match the reference
+
+        Raises:
+            ValueError: If the reference cannot be parsed
+        """
+        author_id, work_number, start, end = await self._parse(reference)
+        structure = CitationParser.get_instance().get_work_structure(author_id, work_number)
+
+        start_values = start.strip(".").split(".")
+        end_values = end.strip(".").split(".") if end else start_values
+        if len(end_values) < len(start_values):
+            end_values = start_values[:len(start_values) - len(end_values)] + end_values
+
+        start_fields, start_line = self._locator_fields(".".join(start_values), structure)
+        end_fields, end_line = self._locator_fields(".".join(end_values), structure)
+
+        first = await self._find_position(author_id, work_number, start_fields, start_line, last=False)
+        last = await self._find_position(author_id, work_number, end_fields, end_line, last=True)
+        if not first or not last or (last[1], last[2]) < (first[1], first[2]):
+            logger.debug(f"No lines found for reference {reference}")
+            return None
+
+        lines = None
+        if include_lines:
+            lines = await self.text_service.get_line_range(
+                first[0],
+                first[1],
+                end_division_id=last[1],
+                start_line=first[2],
+                end_line=last[2],
+                include_tokens=include_tokens,
+                limit=limit
+            )
+
+        return ReferenceResolution(
+            reference=reference,
+            author_id=author_id,
+            work_number=work_number,
+            structure=structure,
+            start={**start_fields, **({"line": str(start_line)} if start_line is not None else {})},
+            end={**end_fields, **({"line": str(end_line)} if end_line is not None else {})},
+            text_id=str(first[0]),
+            start_division_id=str(first[1]),
+            start_line=first[2],
+            end_division_id=str(last[1]),
+            end_line=last[2],
+            lines=lines
+        )
@@ -4,19 +4,15 @@ Service layer for text search operations.
 
 from typing import List, Dict, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, text
 import logging
 
 from app.models.text_division import TextDivision
 from app.models.text_line import TextLine, TextLineAPI
 from app.models.citations import Citation, SearchResponse
 from app.core.redis import redis_client
+from app.core.cache_keys import corpus_key
 from app.core.config import settings
-from app.core.citation_queries import (
-    LEMMA_CITATION_QUERY,
-    TEXT_CITATION_QUERY,
-    CATEGORY_CITATION_QUERY
-)
+from app.core.raw_queries import RawQueryRepository
 from app.services.citation_service import CitationService
 
 logger = logging.getLogger(__name__)
@@ -27,75 +23,102 @@ class SearchService:
         self.session = session
         self.redis = redis_client
         self.citation_service = CitationService(session)
+        self.raw_queries = RawQueryRepository(session)
 
     async def _cache_key(self, key_type: str, identifier: str = "") -> str:
-        """Generate cache key based on type and identifier."""
+        """Generate a corpus-versioned cache key based on type and identifier."""
         prefix = getattr(settings.redis, f"{key_type.upper()}_CACHE_PREFIX")
-        return f"{prefix}{identifier}"
+        return await corpus_key(prefix, identifier)
 
     async def search_texts(
         self, 
         query: str, 
         search_lemma: bool = False,
         categories: Optional[List[str]] = None,
-        use_corpus_search: bool = True  # Parameter kept for backward compatibility
+        use_corpus_search: bool = True,  # Parameter kept for backward compatibility
+        record_access: bool = True
     ) -> SearchResponse:
-        """Search texts by content, lemma, or categories (cached)."""
+        """Search texts by content, lemma, or categories (cached).
+        
+        Set record_access to False for searches that should not count towards
+        the hot lemmas replayed by the cache warmer (e.g. the warmer itself).
+        """
         try:
             logger.debug(f"Starting search with query: {query}, lemma: {search_lemma}, categories: {categories}")
             
+            # Record lemma access so the cache warmer can replay hot lemmas
+            if record_access and search_lemma and not categories:
+                await self.redis.record_access("lemma", query)
+            
             # Generate cache key based on search parameters
             cache_key = await self._cache_key(
                 "search",
                 f"{query}_{search_lemma}_{'-'.join(categories or [])}_{use_corpus_search}"
             )
             
-            # Try to get from cache
-            cached_data = await self.redis.get(cache_key)
-            if cached_data:
-                logger.debug("Returning cached search results")
-                return SearchResponse.model_validate(cached_data)
+            # The cache entry only points at the stored result set; pages live there
+            pointer = await self.redis.get(cache_key)
+            if pointer:
+                citations = await self.citation_service.get_paginated_results(pointer["results_id"], 1)
+                if citations:
+                    logger.debug("Returning cached search results")
+                    return SearchResponse(
+                        results=citations,
+                        results_id=pointer["results_id"],
+                        total_results=pointer["total_results"]
+                    )
 
             # Choose appropriate query based on search type
             if categories:
-                search_query = CATEGORY_CITATION_QUERY
+                query_name = "category"
                 params = {"category": categories[0]}  # Currently only supports one category
                 logger.debug(f"Using category search with params: {params}")
             elif search_lemma:
-                search_query = LEMMA_CITATION_QUERY
+                query_name = "lemma"
                 params = {"pattern": query}  # Pass raw lemma value
                 logger.debug(f"Using lemma search with params: {params}")
             else:
-                search_query = TEXT_CITATION_QUERY
+                query_name = "text"
                 params = {"pattern": f'%{query}%'}
                 logger.debug(f"Using text search with params: {params}")
 
-            # Execute query
-            result = await self.session.execute(text(search_query), params)
-            rows = result.mappings().all()
-            logger.debug(f"Found {len(rows)} results")
-            
-            # Log first row for debugging
-            if rows:
-                logger.debug(f"First row data: {dict(rows[0])}")
-            
-            # Format citations and store in Redis
-            results_id, citations = await self.citation_service.format_citations(rows)
-            logger.debug(f"Formatted {len(rows)} citations with ID {results_id}")
+            # Identical searches share one stored result set
+            fingerprint = self.citation_service.query_fingerprint(query_name, params)
+            stored = await self.citation_service.get_stored_results(fingerprint)
+            if stored:
+                results_id, citations, meta = stored
+                total_results = meta.get("total_matches", meta.get("total_results", len(citations)))
+                logger.debug(f"Reusing stored result set {results_id}")
+            else:
+                # Execute query
+                rows = await self.raw_queries.fetch_citations(query_name, params)
+                logger.debug(f"Found {len(rows)} results")
+                
+                # Log first row for debugging
+                if rows:
+                    logger.debug(f"First row data: {dict(rows[0])}")
+                
+                # Format citations and store in Redis
+                results_id, citations = await self.citation_service.format_citations(
+                    rows, fingerprint=fingerprint
+                )
+                total_results = len(rows)
+                logger.debug(f"Formatted {len(rows)} citations with ID {results_id}")
             
             # Create response with total results
             response = SearchResponse(
                 results=citations,
                 results_id=results_id,
-                total_results=len(rows)
+                total_results=total_results
             )
             
-            # Cache the response
-            await self.redis.set(
-                cache_key,
-                response.model_dump(),
-                ttl=settings.redis.SEARCH_CACHE_TTL
-            )
+            # Cache a pointer to the result set
+            if results_id:
+                await self.redis.set(
+                    cache_key,
+                    {"results_id": results_id, "total_results": total_results},
+                    ttl=settings.redis.SEARCH_CACHE_TTL
+                )
             
             return response
             
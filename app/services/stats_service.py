@@ -0,0 +1,193 @@
+"""
+Service layer for corpus statistics.
+
+Statistics live in the corpus_stats table, which the ingestion pipeline
+updates one work at a time (see CorpusStat), so reading them is a single
+indexed query instead of aggregates over text_lines and sentences.
+"""
+
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Mapping
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy import select, func, text
+import logging
+
+from app.models.corpus_stats import (
+    CorpusStat, CorpusStatsResponse, FrequencyItem, WorkStats,
+    WORK_SCOPE, CATEGORY_SCOPE, LEMMA_SCOPE, CORPUS_TOTAL
+)
+from app.models.text_division import TextDivision
+from app.models.text_line import TextLine
+from app.core.redis import redis_client
+from app.core.cache_keys import corpus_key
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Work rows, category totals and the most frequent lemmas in one pass
+STATS_QUERY = f"""
+SELECT cs.scope, cs.key, cs.text_id, t.title, cs.divisions, cs.lines, cs.sentences, cs.tokens, cs.occurrences
+FROM corpus_stats cs
+JOIN texts t ON t.id = cs.text_id
+WHERE cs.scope = '{WORK_SCOPE}'
+UNION ALL
+SELECT scope, key, text_id, NULL, 0, 0, 0, 0, occurrences
+FROM corpus_stats
+WHERE scope = '{CATEGORY_SCOPE}' AND text_id = {CORPUS_TOTAL} AND occurrences > 0
+UNION ALL
+(
+    SELECT scope, key, text_id, NULL, 0, 0, 0, 0, occurrences
+    FROM corpus_stats
+    WHERE scope = '{LEMMA_SCOPE}' AND text_id = {CORPUS_TOTAL} AND occurrences > 0
+    ORDER BY occurrences DESC
+    LIMIT :top
+)
+"""
+
+# Rows per INSERT when applying frequency changes
+_UPSERT_BATCH_SIZE = 1000
+
+class CorpusStatsService:
+    def __init__(self, session: AsyncSession):
+        """Initialize the stats service with a database session."""
+        self.session = session
+        self.redis = redis_client
+
+    async def record_work_structure(self, text_id: int) -> None:
+        """Count a work's divisions and lines and store them in its work row."""
+        divisions = await self.session.scalar(
+            select(func.count(TextDivision.id)).filter(TextDivision.text_id == text_id)
+        )
+        lines = await self.session.scalar(
+            select(func.count(TextLine.id))
+            .join(TextDivision, TextDivision.id == TextLine.division_id)
+            .filter(TextDivision.text_id == text_id)
+        )
+        await self._upsert_work(text_id, divisions=divisions or 0, lines=lines or 0)
+
+    async def record_work_analysis(
+        self,
+        text_id: int,
+        sentences: int,
+        tokens: int,
+        categories: Counter,
+        lemmas: Counter
+    ) -> None:
+        """Store a work's sentence and token counts and update category/lemma totals.
+
+        The totals are adjusted by the difference from the counts recorded
+        the last time the work was processed, if any.
+
+        Args:
+            text_id: ID of the work's text
+            sentences: Number of sentences created for the work
+            tokens: Number of tokens in those sentences
+            categories: Tagged tokens per category
+            lemmas: Tokens per lemma
+        """
+        previous = await self.session.scalar(
+            select(CorpusStat.breakdown).filter(
+                CorpusStat.scope == WORK_SCOPE,
+                CorpusStat.key == "",
+                CorpusStat.text_id == text_id
+            )
+        ) or {}
+
+        await self._upsert_work(
+            text_id,
+            sentences=sentences,
+            tokens=tokens,
+            breakdown={"categories": dict(categories), "lemmas": dict(lemmas)}
+        )
+        await self._apply_deltas(CATEGORY_SCOPE, categories, previous.get("categories", {}))
+        await self._apply_deltas(LEMMA_SCOPE, lemmas, previous.get("lemmas", {}))
+        logger.debug(
+            f"Recorded stats for text {text_id}: {sentences} sentences, {tokens} tokens, "
+            f"{len(categories)} categories, {len(lemmas)} lemmas"
+        )
+
+    async def _upsert_work(self, text_id: int, **values) -> None:
+        """Insert a work row or update the given columns of an existing one."""
+        now = datetime.utcnow()
+        stmt = insert(CorpusStat).values(
+            scope=WORK_SCOPE, key="", text_id=text_id, created_at=now, updated_at=now, **values
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CorpusStat.scope, CorpusStat.key, CorpusStat.text_id],
+            set_={**{column: stmt.excluded[column] for column in values}, "updated_at": now}
+        )
+        await self.session.execute(stmt)
+
+    async def _apply_deltas(self, scope: str, current: Mapping[str, int], previous: Mapping[str, int]) -> None:
+        """Add the change between two frequency counts to the corpus totals of a scope."""
+        deltas: Dict[str, int] = {
+            key: current.get(key, 0) - previous.get(key, 0)
+            for key in set(current) | set(previous)
+        }
+        changed = [(key, delta) for key, delta in deltas.items() if delta]
+        now = datetime.utcnow()
+
+        for start in range(0, len(changed), _UPSERT_BATCH_SIZE):
+            stmt = insert(CorpusStat).values([
+                {
+                    "scope": scope,
+                    "key": key,
+                    "text_id": CORPUS_TOTAL,
+                    "occurrences": delta,
+                    "created_at": now,
+                    "updated_at": now
+                }
+                for key, delta in changed[start:start + _UPSERT_BATCH_SIZE]
+            ])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[CorpusStat.scope, CorpusStat.key, CorpusStat.text_id],
+                set_={
+                    "occurrences": CorpusStat.occurrences + stmt.excluded.occurrences,
+                    "updated_at": now
+                }
+            )
+            await self.session.execute(stmt)
+
+    async def get_stats(self, top_lemmas: int = 50) -> CorpusStatsResponse:
+        """Get corpus statistics with the most frequent lemmas (cached)."""
+        cache_key = await corpus_key(settings.redis.STATS_CACHE_PREFIX, f"top:{top_lemmas}")
+        cached = await self.redis.get(cache_key)
+        if cached:
+            return CorpusStatsResponse.model_validate(cached)
+
+        result = await self.session.execute(text(STATS_QUERY), {"top": top_lemmas})
+
+        works, categories, lemmas = [], [], []
+        for row in result.mappings():
+            if row["scope"] == WORK_SCOPE:
+                works.append(WorkStats(
+                    text_id=str(row["text_id"]),
+                    title=row["title"],
+                    divisions=row["divisions"],
+                    lines=row["lines"],
+                    sentences=row["sentences"],
+                    tokens=row["tokens"]
+                ))
+            elif row["scope"] == CATEGORY_SCOPE:
+                categories.append(FrequencyItem(name=row["key"], occurrences=row["occurrences"]))
+            else:
+                lemmas.append(FrequencyItem(name=row["key"], occurrences=row["occurrences"]))
+
+        works.sort(key=lambda work: work.title or "")
+        categories.sort(key=lambda item: item.occurrences, reverse=True)
+        lemmas.sort(key=lambda item: item.occurrences, reverse=True)
+
+        stats = CorpusStatsResponse(
+            texts=len(works),
+            divisions=sum(work.divisions for work in works),
+            lines=sum(work.lines for work in works),
+            sentences=sum(work.sentences for work in works),
+            tokens=sum(work.tokens for work in works),
+            works=works,
+            categories=categories,
+            lemmas=lemmas
+        )
+        await self.redis.set(cache_key, stats.model_dump(), ttl=settings.redis.STATS_CACHE_TTL)
+        return stats
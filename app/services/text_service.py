@@ -2,41 +2,134 @@
 Service layer for basic text operations.
 """
 
-from typing import List, Dict, Optional
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Dict, Optional, Set, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, text as sql_text
+from sqlalchemy import select, func, text as sql_text
 from sqlalchemy.orm import joinedload, selectinload
+import asyncio
 import logging
+import time
 
 from app.models.text import Text
-from app.models.text_division import TextDivision, TextDivisionResponse, TextResponse
-from app.models.text_line import TextLine, TextLineAPI
+from app.models.text_division import (
+    TextDivision, TextDivisionResponse, TextResponse,
+    TableOfContentsNode, TableOfContentsResponse, DIVISION_LEVEL_FIELDS
+)
+from app.models.text_line import TextLine, TextLineAPI, TextLineRangeItem, TextLineRangeResponse
 from app.core.redis import redis_client
+from app.core.cache_keys import corpus_key
 from app.core.config import settings
+from app.core.database import async_session_maker
+from app.core.raw_queries import RawQueryRepository
+from toolkit.parsers.citation import CitationParser, map_level_to_field
 
 logger = logging.getLogger(__name__)
 
+# Strong references to in-flight background refreshes (asyncio only keeps weak ones)
+_refresh_tasks: Set[asyncio.Task] = set()
+
+# Rows fetched per round trip when streaming text lines
+_LINE_BATCH_SIZE = 1000
+
+# Upper bound for open-ended line ranges (line_number is a 32-bit integer)
+_MAX_LINE_NUMBER = 2**31 - 1
+
 class TextService:
     def __init__(self, session: AsyncSession):
         """Initialize the text service with a database session."""
         self.session = session
         self.redis = redis_client
+        self.raw_queries = RawQueryRepository(session)
 
-    async def _cache_key(self, key_type: str, identifier: str = "") -> str:
-        """Generate cache key based on type and identifier."""
+    async def _cache_key(
+        self,
+        key_type: str,
+        identifier: str = "",
+        text_id: Optional[int] = None
+    ) -> str:
+        """Generate a corpus-versioned cache key based on type and identifier."""
         prefix = getattr(settings.redis, f"{key_type.upper()}_CACHE_PREFIX")
-        return f"{prefix}{identifier}"
+        return await corpus_key(prefix, identifier, text_id=text_id)
+
+    async def _store(self, cache_key: str, result: Any) -> None:
+        """Store a result with its build time; Redis expiry is the hard TTL."""
+        if isinstance(result, list):
+            value = [item.model_dump() for item in result]
+        else:
+            value = result.model_dump()
+        await self.redis.set(
+            cache_key,
+            {"value": value, "cached_at": time.time()},
+            ttl=settings.redis.TEXT_CACHE_HARD_TTL
+        )
+
+    async def _cached(
+        self,
+        cache_key: str,
+        build: Callable[["TextService"], Awaitable[Any]],
+        parse: Callable[[Any], Any]
+    ) -> Any:
+        """Get a cached result with stale-while-revalidate semantics.
+        
+        Fresh entries (younger than TEXT_CACHE_TTL) are returned as-is. Stale
+        entries are returned immediately while a background task rebuilds
+        them behind a per-key lock. Only a missing entry (past the hard TTL)
+        makes the request block on a rebuild.
+        
+        Args:
+            cache_key: Versioned cache key
+            build: Coroutine function building the result from a TextService
+            parse: Converts the cached value back into response models
+        """
+        entry = await self.redis.get(cache_key)
+        if isinstance(entry, dict) and "cached_at" in entry:
+            age = time.time() - entry["cached_at"]
+            if age >= settings.redis.TEXT_CACHE_TTL:
+                logger.debug(f"Serving stale cache entry {cache_key} (age: {age:.0f}s)")
+                task = asyncio.create_task(self._refresh(cache_key, build))
+                _refresh_tasks.add(task)
+                task.add_done_callback(_refresh_tasks.discard)
+            return parse(entry["value"])
+        
+        result = await build(self)
+        if result is not None:
+            await self._store(cache_key, result)
+        return result
+
+    async def _refresh(
+        self,
+        cache_key: str,
+        build: Callable[["TextService"], Awaitable[Any]]
+    ) -> None:
+        """Rebuild a stale cache entry unless another worker already is."""
+        lock_key = f"{cache_key}:refresh_lock"
+        if not await self.redis.set_if_absent(lock_key, 1, ttl=settings.redis.CACHE_REFRESH_LOCK_TTL):
+            return
+        
+        start = time.time()
+        try:
+            # The request session is closed by the time this runs
+            async with async_session_maker() as session:
+                result = await build(TextService(session))
+            if result is not None:
+                await self._store(cache_key, result)
+            logger.info(f"Refreshed stale cache entry {cache_key} in {time.time() - start:.2f}s")
+        except Exception as e:
+            logger.error(f"Error refreshing cache entry {cache_key}: {str(e)}", exc_info=True)
+        finally:
+            await self.redis.delete(lock_key)
 
     async def list_texts(self) -> List[TextResponse]:
         """List all texts with metadata and preview (cached)."""
         cache_key = await self._cache_key("text", "list")
-        
-        # Try to get from cache
-        cached_data = await self.redis.get(cache_key)
-        if cached_data:
-            return [TextResponse.model_validate(text) for text in cached_data]
-        
-        # Get from database if not in cache
+        return await self._cached(
+            cache_key,
+            lambda service: service._build_text_list(),
+            lambda data: [TextResponse.model_validate(text) for text in data]
+        )
+
+    async def _build_text_list(self) -> List[TextResponse]:
+        """Build the text list with metadata and preview from the database."""
         query = (
             select(Text)
             .options(
@@ -48,32 +141,11 @@ class TextService:
         result = await self.session.execute(query)
         texts = result.unique().scalars().all()
         
+        # Fetch the first lines of every text in one query
+        previews = await self._get_previews()
+        
         responses = []
         for text in texts:
-            # Get text preview using a subquery for first few lines
-            preview_query = sql_text("""
-                WITH RankedLines AS (
-                    SELECT 
-                        text_lines.content,
-                        ROW_NUMBER() OVER (
-                            PARTITION BY text_divisions.text_id 
-                            ORDER BY text_divisions.id, text_lines.line_number
-                        ) as rn
-                    FROM text_lines 
-                    JOIN text_divisions ON text_divisions.id = text_lines.division_id 
-                    WHERE text_divisions.text_id = :text_id
-                )
-                SELECT string_agg(content, E'\n') as preview
-                FROM RankedLines 
-                WHERE rn <= 3
-            """)
-            
-            preview_result = await self.session.execute(
-                preview_query,
-                {"text_id": text.id}
-            )
-            preview_text = preview_result.scalar()
-
             divisions = [
                 TextDivisionResponse(
                     id=str(div.id),
@@ -97,28 +169,55 @@ class TextService:
                 work_name=text.title,
                 reference_code=text.reference_code,
                 metadata=text.text_metadata,
-                divisions=divisions
+                divisions=divisions,
+                preview=previews.get(text.id)
             )
             responses.append(response)
         
-        # Cache the results
-        await self.redis.set(
-            cache_key,
-            [response.model_dump() for response in responses],
-            ttl=settings.redis.TEXT_CACHE_TTL
-        )
-        
         return responses
 
-    async def get_text_by_id(self, text_id: int) -> Optional[TextResponse]:
-        """Get a specific text by ID with all divisions and lines (cached)."""
-        cache_key = await self._cache_key("text", str(text_id))
+    async def _get_previews(self, line_count: int = 3) -> Dict[int, str]:
+        """Get the first lines of every text, keyed by text ID.
         
-        # Try to get from cache
-        cached_data = await self.redis.get(cache_key)
-        if cached_data:
-            return TextResponse.model_validate(cached_data)
-            
+        A lateral join reads only the first few lines of each text, so the
+        cost stays at a single round trip regardless of corpus size.
+        """
+        preview_query = sql_text("""
+            SELECT texts.id AS text_id, first_lines.preview
+            FROM texts
+            CROSS JOIN LATERAL (
+                SELECT string_agg(content, E'\n' ORDER BY division_id, line_number) AS preview
+                FROM (
+                    SELECT text_lines.content, text_lines.division_id, text_lines.line_number
+                    FROM text_divisions
+                    JOIN text_lines ON text_lines.division_id = text_divisions.id
+                    WHERE text_divisions.text_id = texts.id
+                    ORDER BY text_divisions.id, text_lines.line_number
+                    LIMIT :line_count
+                ) AS lines
+            ) AS first_lines
+        """)
+        result = await self.session.execute(preview_query, {"line_count": line_count})
+        return {row.text_id: row.preview for row in result if row.preview is not None}
+
+    async def get_text_by_id(self, text_id: int, record_access: bool = True) -> Optional[TextResponse]:
+        """Get a specific text by ID with all divisions and lines (cached).
+        
+        Set record_access to False for reads that should not count towards
+        the hot texts replayed by the cache warmer (e.g. the warmer itself).
+        """
+        if record_access:
+            await self.redis.record_access("text", str(text_id))
+        
+        cache_key = await self._cache_key("text", str(text_id), text_id=text_id)
+        return await self._cached(
+            cache_key,
+            lambda service: service._build_text(text_id),
+            TextResponse.model_validate
+        )
+
+    async def _build_text(self, text_id: int) -> Optional[TextResponse]:
+        """Build a text with all divisions and lines from the database."""
         query = (
             select(Text)
             .options(
@@ -161,71 +260,290 @@ class TextService:
             divisions=divisions
         )
         
-        # Cache the text data
-        await self.redis.set(
-            cache_key,
-            response.model_dump(),
-            ttl=settings.redis.TEXT_CACHE_TTL
-        )
-        
         return response
 
-    async def get_all_texts(self) -> List[TextResponse]:
-        """Get all texts with full content (cached)."""
-        cache_key = await self._cache_key("text", "all")
+    async def get_line_range(
+        self,
+        text_id: int,
+        start_division_id: int,
+        end_division_id: Optional[int] = None,
+        start_line: Optional[int] = None,
+        end_line: Optional[int] = None,
+        include_tokens: bool = False,
+        limit: int = 100
+    ) -> TextLineRangeResponse:
+        """Get a range of lines within a text, in (division, line number) order.
         
-        # Try to get from cache
-        cached_data = await self.redis.get(cache_key)
-        if cached_data:
-            return [TextResponse.model_validate(text) for text in cached_data]
-            
-        query = (
-            select(Text)
-            .options(
-                selectinload(Text.author),
-                selectinload(Text.divisions).selectinload(TextDivision.lines)
+        The range runs from (start_division_id, start_line) to
+        (end_division_id, end_line) inclusive and is read as a single range
+        scan of the (division_id, line_number) index, so the cost depends on
+        the size of the page rather than the size of the work.
+        
+        Args:
+            text_id: ID of the text
+            start_division_id: First division of the range
+            end_division_id: Last division of the range (defaults to start_division_id)
+            start_line: First line number in the first division (defaults to its start)
+            end_line: Last line number in the last division (defaults to its end)
+            include_tokens: Whether to include spaCy token data
+            limit: Maximum number of lines to return
+        """
+        if end_division_id is None:
+            end_division_id = start_division_id
+        start = (start_division_id, start_line if start_line is not None else -1)
+        end = (end_division_id, end_line if end_line is not None else _MAX_LINE_NUMBER)
+        
+        rows = await self.raw_queries.fetch_line_range(
+            text_id, start, end, limit + 1, include_tokens=include_tokens
+        )
+        
+        # The extra row only tells where the next page starts
+        next_row = rows[limit] if len(rows) > limit else None
+        lines = [
+            TextLineRangeItem(
+                division_id=str(row["division_id"]),
+                line_number=row["line_number"],
+                content=row["content"],
+                categories=row["categories"],
+                is_title=row["is_title"],
+                spacy_tokens=row["spacy_tokens"] if include_tokens else None
             )
-            .order_by(Text.title)
+            for row in rows[:limit]
+        ]
+        
+        return TextLineRangeResponse(
+            text_id=str(text_id),
+            lines=lines,
+            next_division_id=str(next_row["division_id"]) if next_row else None,
+            next_line_number=next_row["line_number"] if next_row else None
         )
+
+    async def get_table_of_contents(self, text_id: int) -> Optional[TableOfContentsResponse]:
+        """Get a text's table of contents (cached).
         
-        result = await self.session.execute(query)
-        texts = result.unique().scalars().all()
+        Served from the texts.table_of_contents column written at ingestion,
+        or built from the divisions if the text predates it.
+        """
+        cache_key = await self._cache_key("text", f"toc:{text_id}", text_id=text_id)
+        cached = await self.redis.get(cache_key)
+        if cached:
+            return TableOfContentsResponse.model_validate(cached)
         
-        responses = []
-        for text in texts:
-            divisions = [
-                TextDivisionResponse(
-                    id=str(div.id),
-                    author_name=div.author_name,
-                    work_name=div.work_name,
-                    volume=div.volume,
-                    chapter=div.chapter,
-                    section=div.section,
-                    is_title=div.is_title,
-                    title_number=div.title_number,
-                    title_text=div.title_text,
-                    metadata=div.division_metadata,
-                    lines=[line.to_api_model() for line in sorted(div.lines, key=lambda x: x.line_number)]
-                )
-                for div in text.divisions
-            ]
+        result = await self.session.execute(
+            select(Text.table_of_contents).filter(Text.id == text_id)
+        )
+        stored = result.first()
+        if stored is None:
+            return None
+        
+        if stored.table_of_contents:
+            toc = TableOfContentsResponse.model_validate(stored.table_of_contents)
+        else:
+            toc = await self.build_table_of_contents(text_id)
+        
+        await self.redis.set(cache_key, toc.model_dump(), ttl=settings.redis.TEXT_CACHE_HARD_TTL)
+        return toc
 
-            response = TextResponse(
-                id=str(text.id),
-                title=text.title,
-                author=text.author.name if text.author else None,
-                work_name=text.title,
-                reference_code=text.reference_code,
-                metadata=text.text_metadata,
-                divisions=divisions
+    async def build_table_of_contents(self, text_id: int) -> TableOfContentsResponse:
+        """Build a text's table of contents from its divisions in one aggregate query.
+        
+        Levels follow the work's citation structure (without the line level).
+        Each node carries its line count and first/last line so that clients
+        can fetch its lines lazily through get_line_range.
+        """
+        result = await self.session.execute(
+            select(
+                TextDivision,
+                func.count(TextLine.id).label("line_count"),
+                func.min(TextLine.line_number).label("first_line"),
+                func.max(TextLine.line_number).label("last_line")
             )
-            responses.append(response)
+            .outerjoin(TextLine, TextLine.division_id == TextDivision.id)
+            .filter(TextDivision.text_id == text_id)
+            .group_by(TextDivision.id)
+            .order_by(TextDivision.id)
+        )
+        rows = result.all()
         
-        # Cache the results
-        await self.redis.set(
-            cache_key,
-            [response.model_dump() for response in responses],
-            ttl=settings.redis.TEXT_CACHE_TTL
+        structure: List[str] = []
+        levels: List[Tuple[str, str]] = []
+        if rows:
+            first = rows[0].TextDivision
+            structure = CitationParser.get_instance().get_work_structure(
+                first.author_id_field, first.work_number_field
+            )
+            for level in structure:
+                field = map_level_to_field(level, structure)
+                if field == "line":
+                    continue
+                field = field if field in DIVISION_LEVEL_FIELDS else "chapter"
+                if field not in (f for _, f in levels):
+                    levels.append((level, field))
+        
+        roots: List[TableOfContentsNode] = []
+        index: Dict[Tuple[Tuple[str, str], ...], TableOfContentsNode] = {}
+        total = 0
+        for row in rows:
+            division = row.TextDivision
+            path: Tuple[Tuple[str, str], ...] = ()
+            siblings = roots
+            node = None
+            for level, field in levels:
+                value = getattr(division, field)
+                if value is None:
+                    continue
+                path += ((field, value),)
+                node = index.get(path)
+                if node is None:
+                    node = index[path] = TableOfContentsNode(level=level, value=value)
+                    siblings.append(node)
+                siblings = node.children
+            
+            if division.is_title and division.title_text and node and not node.title:
+                node.title = division.title_text
+            if not row.line_count:
+                continue
+            
+            # Add the division's lines to every node on its path
+            total += row.line_count
+            for depth in range(1, len(path) + 1):
+                ancestor = index[path[:depth]]
+                ancestor.line_count += row.line_count
+                if ancestor.start_division_id is None:
+                    ancestor.start_division_id = str(division.id)
+                    ancestor.start_line = row.first_line
+                ancestor.end_division_id = str(division.id)
+                ancestor.end_line = row.last_line
+        
+        return TableOfContentsResponse(
+            text_id=str(text_id),
+            structure=structure,
+            line_count=total,
+            nodes=roots
         )
+
+    async def get_all_texts(self) -> List[TextResponse]:
+        """Get all texts with full content (cached per text).
         
-        return responses
+        Prefer stream_all_texts for responses and iter_all_texts for
+        processing texts in turn; this materializes every text.
+        """
+        return [text async for text in self.iter_all_texts()]
+
+    async def iter_all_texts(self) -> AsyncIterator[TextResponse]:
+        """Yield all texts with full content one at a time (cached per text)."""
+        text_ids = (await self.session.execute(select(Text.id).order_by(Text.title))).scalars().all()
+        for text_id in text_ids:
+            chunk = await self._text_chunk(text_id)
+            if chunk:
+                yield TextResponse.model_validate_json(chunk)
+
+    async def stream_all_texts(self, include_tokens: bool = True) -> AsyncIterator[bytes]:
+        """Stream all texts with full content as a JSON array, one text at a time.
+        
+        Runs in its own session: the request session is closed before a
+        streaming response body is sent. Each text is served from its own
+        cache chunk, or built with a server-side cursor and then cached, so
+        at most one text is held in memory at a time.
+        
+        Args:
+            include_tokens: Whether to include spaCy token data in the lines
+        """
+        async with async_session_maker() as session:
+            service = TextService(session)
+            text_ids = (await session.execute(select(Text.id).order_by(Text.title))).scalars().all()
+            
+            yield b"["
+            separator = b""
+            for text_id in text_ids:
+                chunk = await service._text_chunk(text_id, include_tokens=include_tokens)
+                if chunk:
+                    yield separator + chunk
+                    separator = b","
+            yield b"]"
+
+    async def render_text(self, text_id: int) -> Optional[bytes]:
+        """Serialize a text with full content, bypassing the cache (used for static exports)."""
+        return await self._build_text_chunk(text_id)
+
+    async def _text_chunk(self, text_id: int, include_tokens: bool = True) -> Optional[bytes]:
+        """Get a text with full content as serialized JSON (cached per text)."""
+        identifier = f"chunk:{text_id}" if include_tokens else f"chunk:{text_id}:notokens"
+        cache_key = await self._cache_key("text", identifier, text_id=text_id)
+        chunk = await self.redis.get_bytes(cache_key)
+        if chunk:
+            return chunk
+        
+        chunk = await self._build_text_chunk(text_id, include_tokens=include_tokens)
+        if chunk:
+            await self.redis.set_bytes(cache_key, chunk, ttl=settings.redis.TEXT_CACHE_HARD_TTL)
+        return chunk
+
+    async def _build_text_chunk(self, text_id: int, include_tokens: bool = True) -> Optional[bytes]:
+        """Serialize a text with full content, reading its lines through a server-side cursor."""
+        result = await self.session.execute(
+            select(Text).options(selectinload(Text.author)).filter(Text.id == text_id)
+        )
+        text = result.scalar_one_or_none()
+        if not text:
+            return None
+        
+        result = await self.session.execute(
+            select(TextDivision)
+            .filter(TextDivision.text_id == text_id)
+            .order_by(TextDivision.id)
+        )
+        divisions = result.scalars().all()
+        
+        # Serialize lines as they arrive instead of loading ORM objects for all of them
+        lines: Dict[int, List[str]] = {div.id: [] for div in divisions}
+        columns = [
+            TextLine.division_id,
+            TextLine.line_number,
+            TextLine.content,
+            TextLine.categories,
+            TextLine.is_title
+        ]
+        if include_tokens:
+            columns.append(TextLine.spacy_tokens)
+        stream = await self.session.stream(
+            select(*columns)
+            .join(TextDivision, TextDivision.id == TextLine.division_id)
+            .filter(TextDivision.text_id == text_id)
+            .order_by(TextLine.division_id, TextLine.line_number)
+            .execution_options(yield_per=_LINE_BATCH_SIZE)
+        )
+        async for row in stream:
+            lines[row.division_id].append(TextLineAPI(
+                line_number=row.line_number,
+                content=row.content,
+                categories=row.categories,
+                is_title=row.is_title,
+                spacy_tokens=row.spacy_tokens if include_tokens else None
+            ).model_dump_json())
+        
+        division_chunks = []
+        for div in divisions:
+            head = TextDivisionResponse(
+                id=str(div.id),
+                author_name=div.author_name,
+                work_name=div.work_name,
+                volume=div.volume,
+                chapter=div.chapter,
+                section=div.section,
+                is_title=div.is_title,
+                title_number=div.title_number,
+                title_text=div.title_text,
+                metadata=div.division_metadata
+            ).model_dump_json(exclude={"lines"})
+            division_chunks.append(f'{head[:-1]},"lines":[{",".join(lines.pop(div.id))}]}}')
+        
+        head = TextResponse(
+            id=str(text.id),
+            title=text.title,
+            author=text.author.name if text.author else None,
+            work_name=text.title,
+            reference_code=text.reference_code,
+            metadata=text.text_metadata
+        ).model_dump_json(exclude={"divisions"})
+        return f'{head[:-1]},"divisions":[{",".join(division_chunks)}]}}'.encode('utf-8')
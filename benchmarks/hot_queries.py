@@ -0,0 +1,83 @@
+"""
+Benchmark hot read queries: SQLAlchemy text() + mappings() against raw asyncpg.
+
+Runs each query through RawQueryRepository with the raw path disabled
+(the previous session.execute path) and enabled, on the database from
+DATABASE_URL, and reports wall time per query including citation
+formatting for the search queries.
+
+Usage:
+    python -m benchmarks.hot_queries --lemma σῶμα --text-id 1 --repeat 20
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Awaitable, Callable, List
+
+from sqlalchemy import select
+
+from app.core.database import async_session_maker, engine
+from app.core.raw_queries import RawQueryRepository
+from app.models.text_division import TextDivision
+from app.services.citation_service import CitationService
+
+async def measure(name: str, run: Callable[[RawQueryRepository], Awaitable[int]], repeat: int) -> None:
+    """Print per-query timings of one query on both paths."""
+    for raw in (False, True):
+        timings: List[float] = []
+        async with async_session_maker() as session:
+            repository = RawQueryRepository(session)
+            repository.enabled = raw
+            rows = await run(repository)  # warm up connection and statement cache
+            for _ in range(repeat):
+                start = time.perf_counter()
+                await run(repository)
+                timings.append((time.perf_counter() - start) * 1000)
+        path = "asyncpg" if raw else "sqlalchemy"
+        print(
+            f"{name:<24} {path:<11} {rows:>7} rows "
+            f"{statistics.mean(timings):>9.2f} ms mean {statistics.median(timings):>9.2f} ms p50"
+        )
+
+async def main(args: argparse.Namespace) -> None:
+    async with async_session_maker() as session:
+        division_ids = (await session.execute(
+            select(TextDivision.id)
+            .filter(TextDivision.text_id == args.text_id)
+            .order_by(TextDivision.id)
+        )).scalars().all()
+    if not division_ids:
+        raise SystemExit(f"Text {args.text_id} has no divisions")
+
+    async def citations(repository: RawQueryRepository, query_name: str, params: dict) -> int:
+        rows = await repository.fetch_citations(query_name, params)
+        CitationService(repository.session)._format_citations(rows)
+        return len(rows)
+
+    async def line_range(repository: RawQueryRepository) -> int:
+        rows = await repository.fetch_line_range(
+            args.text_id, (division_ids[0], -1), (division_ids[-1], 2**31 - 1), args.limit + 1,
+            include_tokens=True
+        )
+        return len(rows)
+
+    async def lexical(repository: RawQueryRepository) -> int:
+        return 1 if await repository.fetch_lexical_value(args.lemma) else 0
+
+    print(f"{args.repeat} runs per path")
+    await measure("lemma citations", lambda r: citations(r, "lemma", {"pattern": args.lemma}), args.repeat)
+    await measure("text citations", lambda r: citations(r, "text", {"pattern": f"%{args.word}%"}), args.repeat)
+    await measure("line range", line_range, args.repeat)
+    await measure("lexical value", lexical, args.repeat)
+    await engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark hot read queries")
+    parser.add_argument("--lemma", default="σῶμα", help="Lemma for the lemma and lexical queries")
+    parser.add_argument("--word", default="σῶμα", help="Word for the text search query")
+    parser.add_argument("--text-id", type=int, default=1, help="Text for the line range query")
+    parser.add_argument("--limit", type=int, default=100, help="Lines per line range page")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per path")
+    asyncio.run(main(parser.parse_args()))
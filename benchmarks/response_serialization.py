@@ -0,0 +1,101 @@
+"""
+Benchmark response serialization for search results.
+
+Compares bytes on the wire and serialization CPU per request for:
+- the previous default (jsonable_encoder + JSONResponse)
+- ORJSONResponse (the routers' default response class)
+- sparse fieldsets (include_tokens=false, fields=...)
+each uncompressed and gzip-compressed at the configured level.
+
+Usage:
+    python -m benchmarks.response_serialization --results 100 --repeat 50
+"""
+
+import argparse
+import gzip
+import time
+from typing import Callable, List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from app.core.config import settings
+from app.core.responses import render_search
+from app.models.citations import (
+    Citation, CitationContext, CitationLocation, CitationSource, SearchResponse, SentenceContext
+)
+
+def _tokens(text: str) -> List[dict]:
+    """Build spaCy-like token data for a sentence."""
+    return [
+        {
+            "text": word,
+            "lemma": word.lower(),
+            "pos": "NOUN",
+            "tag": "n-s---mn-",
+            "dep": "nsubj",
+            "morph": "Case=Nom|Gender=Masc|Number=Sing",
+            "category": "Body Part" if i % 3 == 0 else ""
+        }
+        for i, word in enumerate(text.split())
+    ]
+
+def build_search_response(count: int) -> SearchResponse:
+    """Build a search response with synthetic citations."""
+    sentence = "ὁ δὲ πνεύμων ἐκ τῆς καρδίας τὸ αἷμα λαμβάνει καὶ διὰ τῶν ἀρτηριῶν πέμπει"
+    results = [
+        Citation(
+            sentence=SentenceContext(
+                id=str(i),
+                text=sentence,
+                prev_sentence=sentence,
+                next_sentence=sentence,
+                tokens=_tokens(sentence)
+            ),
+            citation=f"Gal. San. {i // 40 + 1}.{i % 40 + 1}",
+            context=CitationContext(line_id=str(i), line_text=sentence, line_numbers=[i % 40 + 1]),
+            location=CitationLocation(volume="6", chapter=str(i // 40 + 1), section=None, line=str(i % 40 + 1)),
+            source=CitationSource(author="Galenus Med.", work="De sanitate tuenda", author_id="0057", work_id="077")
+        )
+        for i in range(count)
+    ]
+    return SearchResponse(results=results, results_id="benchmark", total_results=count)
+
+def measure(name: str, render: Callable[[], bytes], repeat: int) -> None:
+    """Print CPU per request and body sizes for one rendering strategy."""
+    start = time.process_time()
+    for _ in range(repeat):
+        body = render()
+    cpu_ms = (time.process_time() - start) * 1000 / repeat
+
+    start = time.process_time()
+    for _ in range(repeat):
+        compressed = gzip.compress(body, compresslevel=settings.GZIP_COMPRESS_LEVEL)
+    gzip_ms = (time.process_time() - start) * 1000 / repeat
+
+    print(
+        f"{name:<28} {cpu_ms:>9.2f} ms {len(body):>12,} B "
+        f"{gzip_ms:>9.2f} ms {len(compressed):>12,} B"
+    )
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark search response serialization")
+    parser.add_argument("--results", type=int, default=100, help="Citations per response")
+    parser.add_argument("--repeat", type=int, default=50, help="Renders per strategy")
+    args = parser.parse_args()
+
+    result = build_search_response(args.results)
+    print(f"{args.results} citations, {args.repeat} renders per strategy")
+    print(f"{'strategy':<28} {'serialize':>12} {'bytes':>14} {'gzip':>12} {'gzip bytes':>14}")
+
+    measure("jsonable_encoder + json", lambda: JSONResponse(jsonable_encoder(result)).body, args.repeat)
+    measure("orjson", lambda: ORJSONResponse(result.model_dump(mode="json")).body, args.repeat)
+    measure("orjson, include_tokens=false", lambda: render_search(result, include_tokens=False).body, args.repeat)
+    measure(
+        "orjson, fields=citation,...",
+        lambda: render_search(result, fields="citation,sentence.text,source").body,
+        args.repeat
+    )
+
+if __name__ == "__main__":
+    main()
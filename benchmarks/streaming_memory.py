@@ -0,0 +1,164 @@
+"""
+Benchmark peak memory of full-corpus read paths on an enlarged corpus.
+
+Copies one text of the database from DATABASE_URL (its divisions and
+lines) the given numbers of times, then runs each path in a fresh
+process and reports its peak RSS. With streamed reads the peak should
+stay flat as the corpus grows. The copies are deleted afterwards, and
+update_line_numbers runs in a transaction that is rolled back.
+
+Usage:
+    python -m benchmarks.streaming_memory --text-id 1 --copies 0 10 50
+"""
+
+import argparse
+import asyncio
+import resource
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+from sqlalchemy import delete, func, insert, literal, select
+
+from app.core.database import async_session_maker, engine
+from app.models.text import Text
+from app.models.text_division import TextDivision
+from app.models.text_line import TextLine
+
+BENCH_PREFIX = "[streaming benchmark]"
+
+async def run_work_ids(session) -> int:
+    # Same query as CorpusDB.get_work_ids, without the parser setup of CorpusDB
+    return len((await session.execute(select(Text.id).order_by(Text.id))).scalars().all())
+
+async def run_all_texts(session) -> int:
+    from app.services.text_service import TextService
+    count = 0
+    async for _ in TextService(session).iter_all_texts():
+        count += 1
+    return count
+
+async def run_verify(session) -> int:
+    from toolkit.migration.content_validator import DataVerifier
+    verifier = DataVerifier(session)
+    warnings = await verifier.verify_relationships()
+    warnings += await verifier.verify_line_continuity()
+    warnings += await verifier.verify_text_completeness()
+    return len(warnings)
+
+async def run_line_numbers(session) -> int:
+    from toolkit.migration.update_line_numbers import update_line_numbers
+    async with session.begin():
+        await update_line_numbers(session)
+        await session.rollback()
+    return 0
+
+PATHS = {
+    "work_ids": run_work_ids,
+    "all_texts": run_all_texts,
+    "verify": run_verify,
+    "line_numbers": run_line_numbers,
+}
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB (ru_maxrss is in KB on Linux)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+async def run_child(path: str) -> None:
+    """Run one path and print its result count, wall time and peak RSS."""
+    async with async_session_maker() as session:
+        start = time.perf_counter()
+        count = await PATHS[path](session)
+        elapsed = time.perf_counter() - start
+    await engine.dispose()
+    print(f"{count} {elapsed:.2f} {peak_rss_mb():.1f}")
+
+async def enlarge(text_id: int, copies: int) -> None:
+    """Add copies of a text with all its divisions and lines."""
+    division_columns = [
+        c.name for c in TextDivision.__table__.columns if c.name not in ("id", "text_id")
+    ]
+    line_columns = [
+        c.name for c in TextLine.__table__.columns if c.name not in ("id", "division_id")
+    ]
+    async with async_session_maker() as session:
+        template = await session.get(Text, text_id)
+        if not template:
+            raise SystemExit(f"Text {text_id} not found")
+        division_ids = (await session.execute(
+            select(TextDivision.id).filter(TextDivision.text_id == text_id).order_by(TextDivision.id)
+        )).scalars().all()
+
+        for n in range(copies):
+            copy_id = (await session.execute(
+                insert(Text).values(
+                    author_id=template.author_id,
+                    reference_code=template.reference_code,
+                    title=f"{BENCH_PREFIX} {template.title} {n}",
+                    text_metadata=template.text_metadata
+                ).returning(Text.id)
+            )).scalar_one()
+            for division_id in division_ids:
+                source = TextDivision.__table__
+                new_division_id = (await session.execute(
+                    insert(source).from_select(
+                        ["text_id", *division_columns],
+                        select(literal(copy_id), *[source.c[name] for name in division_columns])
+                        .where(source.c.id == division_id)
+                    ).returning(source.c.id)
+                )).scalar_one()
+                lines = TextLine.__table__
+                await session.execute(
+                    insert(lines).from_select(
+                        ["division_id", *line_columns],
+                        select(literal(new_division_id), *[lines.c[name] for name in line_columns])
+                        .where(lines.c.division_id == division_id)
+                    )
+                )
+        await session.commit()
+
+async def clean_up() -> None:
+    """Delete the copies (divisions and lines cascade) and invalidate cached texts."""
+    from app.services.corpus_service import CorpusService
+    async with async_session_maker() as session:
+        await session.execute(delete(Text).where(Text.title.startswith(BENCH_PREFIX)))
+        await session.commit()
+        await CorpusService(session).invalidate_text_cache()
+
+async def corpus_size() -> int:
+    async with async_session_maker() as session:
+        return await session.scalar(select(func.count(TextLine.id)))
+
+def measure(path: str) -> List[str]:
+    """Run a path in a fresh interpreter so peak RSS covers only that path."""
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.streaming_memory", "--child", path],
+        check=True, capture_output=True, text=True
+    ).stdout.split()
+    return output[-3:]
+
+async def main(args: argparse.Namespace) -> None:
+    added = 0
+    results: Dict[int, Dict[str, List[str]]] = {}
+    try:
+        for copies in sorted(args.copies):
+            await enlarge(args.text_id, copies - added)
+            added = copies
+            lines = await corpus_size()
+            results[lines] = {path: measure(path) for path in args.paths}
+            for path, (count, elapsed, rss) in results[lines].items():
+                print(f"{lines:>10} lines {path:<13} {count:>7} items {elapsed:>8} s {rss:>9} MB peak RSS")
+    finally:
+        await clean_up()
+        await engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark peak memory of full-corpus reads")
+    parser.add_argument("--text-id", type=int, default=1, help="Text to copy to enlarge the corpus")
+    parser.add_argument("--copies", type=int, nargs="+", default=[0, 10, 50], help="Total copies per run")
+    parser.add_argument("--paths", nargs="+", choices=sorted(PATHS), default=sorted(PATHS))
+    parser.add_argument("--child", choices=sorted(PATHS), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    asyncio.run(run_child(args.child) if args.child else main(args))
@@ -42,4 +42,5 @@ export interface Text {
   reference_code?: string;
   metadata?: Record<string, any>;
   divisions?: TextDivision[];
+  preview?: string;
 }
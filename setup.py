@@ -31,6 +31,7 @@ setup(
         "fastapi==0.111.1",
         "uvicorn==0.22.0",
         "sse-starlette==2.1.3",
+        "orjson==3.8.3",
         "SQLAlchemy==2.0.36",
         "alembic==1.13.3",
         "asyncpg==0.30.0",
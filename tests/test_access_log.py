@@ -0,0 +1,76 @@
+"""
+Unit tests for the buffered access log behind cache warming.
+Tests batching of access counts, trimming and expiry of the logs.
+"""
+
+from collections import Counter, defaultdict
+
+import pytest
+
+from app.core.config import settings
+from app.core.redis import redis_client, CircuitBreaker
+
+class RecordingPipeline:
+    """Pipeline stand-in that records queued commands."""
+
+    def __init__(self, server):
+        self.server = server
+        self.commands = []
+
+    def __getattr__(self, name):
+        return lambda *args: self.commands.append((name, *args))
+
+    async def execute(self):
+        self.server.executed.append(self.commands)
+        return [True] * len(self.commands)
+
+class RecordingRedis:
+    """Redis stand-in that only supports pipelines."""
+
+    def __init__(self):
+        self.executed = []
+
+    def pipeline(self, transaction=True):
+        return RecordingPipeline(self)
+
+@pytest.fixture
+def recording_redis(monkeypatch):
+    """Patch the Redis singleton with a recording server and an empty buffer."""
+    fake = RecordingRedis()
+    monkeypatch.setattr(redis_client, "_redis", fake)
+    monkeypatch.setattr(redis_client, "breaker", CircuitBreaker(2, reset_timeout=60))
+    monkeypatch.setattr(redis_client, "_access_counts", defaultdict(Counter))
+    monkeypatch.setattr(settings.redis, "ACCESS_LOG_FLUSH_INTERVAL", 3600)
+    monkeypatch.setattr(settings.redis, "ACCESS_LOG_MAX_ENTRIES", 100)
+    return fake
+
+@pytest.mark.asyncio
+async def test_accesses_are_buffered_and_flushed_in_one_pipeline(recording_redis) -> None:
+    """Test that reads do not touch Redis until the buffer is flushed."""
+    for member in ["7", "7", "9"]:
+        await redis_client.record_access("text", member)
+    await redis_client.record_access("lemma", "φλέψ")
+    assert recording_redis.executed == []
+
+    await redis_client.flush_access_log()
+
+    assert len(recording_redis.executed) == 1
+    commands = recording_redis.executed[0]
+    assert ("zincrby", "access:text", 2, "7") in commands
+    assert ("zincrby", "access:lemma", 1, "φλέψ") in commands
+    assert ("zremrangebyrank", "access:text", 0, -101) in commands
+    assert ("expire", "access:lemma", settings.redis.ACCESS_LOG_TTL) in commands
+
+    await redis_client.flush_access_log()
+    assert len(recording_redis.executed) == 1
+
+@pytest.mark.asyncio
+async def test_full_buffer_is_flushed(recording_redis, monkeypatch) -> None:
+    """Test that the buffer is flushed once it holds ACCESS_LOG_MAX_ENTRIES members."""
+    monkeypatch.setattr(settings.redis, "ACCESS_LOG_MAX_ENTRIES", 2)
+
+    await redis_client.record_access("lemma", "a")
+    await redis_client.record_access("lemma", "b")
+
+    assert len(recording_redis.executed) == 1
+    assert not redis_client._access_counts
@@ -0,0 +1,77 @@
+"""
+Unit tests for corpus-versioned cache keys.
+Tests key stamping and O(1) invalidation via version counters.
+"""
+
+import pytest
+from typing import Dict
+
+from app.core import cache_keys
+from app.core.config import settings
+from app.core.redis import redis_client
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the redis.asyncio client."""
+
+    def __init__(self):
+        self.store: Dict[str, bytes] = {}
+        self.round_trips = 0
+
+    async def get(self, key):
+        self.round_trips += 1
+        return self.store.get(key)
+
+    async def mget(self, keys):
+        self.round_trips += 1
+        return [self.store.get(key) for key in keys]
+
+    async def incr(self, key):
+        value = int(self.store.get(key, b"0")) + 1
+        self.store[key] = str(value).encode("utf-8")
+        return value
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """Patch the Redis singleton with an in-memory store."""
+    fake = FakeRedis()
+    monkeypatch.setattr(redis_client, "_redis", fake)
+    return fake
+
+@pytest.mark.asyncio
+async def test_corpus_key_embeds_generation(fake_redis) -> None:
+    """Test that bumping the generation changes every corpus key."""
+    prefix = settings.redis.TEXT_CACHE_PREFIX
+
+    before = await cache_keys.corpus_key(prefix, "list")
+    assert before == f"{prefix}g0:list"
+
+    await cache_keys.bump_corpus_generation()
+    after = await cache_keys.corpus_key(prefix, "list")
+    assert after == f"{prefix}g1:list"
+
+@pytest.mark.asyncio
+async def test_text_version_only_affects_that_text(fake_redis) -> None:
+    """Test that per-text invalidation leaves other texts' keys intact."""
+    prefix = settings.redis.TEXT_CACHE_PREFIX
+
+    text_1 = await cache_keys.corpus_key(prefix, "1", text_id=1)
+    text_2 = await cache_keys.corpus_key(prefix, "2", text_id=2)
+
+    await cache_keys.bump_text_version(1)
+
+    assert await cache_keys.corpus_key(prefix, "1", text_id=1) != text_1
+    assert await cache_keys.corpus_key(prefix, "2", text_id=2) == text_2
+
+@pytest.mark.asyncio
+async def test_versions_are_read_in_one_round_trip(fake_redis, monkeypatch) -> None:
+    """Test that a text key and a memoized lookup each read both counters in one MGET."""
+    monkeypatch.setattr(cache_keys, "_version_memo", {})
+    await cache_keys.bump_text_version(3)
+    fake_redis.round_trips = 0
+
+    assert await cache_keys.corpus_key("text:", "3", text_id=3) == "text:g0:3:v1"
+    assert fake_redis.round_trips == 1
+
+    assert await cache_keys.memoized_corpus_versions(3) == (0, 1)
+    assert await cache_keys.memoized_corpus_versions(3) == (0, 1)
+    assert fake_redis.round_trips == 2
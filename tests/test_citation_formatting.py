@@ -0,0 +1,50 @@
+"""
+Unit tests for citation formatting.
+Tests that the unvalidated fast path matches validated construction.
+"""
+
+import json
+
+from app.models.citations import Citation
+from app.services.citation_service import CitationService, _CITATION_PAGE
+
+ROW = {
+    "sentence_id": 12,
+    "sentence_text": "τὸ σῶμα",
+    "prev_sentence": None,
+    "next_sentence": "ἡ καρδία",
+    "sentence_tokens": {"tokens": [{"text": "σῶμα", "lemma": "σῶμα"}]},
+    "line_text": "τὸ σῶμα ἡ καρδία",
+    "line_numbers": [3, 4],
+    "text_id": 7,
+    "author_name": "Galenus Med.",
+    "work_name": "De sanitate tuenda",
+    "author_id_field": "0057",
+    "work_number_field": "077",
+    "volume": "6",
+    "chapter": "1",
+    "section": None
+}
+
+def test_trusted_citation_matches_validated() -> None:
+    """Test that trusted construction yields the same citation as validation."""
+    service = CitationService(session=None)
+
+    trusted = service._format_citation(ROW)
+    validated = service._format_citation(ROW, validate=True)
+
+    assert trusted.model_dump() == validated.model_dump()
+    assert trusted.sentence.id == "12"
+    assert trusted.location.line == "3-4"
+    assert trusted.context.line_id == "7-3"
+
+def test_batch_skips_bad_rows_and_round_trips() -> None:
+    """Test batch formatting and rebuilding citations from stored pages."""
+    service = CitationService(session=None)
+
+    citations = service._format_citations([ROW, None, ROW])
+    assert len(citations) == 2
+
+    stored = json.loads(_CITATION_PAGE.dump_json(citations))
+    rebuilt = [Citation.from_trusted(data) for data in stored]
+    assert [c.model_dump() for c in rebuilt] == [c.model_dump() for c in citations]
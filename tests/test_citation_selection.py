@@ -0,0 +1,98 @@
+"""
+Unit tests for fitting lexical citations to a token budget.
+Tests duplicate removal, author/work stratification, ranking, truncation and the report.
+"""
+
+from app.models.citations import (
+    Citation, CitationContext, CitationLocation, CitationSource, SentenceContext
+)
+from app.services.llm.citation_selection import CitationSelector, normalize_sentence
+from app.services.llm.tokens import TokenEstimator
+
+def make_citation(sentence_id, text, author="Hippocrates", work="De morbis", categories=()):
+    """Build a citation whose tokens carry the given categories."""
+    tokens = [{"text": "φλέψ", "lemma": "φλέψ", "pos": "NOUN", "category": "Body Part"}]
+    tokens += [{"text": "x", "lemma": "x", "pos": "NOUN", "category": category} for category in categories]
+    return Citation(
+        sentence=SentenceContext(id=str(sentence_id), text=text, prev_sentence=None, next_sentence=None, tokens=tokens),
+        citation=f"{author}, {work}: {sentence_id}",
+        context=CitationContext(line_id=str(sentence_id), line_text=text, line_numbers=[1]),
+        location=CitationLocation(volume=None, chapter=None, section=None),
+        source=CitationSource(author=author, work=work)
+    )
+
+def selector(max_chars=600) -> CitationSelector:
+    return CitationSelector(max_chars=max_chars, estimator=TokenEstimator(factor=1.0))
+
+def test_normalize_ignores_accents_punctuation_and_case() -> None:
+    """Test that sentences differing only in accents and punctuation normalize alike."""
+    assert normalize_sentence("Ἡ φλὲψ, ἡ κοίλη.") == normalize_sentence("η φλεψ η κοιλη")
+
+def test_near_duplicates_are_dropped() -> None:
+    """Test that (near-)identical sentences keep their best-ranked copy only."""
+    text = "ἡ φλὲψ ἡ κοίλη διὰ τοῦ ἥπατος ἐς τὴν καρδίην καὶ ἐς τὸν πλεύμονα τείνει"
+    citations = [
+        make_citation(1, text),
+        make_citation(2, text + ".", categories=("Topography",)),
+        make_citation(3, text.replace("πλεύμονα", "πνεύμονα")),
+        make_citation(4, "ἄλλη φλὲψ ἐκ τοῦ σπληνὸς ἐς τὴν ἀριστερὴν χεῖρα"),
+    ]
+
+    selection = selector().select("φλέψ", citations, budget=10000)
+
+    assert [c.sentence.id for c in selection.selected] == ["2", "4"]
+    assert {d["sentence_id"] for d in selection.dropped} == {"1", "3"}
+    assert all(d["reason"] == "duplicate" for d in selection.dropped)
+    assert selection.dropped[0]["duplicate_of"] == citations[1].citation
+
+def test_budget_is_shared_across_works() -> None:
+    """Test that every work is represented before any work gets a second citation."""
+    citations = [
+        make_citation(i, f"φλὲψ {i} " + "λόγος " * 10, work="De morbis", categories=("Disease",) * (3 - i))
+        for i in range(3)
+    ] + [make_citation(10, "φλὲψ ἐν τῷ τραχήλῳ " + "ὕδωρ " * 10, work="De locis")]
+    lengths = {c.sentence.id: TokenEstimator(factor=1.0).estimate(f"{c.citation}: {c.sentence.text}") + 1 for c in citations}
+
+    selection = selector().select("φλέψ", citations, budget=lengths["0"] + lengths["10"])
+
+    assert [c.sentence.id for c in selection.selected] == ["0", "10"]
+    assert selection.tokens <= selection.budget
+    assert [(d["sentence_id"], d["reason"]) for d in selection.dropped] == [("1", "budget"), ("2", "budget")]
+
+def test_informative_citations_rank_first() -> None:
+    """Test that citations with more co-occurring categories win within a work."""
+    citations = [
+        make_citation(1, "φλὲψ μία", categories=()),
+        make_citation(2, "φλὲψ δύο", categories=("Topography", "Disease")),
+    ]
+    cost = TokenEstimator(factor=1.0).estimate(f"{citations[1].citation}: φλὲψ δύο") + 1
+
+    selection = selector().select("φλέψ", citations, budget=cost)
+
+    assert [c.sentence.id for c in selection.selected] == ["2"]
+
+def test_long_sentences_are_cut_around_the_lemma() -> None:
+    """Test that long sentences keep a window around the lemma and the report is complete."""
+    text = "ἀρχή " * 40 + "φλέψ" + " τέλος" * 40
+    selection = selector(max_chars=60).select("φλέψ", [make_citation(1, text)], budget=10000)
+
+    line = selection.lines[0]
+    assert "φλέψ" in line and line.endswith(" …") and ": … " in line
+    assert len(line) < len(text)
+    report = selection.report()
+    assert report["truncated"] == 1
+    assert report["selected"] == [{"sentence_id": "1", "citation": "Hippocrates, De morbis: 1"}]
+    assert report["dropped"] == []
+
+def test_chunks_keep_works_together() -> None:
+    """Test that chunks respect the token limit and only split works that do not fit."""
+    citations = [make_citation(i, f"φλὲψ {i}", work="De morbis") for i in range(4)]
+    citations += [make_citation(10 + i, f"φλὲψ ἐν τόπῳ {i}", work="De locis") for i in range(2)]
+    selection = selector().select("φλέψ", citations, budget=10000)
+    limit = sum(selection.costs[:3])
+
+    chunks = selection.chunks(max_tokens=limit)
+
+    # De morbis is split; De locis fits a chunk of its own, so it is not split across two
+    assert [[c.sentence.id for c in chunk.selected] for chunk in chunks] == [["0", "1", "2"], ["3"], ["10", "11"]]
+    assert all(chunk.tokens <= limit for chunk in chunks)
@@ -0,0 +1,53 @@
+"""
+Unit tests for the response compression middleware.
+Tests the size threshold and pass-through of event streams.
+"""
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from fastapi.testclient import TestClient
+
+from app.core.compression import CompressionMiddleware
+
+def create_client() -> TestClient:
+    """Create a test client for an app with the compression middleware."""
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+    @app.get("/large")
+    async def large():
+        return PlainTextResponse("x" * 1000)
+
+    @app.get("/small")
+    async def small():
+        return PlainTextResponse("x")
+
+    @app.get("/analyze/stream")
+    async def stream():
+        return PlainTextResponse("x" * 1000, media_type="text/event-stream")
+
+    return TestClient(app)
+
+def test_compresses_above_threshold() -> None:
+    """Test that only responses above the size threshold are compressed."""
+    client = create_client()
+
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+    assert response.headers.get("content-encoding") == "gzip"
+    assert response.text == "x" * 1000
+
+    response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+def test_skips_event_streams() -> None:
+    """Test that event streams are never compressed."""
+    client = create_client()
+
+    response = client.get("/analyze/stream", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+    response = client.get(
+        "/large",
+        headers={"Accept-Encoding": "gzip", "Accept": "text/event-stream"}
+    )
+    assert "content-encoding" not in response.headers
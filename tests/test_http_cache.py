@@ -0,0 +1,114 @@
+"""
+Unit tests for corpus HTTP caching helpers.
+Tests ETag construction and If-None-Match handling.
+"""
+
+import asyncio
+import pytest
+from typing import Dict
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.core import cache_keys
+from app.core.http_cache import corpus_etag, etag_matches, variant
+from app.core.redis import redis_client
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the redis.asyncio client."""
+
+    def __init__(self):
+        self.store: Dict[str, bytes] = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def mget(self, keys):
+        return [self.store.get(key) for key in keys]
+
+    async def incr(self, key):
+        value = int(self.store.get(key, b"0")) + 1
+        self.store[key] = str(value).encode("utf-8")
+        return value
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """Patch the Redis singleton with an in-memory store and clear the version memo."""
+    fake = FakeRedis()
+    monkeypatch.setattr(redis_client, "_redis", fake)
+    monkeypatch.setattr(cache_keys, "_version_memo", {})
+    return fake
+
+def make_request(if_none_match: str = None) -> Request:
+    """Build a bare GET request with an optional If-None-Match header."""
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+def test_etag_matches() -> None:
+    """Test If-None-Match parsing."""
+    etag = '"g1-list"'
+    assert etag_matches(make_request('"g1-list"'), etag)
+    assert etag_matches(make_request('"g0-list", W/"g1-list"'), etag)
+    assert etag_matches(make_request("*"), etag)
+    assert not etag_matches(make_request('"g0-list"'), etag)
+    assert not etag_matches(make_request(), etag)
+    assert etag_matches(make_request('"g1-list"'), 'W/"g1-list"')
+
+@pytest.mark.asyncio
+async def test_etags_are_weak_and_per_variant(fake_redis) -> None:
+    """Test that token-less variants get their own weak ETag."""
+    full = await corpus_etag(variant("text", True), text_id=7)
+    sparse = await corpus_etag(variant("text", False), text_id=7)
+
+    assert full.startswith('W/"') and sparse.startswith('W/"')
+    assert full != sparse
+    assert not etag_matches(make_request(full), sparse)
+
+@pytest.mark.asyncio
+async def test_etag_changes_on_invalidation(fake_redis) -> None:
+    """Test that bumping version counters changes the affected ETags."""
+    list_etag = await corpus_etag("list")
+    text_etag = await corpus_etag("text", text_id=7)
+
+    all_etag = await corpus_etag("all-content", all_texts=True)
+
+    await cache_keys.bump_text_version(7)
+    assert await corpus_etag("list") == list_etag
+    assert await corpus_etag("text", text_id=7) != text_etag
+    assert await corpus_etag("all-content", all_texts=True) != all_etag
+
+    await cache_keys.bump_corpus_generation()
+    assert await corpus_etag("list") != list_etag
+
+@pytest.mark.asyncio
+async def test_etag_versions_are_memoized(fake_redis) -> None:
+    """Test that conditional requests do not read Redis every time."""
+    etag = await corpus_etag("list")
+
+    # A bump from another worker is not seen until the memo expires
+    await fake_redis.incr("corpus:generation")
+    assert await corpus_etag("list") == etag
+
+def test_all_texts_etag_changes_when_a_text_is_invalidated(fake_redis) -> None:
+    """Test that /all?include_content=true revalidates after one text is invalidated."""
+    corpus = pytest.importorskip("app.api.corpus")
+    from app.dependencies import get_corpus_service
+
+    class FakeCorpusService:
+        def stream_all_texts(self, include_tokens=True):
+            async def chunks():
+                yield b"[]"
+            return chunks()
+
+    app = FastAPI()
+    app.include_router(corpus.router)
+    app.dependency_overrides[get_corpus_service] = FakeCorpusService
+    client = TestClient(app)
+
+    etag = client.get("/all", params={"include_content": "true"}).headers["etag"]
+    cached = client.get("/all", params={"include_content": "true"}, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+
+    asyncio.run(cache_keys.bump_text_version(7))
+    response = client.get("/all", params={"include_content": "true"}, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
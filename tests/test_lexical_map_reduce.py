@@ -0,0 +1,109 @@
+"""
+Unit tests for map-reduce lexical value generation.
+Tests bounded map concurrency, wall-clock time, the reduce prompt and failed chunks.
+"""
+
+import asyncio
+import json
+import time
+
+import pytest
+
+from app.core.config import settings
+from app.services.llm.base import BaseLLMClient, LLMResponse
+from app.services.llm.lexical_service import LexicalLLMService
+from tests.test_citation_selection import make_citation
+
+MAP_SECONDS = 0.1
+
+class FakeClient(BaseLLMClient):
+    """LLM client that answers map and reduce prompts after a delay."""
+    model_id = "test-model"
+
+    def __init__(self, fail_part=None):
+        self.fail_part = fail_part
+        self.active = self.peak = 0
+        self.prompts = []
+
+    async def generate(self, prompt, max_tokens=None, temperature=None, stream=False, **kwargs):
+        self.prompts.append(prompt)
+        if "Required JSON Format" in prompt:  # single or reduce prompt
+            return LLMResponse(text=json.dumps({
+                "lemma": "φλέψ", "translation": "vein", "short_description": "short",
+                "long_description": "long", "related_terms": ["αἷμα"], "citations_used": []
+            }), usage={}, model=self.model_id)
+
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(MAP_SECONDS)
+        self.active -= 1
+        if self.fail_part and f"(part {self.fail_part} of" in prompt:
+            raise RuntimeError("provider error")
+        return LLMResponse(text='{"notes": "notes"}', usage={}, model=self.model_id)
+
+    async def stream_generate(self, prompt, max_tokens=None, temperature=None, **kwargs):
+        yield "answer"
+
+    async def count_tokens(self, text):
+        return len(text.split())
+
+def make_service(client: FakeClient) -> LexicalLLMService:
+    service = LexicalLLMService.__new__(LexicalLLMService)
+    service.client = client
+    return service
+
+def make_citations(works: int):
+    """One citation per work, each long enough to fill a chunk on its own."""
+    return [
+        make_citation(i, f"φλὲψ {i} " + f"λόγος{i} " * 100, work=f"Opus {i}")
+        for i in range(works)
+    ]
+
+@pytest.fixture
+def map_settings(monkeypatch):
+    monkeypatch.setattr(settings.llm, "MAP_CHUNK_TOKENS", 600)
+    monkeypatch.setattr(settings.llm, "MAP_MAX_CHUNKS", 16)
+    monkeypatch.setattr(settings.llm, "MAP_CONCURRENCY", 3)
+    monkeypatch.setattr(settings.llm, "CITATION_MAX_CHARS", 100000)
+
+@pytest.mark.asyncio
+async def test_map_steps_run_with_bounded_concurrency(map_settings) -> None:
+    """Test that chunks are analyzed at most MAP_CONCURRENCY at a time, in parallel."""
+    client = FakeClient()
+    service = make_service(client)
+
+    started = time.perf_counter()
+    result = await service.create_lexical_value("φλέψ", make_citations(6), mode="map_reduce")
+    elapsed = time.perf_counter() - started
+
+    assert client.peak == 3
+    # 6 chunks / 3 at a time = 2 rounds, far less than 6 sequential calls
+    assert 2 * MAP_SECONDS <= elapsed < 4 * MAP_SECONDS
+    assert result["translation"] == "vein"
+    assert result["citation_selection"]["mode"] == "map_reduce"
+    assert result["citation_selection"]["chunks"] == 6
+    assert len(result["citation_selection"]["selected"]) == 6
+    reduce_prompt = client.prompts[-1]
+    assert "Part 1 (Hippocrates, Opus 0)" in reduce_prompt and "Part 6 (Hippocrates, Opus 5)" in reduce_prompt
+
+@pytest.mark.asyncio
+async def test_failed_chunks_are_reported_as_dropped(map_settings) -> None:
+    """Test that a failed chunk leaves the others and reports its citations."""
+    client = FakeClient(fail_part=2)
+    result = await make_service(client).create_lexical_value("φλέψ", make_citations(3), mode="map_reduce")
+
+    report = result["citation_selection"]
+    assert [entry["sentence_id"] for entry in report["selected"]] == ["0", "2"]
+    assert [(d["sentence_id"], d["reason"]) for d in report["dropped"]] == [("1", "map_failed")]
+    assert "Part 2" not in client.prompts[-1]
+
+@pytest.mark.asyncio
+async def test_auto_mode_uses_single_prompt_when_citations_fit(map_settings) -> None:
+    """Test that auto mode sends one prompt when all citations fit the budget."""
+    client = FakeClient()
+    result = await make_service(client).create_lexical_value(
+        "φλέψ", [make_citation(1, "φλὲψ ἡ κοίλη")], mode="auto"
+    )
+
+    assert len(client.prompts) == 1
+    assert result["citation_selection"]["mode"] == "single"
@@ -0,0 +1,86 @@
+"""
+Unit tests for the LLM response cache.
+Tests request hashing, the disk backend and the caching client wrapper.
+"""
+
+import os
+import time
+
+import pytest
+
+from app.services.llm.base import BaseLLMClient, LLMResponse
+from app.services.llm.cache import CachedLLMClient, DiskResponseCache, response_cache_key
+
+class CountingClient(BaseLLMClient):
+    """LLM client that counts generate calls."""
+    model_id = "test-model"
+
+    def __init__(self):
+        self.calls = 0
+
+    async def generate(self, prompt, max_tokens=None, temperature=None, stream=False, **kwargs):
+        self.calls += 1
+        return LLMResponse(text=f"answer {self.calls}", usage={"prompt_tokens": 3}, model=self.model_id)
+
+    async def stream_generate(self, prompt, max_tokens=None, temperature=None, **kwargs):
+        yield "answer"
+
+    async def count_tokens(self, text):
+        return len(text.split())
+
+def test_cache_key_resolves_defaults() -> None:
+    """Test that explicit defaults share a key and sampling parameters change it."""
+    from app.core.config import settings
+
+    key = response_cache_key("m", "prompt")
+    assert key == response_cache_key("m", "prompt", settings.llm.MAX_TOKENS, settings.llm.TEMPERATURE)
+    assert key != response_cache_key("m", "prompt", top_p=0.5)
+    assert key != response_cache_key("other", "prompt")
+
+@pytest.mark.asyncio
+async def test_cached_client_reuses_response(tmp_path) -> None:
+    """Test that identical requests are served from the cache unless bypassed."""
+    client = CountingClient()
+    cached = CachedLLMClient(client, DiskResponseCache(tmp_path, ttl=60, max_entries=10))
+
+    first = await cached.generate("prompt", max_tokens=100)
+    second = await cached.generate("prompt", max_tokens=100)
+    assert client.calls == 1
+    assert (second.text, second.cached, first.cached) == ("answer 1", True, False)
+
+    await cached.generate("prompt", max_tokens=200)
+    fresh = await cached.generate("prompt", max_tokens=100, use_cache=False)
+    assert client.calls == 3
+    assert (await cached.generate("prompt", max_tokens=100)).text == fresh.text
+
+@pytest.mark.asyncio
+async def test_rejected_responses_are_not_cached(tmp_path) -> None:
+    """Test that responses failing cache_if are neither stored nor served."""
+    client = CountingClient()
+    cached = CachedLLMClient(client, DiskResponseCache(tmp_path, ttl=60, max_entries=10))
+
+    await cached.generate("prompt", cache_if=lambda response: False)
+    await cached.generate("prompt", cache_if=lambda response: False)
+    assert client.calls == 2
+
+    await cached.generate("prompt")
+    valid = lambda response: response.text != "answer 3"
+    assert (await cached.generate("prompt", cache_if=valid)).text == "answer 4"
+    assert (await cached.generate("prompt", cache_if=valid)).cached
+
+@pytest.mark.asyncio
+async def test_disk_cache_expires_and_evicts(tmp_path) -> None:
+    """Test that expired entries are ignored and the oldest entries are evicted."""
+    cache = DiskResponseCache(tmp_path, ttl=60, max_entries=2)
+    response = LLMResponse(text="a", usage={}, model="m")
+
+    for i, key in enumerate(["k1", "k2", "k3"]):
+        await cache.set(key, response)
+        os.utime(tmp_path / f"{key}.json", (time.time() - 10 + i, time.time() - 10 + i))
+
+    assert await cache.get("k1") is None
+    assert (await cache.get("k3")).text == "a"
+
+    cache.ttl = -1
+    await cache.set("k4", response)
+    assert await cache.get("k4") is None
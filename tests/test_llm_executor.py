@@ -0,0 +1,66 @@
+"""
+Unit tests for the LLM executor.
+Tests the concurrency cap, queue limit and per-call timeouts.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.services.llm.executor import LLMExecutor, LLMExecutorBusyError, LLMExecutorTimeoutError
+
+@pytest.mark.asyncio
+async def test_concurrency_is_capped() -> None:
+    """Test that no more than max_concurrency calls run at once."""
+    executor = LLMExecutor(max_concurrency=2, max_queue=10, timeout=5)
+    active, peak = 0, 0
+    lock = threading.Lock()
+
+    def call() -> None:
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+
+    await asyncio.gather(*(executor.run(call) for _ in range(6)))
+    assert peak == 2
+    assert (executor.running, executor.queued) == (0, 0)
+    executor.shutdown()
+
+@pytest.mark.asyncio
+async def test_full_queue_rejects_calls() -> None:
+    """Test that calls beyond the wait queue are rejected immediately."""
+    executor = LLMExecutor(max_concurrency=1, max_queue=1, timeout=5)
+    release = threading.Event()
+
+    running = asyncio.ensure_future(executor.run(release.wait))
+    waiting = asyncio.ensure_future(executor.run(lambda: "done"))
+    await asyncio.sleep(0.05)
+
+    with pytest.raises(LLMExecutorBusyError):
+        await executor.run(lambda: None)
+
+    release.set()
+    assert await waiting == "done"
+    assert await running is True
+    executor.shutdown()
+
+@pytest.mark.asyncio
+async def test_timed_out_call_keeps_its_slot() -> None:
+    """Test that a timed-out call holds its slot until its thread finishes."""
+    executor = LLMExecutor(max_concurrency=1, max_queue=1, timeout=5)
+    release = threading.Event()
+
+    with pytest.raises(LLMExecutorTimeoutError):
+        await executor.run(release.wait, timeout=0.05)
+    assert executor.running == 1
+
+    release.set()
+    assert await executor.run(lambda: 42) == 42
+    assert executor.running == 0
+    executor.shutdown()
@@ -0,0 +1,58 @@
+"""
+Unit tests for the thread-to-async stream bridge.
+Tests delivery order, error propagation, backpressure and stopping the reader.
+"""
+
+import threading
+
+import pytest
+
+from app.services.llm.streaming import llm_time_to_first_token, stream_from_thread
+
+@pytest.mark.asyncio
+async def test_deltas_arrive_in_order() -> None:
+    """Test that every delta is yielded in order and time to first token is recorded."""
+    def produce(emit):
+        for text in ["Ἡ ", "φύσις ", "ἰητρός"]:
+            emit(text)
+
+    before = llm_time_to_first_token.samples().get(("test",), {"count": 0})["count"]
+    chunks = [text async for text in stream_from_thread(produce, operation="test")]
+
+    assert chunks == ["Ἡ ", "φύσις ", "ἰητρός"]
+    assert llm_time_to_first_token.samples()[("test",)]["count"] == before + 1
+
+@pytest.mark.asyncio
+async def test_reader_errors_reach_consumer() -> None:
+    """Test that an exception in the reader is raised after the deltas before it."""
+    def produce(emit):
+        emit("partial")
+        raise ValueError("stream broke")
+
+    chunks = []
+    with pytest.raises(ValueError, match="stream broke"):
+        async for text in stream_from_thread(produce):
+            chunks.append(text)
+    assert chunks == ["partial"]
+
+@pytest.mark.asyncio
+async def test_closing_consumer_stops_reader() -> None:
+    """Test that a full buffer blocks the reader and closing the stream stops it."""
+    emitted, accepted = [], []
+    finished = threading.Event()
+
+    def produce(emit):
+        for i in range(100):
+            emitted.append(i)
+            if not emit(str(i)):
+                break
+            accepted.append(i)
+        finished.set()
+
+    stream = stream_from_thread(produce, max_buffer=2)
+    assert await stream.__anext__() == "0"
+    await stream.aclose()
+
+    assert finished.wait(timeout=5)
+    assert len(emitted) < 10
+    assert len(accepted) < len(emitted)
@@ -0,0 +1,104 @@
+"""
+Unit tests for the metrics registry and Redis cache instrumentation.
+"""
+
+import pytest
+
+from app.core.config import settings
+from app.core.metrics import MetricsRegistry
+from app.core.redis import redis_client, cache_requests, key_prefix
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the redis.asyncio client."""
+
+    def __init__(self):
+        self.store = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.store[key] = value
+
+    async def set(self, key, value):
+        self.store[key] = value
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    """Test Prometheus rendering of a labelled histogram."""
+    registry = MetricsRegistry()
+    histogram = registry.histogram("op_seconds", "Op latency", ("op",), buckets=(0.1, 1.0))
+    histogram.observe(0.05, op="get")
+    histogram.observe(0.5, op="get")
+    histogram.observe(5, op="get")
+
+    rendered = registry.render()
+    assert 'op_seconds_bucket{op="get",le="0.1"} 1' in rendered
+    assert 'op_seconds_bucket{op="get",le="1.0"} 2' in rendered
+    assert 'op_seconds_bucket{op="get",le="+Inf"} 3' in rendered
+    assert histogram.summary(op="get")["count"] == 3
+
+def test_key_prefix() -> None:
+    """Test prefix extraction from cache keys."""
+    assert key_prefix("text:g3:list") == "text:"
+    assert key_prefix(b"search_results:abc:meta") == "search_results:"
+    assert key_prefix("nocolon") == "other"
+
+@pytest.mark.asyncio
+async def test_redis_get_counts_hits_and_misses(monkeypatch) -> None:
+    """Test that RedisClient.get records hits and misses per prefix."""
+    monkeypatch.setattr(redis_client, "_redis", FakeRedis())
+    hits = cache_requests.value(prefix="metricstest:", result="hit")
+    misses = cache_requests.value(prefix="metricstest:", result="miss")
+
+    await redis_client.set("metricstest:a", {"value": 1}, ttl=60)
+    assert await redis_client.get("metricstest:a") == {"value": 1}
+    assert await redis_client.get("metricstest:missing") is None
+
+    assert cache_requests.value(prefix="metricstest:", result="hit") == hits + 1
+    assert cache_requests.value(prefix="metricstest:", result="miss") == misses + 1
+
+class SampledRedis(FakeRedis):
+    """FakeRedis with the SCAN / MEMORY USAGE calls used by the memory sampler."""
+
+    def __init__(self, keys):
+        super().__init__()
+        self.keys = keys
+        self.scanned_pages = 0
+
+    async def dbsize(self):
+        return len(self.keys)
+
+    async def scan(self, cursor, count=10):
+        self.scanned_pages += 1
+        page = self.keys[cursor:cursor + count]
+        next_cursor = cursor + count
+        return (next_cursor if next_cursor < len(self.keys) else 0), page
+
+    def pipeline(self, transaction=True):
+        sizes = []
+
+        class Pipeline:
+            def memory_usage(self, key):
+                sizes.append(100)
+
+            async def execute(self):
+                return sizes
+
+        return Pipeline()
+
+@pytest.mark.asyncio
+async def test_memory_sampler_scan_is_bounded(monkeypatch) -> None:
+    """Test that the sampler scans at most METRICS_SCAN_LIMIT keys and extrapolates."""
+    keys = [f"text:{i}".encode() for i in range(3000)] + [f"lemma:{i}".encode() for i in range(3000)]
+    keys = [key for pair in zip(keys[:3000], keys[3000:]) for key in pair]
+    fake = SampledRedis(keys)
+    monkeypatch.setattr(redis_client, "_redis", fake)
+    monkeypatch.setattr(settings.redis, "METRICS_SCAN_LIMIT", 2000)
+
+    report = await redis_client.sample_memory_usage(sample_size=5)
+
+    assert fake.scanned_pages == 2
+    assert report["text:"]["keys"] == 3000 and report["lemma:"]["keys"] == 3000
+    assert report["text:"]["sampled"] == 5
+    assert report["text:"]["estimated_bytes"] == 300000
+    assert settings.redis.METRICS_SAMPLE_KEY in fake.store
@@ -0,0 +1,21 @@
+"""
+Unit tests for the raw asyncpg query repository.
+Tests rewriting of named parameters into positional placeholders.
+"""
+
+from app.core.raw_queries import CITATION_QUERIES, to_positional
+
+def test_to_positional_numbers_parameters_once() -> None:
+    """Test that repeated parameters share a placeholder and casts are kept."""
+    sql, names = to_positional(
+        "SELECT * FROM t WHERE a = :a AND b @> ARRAY[:b]::VARCHAR[] AND c = :a LIMIT :limit"
+    )
+
+    assert sql == "SELECT * FROM t WHERE a = $1 AND b @> ARRAY[$2]::VARCHAR[] AND c = $1 LIMIT $3"
+    assert names == ["a", "b", "limit"]
+
+def test_citation_queries_are_rewritten() -> None:
+    """Test that every citation query takes exactly its search parameter."""
+    assert to_positional(CITATION_QUERIES["lemma"])[1] == ["pattern"]
+    assert to_positional(CITATION_QUERIES["text"])[1] == ["pattern"]
+    assert to_positional(CITATION_QUERIES["category"])[1] == ["category"]
@@ -0,0 +1,91 @@
+"""
+Unit tests for RedisClient degraded mode.
+Tests the circuit breaker and the local fallback store for result pages.
+"""
+
+import pytest
+
+from app.core.config import settings
+from app.core.redis import redis_client, cache_requests, CircuitBreaker, LocalFallbackCache
+
+class FailingRedis:
+    """Stand-in for a Redis server that times out on every command."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def _fail(self, *args, **kwargs):
+        self.calls += 1
+        raise TimeoutError("Timeout reading from socket")
+
+    get = mget = set = setex = delete = exists = _fail
+
+@pytest.fixture
+def failing_redis(monkeypatch):
+    """Patch the Redis singleton with a failing server and a fresh breaker."""
+    fake = FailingRedis()
+    monkeypatch.setattr(redis_client, "_redis", fake)
+    monkeypatch.setattr(redis_client, "breaker", CircuitBreaker(2, reset_timeout=60))
+    monkeypatch.setattr(redis_client, "fallback", LocalFallbackCache(max_entries=10))
+    return fake
+
+def test_breaker_opens_after_threshold_and_probes_after_timeout() -> None:
+    """Test breaker state transitions."""
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0)
+    breaker.record_failure()
+    assert not breaker.is_open
+    breaker.record_failure()
+    assert breaker.is_open
+
+    # Reset timeout elapsed: exactly one probe is let through
+    assert breaker.allow() is True
+    assert breaker.allow() is False
+    breaker.record_success()
+    assert not breaker.is_open
+    assert breaker.allow() is True
+
+def test_fallback_cache_evicts_least_recently_used() -> None:
+    """Test that the fallback store stays within its entry bound."""
+    cache = LocalFallbackCache(max_entries=2)
+    cache.set("a", b"1", ttl=60)
+    cache.set("b", b"2", ttl=60)
+    cache.get("a")
+    cache.set("c", b"3", ttl=60)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1"
+    assert len(cache) == 2
+
+@pytest.mark.asyncio
+async def test_result_pages_served_locally_while_redis_down(failing_redis) -> None:
+    """Test that pagination keys survive a Redis outage within one worker."""
+    page_key = f"{settings.redis.SEARCH_RESULTS_PREFIX}abc:page:1"
+
+    assert await redis_client.set(page_key, [{"id": 1}], ttl=60) is True
+    assert await redis_client.get(page_key) == [{"id": 1}]
+
+    # Non-fallback prefixes are simply cache misses
+    assert await redis_client.set("text:g0:list", [], ttl=60) is False
+    assert await redis_client.get("text:g0:list") is None
+
+@pytest.mark.asyncio
+async def test_open_breaker_skips_redis(failing_redis) -> None:
+    """Test that no commands reach Redis once the breaker is open."""
+    await redis_client.get("text:a")
+    await redis_client.get("text:b")
+    calls = failing_redis.calls
+
+    assert redis_client.breaker.is_open
+    await redis_client.get("text:c")
+    assert failing_redis.calls == calls
+
+@pytest.mark.asyncio
+async def test_failed_mget_counts_errors_not_misses(failing_redis) -> None:
+    """Test that keys MGET could not read are recorded as errors."""
+    errors = cache_requests.value(prefix="mgettest:", result="error")
+    misses = cache_requests.value(prefix="mgettest:", result="miss")
+
+    assert await redis_client.get_many_bytes(["mgettest:a", "mgettest:b"]) == [None, None]
+
+    assert cache_requests.value(prefix="mgettest:", result="error") == errors + 2
+    assert cache_requests.value(prefix="mgettest:", result="miss") == misses
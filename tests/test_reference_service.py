@@ -0,0 +1,30 @@
+"""
+Unit tests for ReferenceService.
+Tests reference parsing and locator mapping onto division fields.
+"""
+
+import pytest
+
+from app.services.reference_service import ReferenceService, TLG_REFERENCE
+
+@pytest.mark.asyncio
+async def test_parse_tlg_reference() -> None:
+    """Test parsing of references with TLG author and work numbers."""
+    service = ReferenceService(session=None)
+
+    assert await service._parse("TLG0057.001 1.5.3–1.6.10") == ("0057", "001", "1.5.3", "1.6.10")
+    assert await service._parse("0057.001 6.135") == ("0057", "001", "6.135", None)
+    assert TLG_REFERENCE.match("0057 6.135") is None
+
+def test_locator_fields() -> None:
+    """Test mapping locator levels onto division fields and line numbers."""
+    service = ReferenceService(session=None)
+    structure = ["Volume", "Chapter", "Line"]
+
+    assert service._locator_fields("1.5.3", structure) == ({"volume": "1", "chapter": "5"}, 3)
+    assert service._locator_fields("1.5", structure) == ({"volume": "1", "chapter": "5"}, None)
+
+    with pytest.raises(ValueError):
+        service._locator_fields("1.5.3.2", structure)
+    with pytest.raises(ValueError):
+        service._locator_fields("1.5.x", structure)
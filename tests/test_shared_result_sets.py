@@ -0,0 +1,55 @@
+"""
+Unit tests for shared citation result sets.
+Tests query fingerprinting and deterministic results IDs.
+"""
+
+import pytest
+from typing import Dict
+
+from app.core import cache_keys
+from app.core.redis import redis_client
+from app.services.citation_service import CitationService
+
+class FakeRedis:
+    """Minimal in-memory stand-in for the redis.asyncio client."""
+
+    def __init__(self):
+        self.store: Dict[str, bytes] = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def incr(self, key):
+        value = int(self.store.get(key, b"0")) + 1
+        self.store[key] = str(value).encode("utf-8")
+        return value
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """Patch the Redis singleton with an in-memory store."""
+    fake = FakeRedis()
+    monkeypatch.setattr(redis_client, "_redis", fake)
+    return fake
+
+def test_fingerprint_normalizes_ilike_patterns() -> None:
+    """Test that only case-insensitive patterns are case-folded."""
+    fingerprint = CitationService.query_fingerprint
+
+    assert fingerprint("text", {"pattern": "%Λόγος%"}) == fingerprint("text", {"pattern": "%λόγος% "})
+    assert fingerprint("text", {"pattern": "%ΛΟΓΟΣ%"}) == fingerprint("text", {"pattern": "%λογοσ%"})
+    assert fingerprint("text", {"pattern": "%λόγος%"}) != fingerprint("text", {"pattern": "%λόγοσ%"})
+    assert fingerprint("text", {"pattern": "%Fuß%"}) != fingerprint("text", {"pattern": "%fuss%"})
+    assert fingerprint("lemma", {"pattern": "Λόγος"}) != fingerprint("lemma", {"pattern": "λόγος"})
+    assert fingerprint("lemma", {"pattern": "λόγος"}) != fingerprint("text", {"pattern": "λόγος"})
+
+@pytest.mark.asyncio
+async def test_results_id_is_shared_per_corpus_version(fake_redis) -> None:
+    """Test that identical queries share an ID until the corpus changes."""
+    service = CitationService(session=None)
+    fingerprint = service.query_fingerprint("lemma", {"pattern": "λόγος"})
+
+    first = await service._results_id(fingerprint)
+    assert await service._results_id(fingerprint) == first
+
+    await cache_keys.bump_corpus_generation()
+    assert await service._results_id(fingerprint) != first
@@ -0,0 +1,58 @@
+"""
+Unit tests for static text exports.
+Tests manifest writing and serving exports only while they are current.
+"""
+
+import gzip
+import json
+
+import pytest
+from fastapi import Request
+
+from app.core import static_export
+from app.core.config import settings
+from app.core.static_export import StaticExportWriter, export_response
+
+def make_request(accept_encoding: str = "") -> Request:
+    """Build a bare GET request with an Accept-Encoding header."""
+    headers = [(b"accept-encoding", accept_encoding.encode())] if accept_encoding else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+@pytest.fixture
+def export_dir(tmp_path, monkeypatch):
+    """Point the static export directory at a temporary directory."""
+    monkeypatch.setattr(settings, "STATIC_EXPORT_DIR", str(tmp_path))
+    monkeypatch.setattr(static_export, "_manifest_mtime", None)
+    return tmp_path
+
+def test_writer_records_hashes_and_prunes(export_dir) -> None:
+    """Test that the manifest lists each export and stale files are removed."""
+    (export_dir / "text-9.json").write_bytes(b"{}")
+
+    writer = StaticExportWriter()
+    writer.write("text-1", b'{"id":"1"}', '"g0-text-1v0"')
+    manifest = writer.finish()
+
+    entry = manifest["files"]["text-1"]
+    assert entry["etag"] == '"g0-text-1v0"'
+    assert entry["bytes"] == 10
+    assert gzip.decompress((export_dir / "text-1.json.gz").read_bytes()) == b'{"id":"1"}'
+    assert json.loads((export_dir / "manifest.json").read_text())["files"] == manifest["files"]
+    assert not (export_dir / "text-9.json").exists()
+
+def test_export_response_requires_current_etag(export_dir) -> None:
+    """Test that exports are served only when their ETag is current."""
+    writer = StaticExportWriter()
+    writer.write("text-1", b'{"id":"1"}', '"g0-text-1v0"')
+    writer.finish()
+
+    response = export_response(make_request("gzip, br"), "text-1", '"g0-text-1v0"')
+    assert response.path == export_dir / "text-1.json.gz"
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] == '"g0-text-1v0"'
+
+    response = export_response(make_request(), "text-1", '"g0-text-1v0"')
+    assert response.path == export_dir / "text-1.json"
+
+    assert export_response(make_request(), "text-1", '"g1-text-1v0"') is None
+    assert export_response(make_request(), "text-2", '"g0-text-2v0"') is None
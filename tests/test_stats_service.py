@@ -0,0 +1,38 @@
+"""
+Unit tests for CorpusStatsService.
+Tests that re-processing a work only applies frequency differences.
+"""
+
+from collections import Counter
+
+import pytest
+
+from app.services.stats_service import CorpusStatsService
+
+class RecordingSession:
+    """Session stand-in that records the rows of executed INSERT statements."""
+
+    def __init__(self):
+        self.rows = []
+
+    async def execute(self, stmt):
+        self.rows.extend(
+            {column.key: value for column, value in row.items()}
+            for row in stmt._multi_values[0]
+        )
+
+@pytest.mark.asyncio
+async def test_apply_deltas_skips_unchanged_keys() -> None:
+    """Test that totals are adjusted by the change since the previous run."""
+    session = RecordingSession()
+    service = CorpusStatsService(session)
+
+    await service._apply_deltas(
+        "lemma",
+        Counter({"σῶμα": 5, "καρδία": 2}),
+        {"σῶμα": 3, "καρδία": 2, "αἷμα": 4}
+    )
+
+    deltas = {row["key"]: row["occurrences"] for row in session.rows}
+    assert deltas == {"σῶμα": 2, "αἷμα": -4}
+    assert all(row["text_id"] == 0 for row in session.rows)
@@ -0,0 +1,41 @@
+"""
+Unit tests for the local token estimator.
+Tests per-script estimates, memoization and calibration from reported usage.
+"""
+
+from app.services.llm.tokens import TokenEstimator
+
+def test_estimate_by_script() -> None:
+    """Test that Greek runs cost more tokens per character than Latin runs."""
+    estimator = TokenEstimator(factor=1.0)
+
+    assert estimator.estimate("") == 0
+    assert estimator.estimate("word word") == 2
+    assert estimator.estimate("λόγος") == 4
+    assert estimator.estimate("a, b.") == 4
+
+def test_raw_estimate_is_memoized() -> None:
+    """Test that repeated texts are counted once and the memo stays bounded."""
+    estimator = TokenEstimator(factor=1.0, max_entries=2)
+
+    for text in ["one", "two", "one", "three"]:
+        estimator.raw_estimate(text)
+    assert len(estimator._memo) == 2
+    assert estimator.raw_estimate("one") == 1
+
+def test_calibration_follows_reported_usage() -> None:
+    """Test that reported counts move the factor, within bounds, for long prompts only."""
+    estimator = TokenEstimator(factor=1.0)
+    prompt = "λόγος " * 100  # 400 tokens before calibration
+
+    estimator.calibrate("short", 1000)
+    assert estimator.factor == 1.0
+
+    for _ in range(50):
+        estimator.calibrate(prompt, 600)
+    assert abs(estimator.factor - 1.5) < 0.01
+    assert abs(estimator.estimate(prompt) - 600) <= 4
+
+    for _ in range(100):
+        estimator.calibrate(prompt, 4000)
+    assert estimator.factor <= 2.0
@@ -29,6 +29,7 @@ from app.models.author import Author
 from app.models.text import Text
 from app.models.text_division import TextDivision
 from app.models.text_line import TextLine
+from app.services.stats_service import CorpusStatsService
 from assets.indexes import tlg_index, work_numbers
 from toolkit.parsers.citation_utils import map_level_to_field
 from app.core.config import settings
@@ -61,6 +62,7 @@ class CitationMigrator:
         shared = SharedParsers.get_instance()
         self.citation_parser = shared.citation_parser
         self.data_verifier = DataVerifier(session)
+        self.corpus_stats = CorpusStatsService(session)
         self.author_cache: Dict[str, int] = {}  # Cache author_id -> db_id
         self.text_cache: Dict[Tuple[str, str], int] = {}  # Cache (author_id, work_id) -> db_id
         
@@ -588,6 +590,9 @@ class CitationMigrator:
                 # Flush all lines
                 await self.session.flush()
                 
+                # Keep the work's division and line counts current
+                await self.corpus_stats.record_work_structure(text_db_id)
+                
                 # Final commit
                 await self.session.commit()
             
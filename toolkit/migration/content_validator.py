@@ -15,6 +15,9 @@ from app.models.text import Text
 from app.models.text_division import TextDivision
 from app.models.text_line import TextLine
 
+# Rows fetched per round trip when streaming verification queries
+VERIFY_BATCH_SIZE = 1000
+
 class ContentValidationError(Exception):
     """Exception raised for content validation errors."""
     pass
@@ -161,30 +164,33 @@ class DataVerifier:
 
         try:
             # 1. Orphaned Entities Tracking
-            orphaned_texts = await self.session.execute(
+            orphaned_texts = await self.session.stream_scalars(
                 select(Text).filter(Text.author_id.is_(None))
+                .execution_options(yield_per=VERIFY_BATCH_SIZE)
             )
-            for text in orphaned_texts.scalars():
+            async for text in orphaned_texts:
                 warnings.append({
                     "type": "orphaned_text",
                     "work_id": text.reference_code or str(text.id),
                     "message": f"Text {text.id} lacks author association"
                 })
 
-            orphaned_divisions = await self.session.execute(
+            orphaned_divisions = await self.session.stream_scalars(
                 select(TextDivision).filter(TextDivision.text_id.is_(None))
+                .execution_options(yield_per=VERIFY_BATCH_SIZE)
             )
-            for division in orphaned_divisions.scalars():
+            async for division in orphaned_divisions:
                 warnings.append({
                     "type": "orphaned_division",
                     "work_id": division.reference_code or str(division.id),
                     "message": f"Division {division.id} lacks text association"
                 })
 
-            orphaned_lines = await self.session.execute(
+            orphaned_lines = await self.session.stream_scalars(
                 select(TextLine).filter(TextLine.division_id.is_(None))
+                .execution_options(yield_per=VERIFY_BATCH_SIZE)
             )
-            for line in orphaned_lines.scalars():
+            async for line in orphaned_lines:
                 warnings.append({
                     "type": "orphaned_line",
                     "work_id": line.reference_code or str(line.id),
@@ -193,13 +199,13 @@ class DataVerifier:
 
             # 2. Missing Foreign Key Relationships
             # Check for texts with non-existent author references
-            invalid_text_authors = await self.session.execute(
+            invalid_text_authors = await self.session.stream_scalars(
                 select(Text).filter(
                     Text.author_id.is_not(None) & 
                     ~exists().where(Author.id == Text.author_id)
-                )
+                ).execution_options(yield_per=VERIFY_BATCH_SIZE)
             )
-            for text in invalid_text_authors.scalars():
+            async for text in invalid_text_authors:
                 warnings.append({
                     "type": "invalid_author_reference",
                     "work_id": text.reference_code or str(text.id),
@@ -208,12 +214,13 @@ class DataVerifier:
 
             # 3. Relationship Density Check
             # Warn if texts have unusually low or high number of divisions/lines
-            text_division_counts = await self.session.execute(
+            text_division_counts = await self.session.stream(
                 select(Text.id, func.count(TextDivision.id))
                 .outerjoin(TextDivision, Text.id == TextDivision.text_id)
                 .group_by(Text.id)
+                .execution_options(yield_per=VERIFY_BATCH_SIZE)
             )
-            for text_id, division_count in text_division_counts:
+            async for text_id, division_count in text_division_counts:
                 if division_count == 0:
                     warnings.append({
                         "type": "low_division_count",
@@ -258,7 +265,7 @@ class DataVerifier:
             })
 
         # Texts with missing critical fields
-        texts_missing_fields = await self.session.execute(
+        texts_missing_fields = await self.session.stream_scalars(
             select(Text)
             .filter(
                 (Text.reference_code.is_(None)) |
@@ -266,8 +273,9 @@ class DataVerifier:
                 (Text.title.is_(None)) |
                 (Text.title == "")
             )
+            .execution_options(yield_per=VERIFY_BATCH_SIZE)
         )
-        for text in texts_missing_fields.scalars():
+        async for text in texts_missing_fields:
             missing_fields = [
                 field for field in ["reference_code", "title"]
                 if not getattr(text, field)
@@ -288,59 +296,72 @@ class DataVerifier:
         warnings = []
         line_continuity_issues = []
 
-        # Fetch all divisions with their lines, ordered by line number
-        divisions = await self.session.execute(
-            select(TextDivision).options(
-                joinedload(TextDivision.text)  # Load associated text for context
-            )
+        # Stream line numbers of all divisions in division order, instead of
+        # loading every division and then every line of each one
+        rows = await self.session.stream(
+            select(TextLine.division_id, TextLine.id, TextLine.line_number)
+            .filter(TextLine.division_id.is_not(None))
+            .order_by(TextLine.division_id, TextLine.line_number)
+            .execution_options(yield_per=VERIFY_BATCH_SIZE)
         )
 
-        for division in divisions.scalars():
-            # Fetch lines for this division, ordered by line number
-            lines = await self.session.execute(
-                select(TextLine)
-                .filter(TextLine.division_id == division.id)
-                .order_by(TextLine.line_number)
+        async def check_division(division_id: int, lines: List[Any]) -> None:
+            expected_number = 1
+            gaps = []
+            for line_id, line_number in lines:
+                if line_number != expected_number:
+                    gaps.append((expected_number, line_number, line_id))
+                expected_number = line_number + 1
+            if not gaps:
+                return
+
+            # Load division context only for divisions with discontinuities
+            division = await self.session.get(
+                TextDivision, division_id, options=[joinedload(TextDivision.text)]
             )
-            lines = list(lines.scalars())
-            
-            if lines:
-                expected_number = 1
-                discontinuities = []
-                for line in lines:
-                    if line.line_number != expected_number:
-                        discontinuity = {
-                            'expected': expected_number,
-                            'actual': line.line_number,
-                            'line_id': line.id,
-                            'text_id': division.text_id,
-                            'text_reference_code': division.text.reference_code if division.text else str(division.text_id),
-                            'text_title': division.text.title if division.text else 'Unknown',
-                            'division_id': division.id,
-                            'division_reference_code': division.format_citation(abbreviated=True)
-                        }
-                        discontinuities.append(discontinuity)
-                    
-                    expected_number = line.line_number + 1
-                
-                if discontinuities:
-                    warning = {
-                        "type": "line_number_discontinuity",
-                        "work_id": division.text.reference_code if division.text else str(division.id),
-                        "message": f"Line number discontinuities in division {division.id}",
-                        "details": discontinuities
-                    }
-                    warnings.append(warning)
-                    
-                    # Collect detailed line continuity issues
-                    line_continuity_issues.append({
-                        "text_id": division.text_id,
-                        "text_reference_code": division.text.reference_code if division.text else str(division.text_id),
-                        "text_title": division.text.title if division.text else 'Unknown',
-                        "division_id": division.id,
-                        "division_reference_code": division.format_citation(abbreviated=True),
-                        "discontinuities": discontinuities
-                    })
+            text_reference_code = division.text.reference_code if division.text else str(division.text_id)
+            text_title = division.text.title if division.text else 'Unknown'
+            division_reference_code = division.format_citation(abbreviated=True)
+            discontinuities = [
+                {
+                    'expected': expected,
+                    'actual': actual,
+                    'line_id': line_id,
+                    'text_id': division.text_id,
+                    'text_reference_code': text_reference_code,
+                    'text_title': text_title,
+                    'division_id': division.id,
+                    'division_reference_code': division_reference_code
+                }
+                for expected, actual, line_id in gaps
+            ]
+
+            warnings.append({
+                "type": "line_number_discontinuity",
+                "work_id": division.text.reference_code if division.text else str(division.id),
+                "message": f"Line number discontinuities in division {division.id}",
+                "details": discontinuities
+            })
+
+            # Collect detailed line continuity issues
+            line_continuity_issues.append({
+                "text_id": division.text_id,
+                "text_reference_code": text_reference_code,
+                "text_title": text_title,
+                "division_id": division.id,
+                "division_reference_code": division_reference_code,
+                "discontinuities": discontinuities
+            })
+
+        current_division, lines = None, []
+        async for division_id, line_id, line_number in rows:
+            if division_id != current_division:
+                if lines:
+                    await check_division(current_division, lines)
+                current_division, lines = division_id, []
+            lines.append((line_id, line_number))
+        if lines:
+            await check_division(current_division, lines)
 
         # Log detailed line continuity issues
         if line_continuity_issues:
@@ -375,14 +396,22 @@ class DataVerifier:
         warnings = []
         division_issues = []
 
-        # Fetch all texts with their divisions, using joinedload for efficiency
-        texts = await self.session.execute(
-            select(Text).options(joinedload(Text.divisions))
+        # Stream texts and load one text's divisions, with their line counts, at a time
+        texts = await self.session.stream_scalars(
+            select(Text).execution_options(yield_per=VERIFY_BATCH_SIZE)
         )
 
-        for text in texts.scalars().unique():
+        async for text in texts:
+            divisions = (await self.session.execute(
+                select(TextDivision, func.count(TextLine.id))
+                .outerjoin(TextLine, TextLine.division_id == TextDivision.id)
+                .filter(TextDivision.text_id == text.id)
+                .group_by(TextDivision.id)
+                .order_by(TextDivision.id)
+            )).all()
+
             # Check if text has any divisions
-            if not text.divisions:
+            if not divisions:
                 warnings.append({
                     "type": "text_without_divisions",
                     "work_id": text.reference_code or str(text.id),
@@ -392,7 +421,7 @@ class DataVerifier:
 
             # Track divisions without lines
             zero_line_divisions = []
-            for division in text.divisions:
+            for division, lines_count in divisions:
                 # Skip title divisions from validation
                 if division.is_title:
                     continue
@@ -405,10 +434,6 @@ class DataVerifier:
                     division_reference += f".{division.chapter}"
 
                 # Check if division has any lines
-                lines_count = await self.session.scalar(
-                    select(func.count(TextLine.id)).filter(TextLine.division_id == division.id)
-                )
-                
                 if lines_count == 0:
                     # Fetch additional context about the division
                     division_details = {
@@ -112,13 +112,17 @@ class CorpusDB(CorpusNLP):
                 
         return None
 
-    async def get_work_list(self) -> List[Text]:
-        """Get list of all works."""
+    async def get_work_ids(self) -> List[int]:
+        """Get IDs of all works.
+
+        Only IDs are loaded: callers commit after each work, which would
+        close a server-side cursor over the works themselves.
+        """
         try:
-            result = await self.session.execute(select(Text))
-            works = result.scalars().all()
-            logger.debug("Found %d works", len(works))
-            return works
+            result = await self.session.execute(select(Text.id).order_by(Text.id))
+            work_ids = result.scalars().all()
+            logger.debug("Found %d works", len(work_ids))
+            return work_ids
         except Exception as e:
             logger.error("Error getting work list: %s", str(e))
             return []
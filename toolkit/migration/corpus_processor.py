@@ -5,9 +5,11 @@ Coordinates specialized processors for line processing,
 sentence formation, and database operations.
 """
 
+from collections import Counter
 from typing import Optional, Dict, Any, List
 from tqdm import tqdm
 
+from app.services.stats_service import CorpusStatsService
 from .corpus_db import CorpusDB
 from toolkit.parsers.citation import CitationParser
 from toolkit.parsers.citation_utils import map_level_to_field
@@ -35,6 +37,7 @@ class CorpusProcessor(CorpusDB):
         self._current_metadata = None  # Track current metadata
         self.report = report  # Store report for tracking issues
         self.skip_nlp = skip_nlp  # Flag to skip NLP processing
+        self.corpus_stats = CorpusStatsService(session)
         
         # Set report in citation parser
         if report:
@@ -127,6 +130,12 @@ class CorpusProcessor(CorpusDB):
             # Only clear metadata context, don't reset everything
             self._set_metadata(None)
             
+            # Counts for corpus_stats, recorded once the work is done
+            sentence_count = 0
+            token_count = 0
+            category_counts: Counter = Counter()
+            lemma_counts: Counter = Counter()
+            
             async with self.session.begin_nested():
                 for division in divisions:
                     try:
@@ -211,6 +220,19 @@ class CorpusProcessor(CorpusDB):
                                     if self.report:
                                         self.report.add_sentence_issue(f"division_{division.id}", "Failed to create sentence record")
                                     continue
+                                
+                                sentence_count += 1
+                                if processed_doc:
+                                    for token in processed_doc['tokens']:
+                                        token_count += 1
+                                        if token.get('lemma'):
+                                            lemma_counts[token['lemma']] += 1
+                                        if token.get('category'):
+                                            category_counts.update(
+                                                category.strip()
+                                                for category in token['category'].split(',')
+                                                if category.strip()
+                                            )
 
                                 # Update line analysis only if NLP processing was done
                                 if processed_doc and processed_doc['tokens']:
@@ -255,6 +277,10 @@ class CorpusProcessor(CorpusDB):
                         if self.report:
                             self.report.add_sentence_issue(f"division_{division.id}", f"Error processing division: {str(e)}")
                         continue
+                
+                await self.corpus_stats.record_work_analysis(
+                    work_id, sentence_count, token_count, category_counts, lemma_counts
+                )
 
         except Exception as e:
             logger.error("Error processing work %d: %s", work_id, str(e))
@@ -264,29 +290,29 @@ class CorpusProcessor(CorpusDB):
     async def process_corpus(self) -> None:
         """Process all works in the corpus."""
         # Get all works
-        works = await self.get_work_list()
-        if not works:
+        work_ids = await self.get_work_ids()
+        if not work_ids:
             logger.error("No works found in corpus")
             if self.report:
                 self.report.add_sentence_issue("corpus", "No works found")
             return
             
-        total_works = len(works)
+        total_works = len(work_ids)
         logger.info("Starting sequential processing of %d works", total_works)
         
         # Process each work
         with tqdm(total=total_works, desc="Processing corpus", unit="work") as pbar:
-            for work in works:
+            for work_id in work_ids:
                 try:
-                    await self.process_work(work.id, pbar)
+                    await self.process_work(work_id, pbar)
                     await self.session.commit()
-                    logger.info("Committed changes for work %d", work.id)
+                    logger.info("Committed changes for work %d", work_id)
                 except Exception as e:
-                    logger.error("Error processing work %d: %s", work.id, str(e))
+                    logger.error("Error processing work %d: %s", work_id, str(e))
                     if self.report:
-                        self.report.add_sentence_issue(f"work_{work.id}", f"Failed to process work: {str(e)}")
+                        self.report.add_sentence_issue(f"work_{work_id}", f"Failed to process work: {str(e)}")
                     await self.session.rollback()
-                    logger.info("Rolled back changes for work %d", work.id)
+                    logger.info("Rolled back changes for work %d", work_id)
                     continue
 
     def reset(self):
@@ -6,7 +6,9 @@ This script coordinates the entire process:
 2. Migrating citations and relationships
 3. Processing texts into sentences
 4. Running NLP on sentences
-5. Validating the results
+5. Building each text's table of contents
+6. Validating the results
+7. Exporting texts and tables of contents as static JSON files
 """
 import argparse
 import asyncio
@@ -18,10 +20,17 @@ from typing import Optional, Dict, List
 from datetime import datetime
 import traceback
 
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_scoped_session
 from sqlalchemy.orm import sessionmaker
 
+from app.core.cache_keys import bump_corpus_generation
 from app.core.config import settings
+from app.core.http_cache import corpus_etag
+from app.core.static_export import StaticExportWriter
+from app.models.text import Text
+from app.models.text_division import TableOfContentsResponse
+from app.services.text_service import TextService
 from toolkit.migration.citation_migrator import CitationMigrator
 from toolkit.migration.content_validator import DataVerifier, ContentValidationError
 from toolkit.migration.corpus_processor import CorpusProcessor
@@ -160,6 +169,55 @@ async def verify_nlp_pipeline(model_path: Optional[str], use_gpu: Optional[bool]
         logger.error(f"NLP pipeline verification failed: {str(e)}")
         raise
 
+async def build_tables_of_contents(session: AsyncSession) -> int:
+    """Compute and store the table of contents of every text.
+    
+    Returns:
+        Number of texts processed
+    """
+    result = await session.execute(select(Text.id))
+    text_ids = result.scalars().all()
+    text_service = TextService(session)
+    
+    for text_id in text_ids:
+        toc = await text_service.build_table_of_contents(text_id)
+        await session.execute(
+            update(Text)
+            .where(Text.id == text_id)
+            .values(table_of_contents=toc.model_dump())
+        )
+    await session.commit()
+    return len(text_ids)
+
+async def export_static_texts(session: AsyncSession) -> int:
+    """Write every text and table of contents as pre-rendered JSON files.
+    
+    Returns:
+        Number of texts exported
+    """
+    result = await session.execute(select(Text.id))
+    text_ids = result.scalars().all()
+    text_service = TextService(session)
+    writer = StaticExportWriter()
+    
+    for text_id in text_ids:
+        data = await text_service.render_text(text_id)
+        if data:
+            writer.write(f"text-{text_id}", data, await corpus_etag("text", text_id=text_id))
+        # Read the stored table of contents, not the Redis-cached one
+        stored = await session.scalar(select(Text.table_of_contents).where(Text.id == text_id))
+        if stored:
+            toc = TableOfContentsResponse.model_validate(stored)
+        else:
+            toc = await text_service.build_table_of_contents(text_id)
+        writer.write(
+            f"toc-{text_id}",
+            toc.model_dump_json().encode('utf-8'),
+            await corpus_etag("toc", text_id=text_id)
+        )
+    writer.finish()
+    return len(text_ids)
+
 async def run_pipeline(
     corpus_dir: Path,
     model_path: Optional[str] = None,
@@ -169,7 +227,8 @@ async def run_pipeline(
     use_gpu: Optional[bool] = None,
     debug: bool = False,
     skip_to_corpus: bool = False,
-    skip_nlp: bool = False
+    skip_nlp: bool = False,
+    export: bool = True
 ):
     """
     Run the complete pipeline from loading to processing.
@@ -184,6 +243,7 @@ async def run_pipeline(
         debug: Whether to enable debug logging
         skip_to_corpus: Whether to skip citation migration and start from corpus processing
         skip_nlp: Whether to skip NLP token generation
+        export: Whether to write static JSON exports of the texts
     """
     # Initialize report tracker
     report = PipelineReport()
@@ -253,9 +313,26 @@ async def run_pipeline(
                 logger.error(f"Error during sentence/NLP processing: {e}")
                 raise
             
-            # Phase 3: Validate results if requested
+            # New content: stop serving cached entries and ETags of the previous corpus
+            await bump_corpus_generation()
+            
+            # Phase 3: Precompute tables of contents
+            logger.info("Phase 3: Building tables of contents...")
+            try:
+                toc_count = await build_tables_of_contents(session)
+                logger.info(f"Built tables of contents for {toc_count} texts")
+            except Exception as e:
+                report.add_sentence_issue("table_of_contents", str(e))
+                logger.error(f"Error building tables of contents: {e}")
+                raise
+            
+            # Tables of contents cached while they were rebuilt are stale; the
+            # export below is stamped with the new generation
+            await bump_corpus_generation()
+            
+            # Phase 4: Validate results if requested
             if validate:
-                logger.info("Phase 3: Validation...")
+                logger.info("Phase 4: Validation...")
                 verifier = DataVerifier(session)
                 try:
                     validation_results = await verifier.run_all_verifications()
@@ -274,6 +351,17 @@ async def run_pipeline(
                     })
                     logger.error(f"Error during validation: {e}")
                     raise
+            
+            # Phase 5: Export static JSON files
+            if export:
+                logger.info("Phase 5: Exporting static JSON files...")
+                try:
+                    export_count = await export_static_texts(session)
+                    logger.info(f"Exported {export_count} texts to {settings.STATIC_EXPORT_DIR}")
+                except Exception as e:
+                    report.add_sentence_issue("static_export", str(e))
+                    logger.error(f"Error exporting static JSON files: {e}")
+                    raise
 
         finally:
             if session:
@@ -355,6 +443,11 @@ def main():
         action="store_true",
         help="Skip NLP token generation while still processing sentences"
     )
+    parser.add_argument(
+        "--no-export",
+        action="store_true",
+        help="Skip writing static JSON exports of the texts"
+    )
     args = parser.parse_args()
     
     # Redirect stdout/stderr to /dev/null if quiet mode is enabled
@@ -382,7 +475,8 @@ def main():
         use_gpu=use_gpu,
         debug=args.debug,
         skip_to_corpus=args.skip_to_corpus,
-        skip_nlp=args.skip_nlp
+        skip_nlp=args.skip_nlp,
+        export=not args.no_export
         # Pass skip_nlp flag
     ))
 
@@ -11,11 +11,9 @@ sys.path.insert(0, project_root)
 import asyncio
 import logging
 import re
-from sqlalchemy import select, update
+from sqlalchemy import select, update, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import async_session_maker
-from app.models.text import Text
-from app.models.text_division import TextDivision
 from app.models.text_line import TextLine
 from tqdm import tqdm
 
@@ -32,41 +30,48 @@ def extract_line_number(content: str) -> int:
         return int(match.group(1))
     return None
 
+# Lines fetched per round trip, and line number updates sent per statement
+LINE_BATCH_SIZE = 1000
+
 async def update_line_numbers(session: AsyncSession) -> None:
     """Update line numbers based on citation information.
     
     This preserves the original line numbers from the text citations
-    rather than forcing sequential numbering.
+    rather than forcing sequential numbering. Lines are streamed with a
+    server-side cursor and updates are written in batches, so memory use
+    does not depend on the size of the corpus.
     """
-    # Get all divisions
-    stmt = select(TextDivision)
-    result = await session.execute(stmt)
-    divisions = result.scalars().all()
+    total = await session.scalar(select(func.count(TextLine.id)))
+    logger.info(f"Processing {total} lines")
     
-    logger.info(f"Processing {len(divisions)} divisions")
+    stmt = (
+        select(TextLine.id, TextLine.division_id, TextLine.content, TextLine.line_number)
+        .order_by(TextLine.division_id, TextLine.id)
+        .execution_options(yield_per=LINE_BATCH_SIZE)
+    )
+    rows = await session.stream(stmt)
     
-    for division in tqdm(divisions, desc="Updating line numbers"):
-        # Get all lines for this division
-        stmt = select(TextLine).where(
-            TextLine.division_id == division.id
-        ).order_by(TextLine.id)
-        result = await session.execute(stmt)
-        lines = result.scalars().all()
-        
-        # Update line numbers based on citation info
-        for line in lines:
+    updates = []
+    with tqdm(total=total, desc="Updating line numbers") as pbar:
+        async for line in rows:
+            pbar.update(1)
+            
+            # Update line numbers based on citation info
             citation_line_number = extract_line_number(line.content)
             if citation_line_number and line.line_number != citation_line_number:
                 logger.info(
-                    f"Updating line number for division {division.id} line {line.id}: "
+                    f"Updating line number for division {line.division_id} line {line.id}: "
                     f"{line.line_number} -> {citation_line_number} (from citation)"
                 )
-                stmt = update(TextLine).where(
-                    TextLine.id == line.id
-                ).values(line_number=citation_line_number)
-                await session.execute(stmt)
-        
-        await session.flush()
+                updates.append({"id": line.id, "line_number": citation_line_number})
+            
+            if len(updates) >= LINE_BATCH_SIZE:
+                await session.execute(update(TextLine), updates)
+                updates = []
+    
+    if updates:
+        await session.execute(update(TextLine), updates)
+    await session.flush()
 
 async def main():
     """Main entry point."""